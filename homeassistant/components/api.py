@@ -15,7 +15,7 @@ import homeassistant.core as ha
 import homeassistant.remote as rem
 from homeassistant.bootstrap import ERROR_LOG_FILENAME
 from homeassistant.const import (
-    EVENT_HOMEASSISTANT_STOP, EVENT_TIME_CHANGED,
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED_BULK, EVENT_TIME_CHANGED,
     HTTP_BAD_REQUEST, HTTP_CREATED, HTTP_NOT_FOUND,
     HTTP_UNPROCESSABLE_ENTITY, MATCH_ALL, URL_API, URL_API_COMPONENTS,
     URL_API_CONFIG, URL_API_DISCOVERY_INFO, URL_API_ERROR_LOG,
@@ -26,6 +26,7 @@ from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.state import AsyncTrackStates
 from homeassistant.helpers import template
 from homeassistant.components.http import HomeAssistantView
+import homeassistant.util.json as json_util
 
 DOMAIN = 'api'
 DEPENDENCIES = ['http']
@@ -93,12 +94,16 @@ class APIEventStream(HomeAssistantView):
             if restrict and event.event_type not in restrict:
                 return
 
+            # Only forward bulk state changes when explicitly requested
+            if event.event_type == EVENT_STATE_CHANGED_BULK and not restrict:
+                return
+
             _LOGGER.debug('STREAM %s FORWARDING %s', id(stop_obj), event)
 
             if event.event_type == EVENT_HOMEASSISTANT_STOP:
                 data = stop_obj
             else:
-                data = json.dumps(event, cls=rem.JSONEncoder)
+                data = json_util.dumps(event)
 
             yield from to_write.put(data)
 
@@ -378,7 +378,7 @@ def _async_process_if(hass, config, p_config):
     if_configs = p_config.get(CONF_CONDITION)
 
     checks = []
-    for if_config in if_configs:
+    for if_config in condition.sort_by_cost(if_configs):
         try:
             checks.append(condition.async_from_config(if_config, False))
         except HomeAssistantError as ex:
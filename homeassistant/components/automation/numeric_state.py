@@ -4,6 +4,8 @@ Offer numeric state listening automation rules.
 For more details about this automation rule, please refer to the documentation
 at https://home-assistant.io/components/automation/#numeric-state-trigger
 """
+from bisect import bisect_left, bisect_right
+from itertools import count
 import logging
 
 import voluptuous as vol
@@ -11,7 +13,7 @@ import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.const import (
     CONF_VALUE_TEMPLATE, CONF_PLATFORM, CONF_ENTITY_ID,
-    CONF_BELOW, CONF_ABOVE)
+    CONF_BELOW, CONF_ABOVE, EVENT_STATE_CHANGED)
 from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers import condition, config_validation as cv
 
@@ -23,6 +25,8 @@ TRIGGER_SCHEMA = vol.All(vol.Schema({
     vol.Optional(CONF_VALUE_TEMPLATE): cv.template,
 }), cv.has_at_least_one_key(CONF_BELOW, CONF_ABOVE))
 
+DATA_NUMERIC_STATE_INDEX = 'automation_numeric_state_index'
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -32,16 +36,10 @@ def async_trigger(hass, config, action):
     below = config.get(CONF_BELOW)
     above = config.get(CONF_ABOVE)
     value_template = config.get(CONF_VALUE_TEMPLATE)
-    if value_template is not None:
-        value_template.hass = hass
 
-    @callback
-    def state_automation_listener(entity, from_s, to_s):
-        """Listen for state changes and calls action."""
-        if to_s is None:
-            return
-
-        variables = {
+    def trigger_variables(entity):
+        """Return the trigger variables for entity."""
+        return {
             'trigger': {
                 'platform': 'numeric_state',
                 'entity_id': entity,
@@ -50,6 +48,34 @@ def async_trigger(hass, config, action):
             }
         }
 
+    if value_template is None:
+        @callback
+        def threshold_listener(entity, from_s, to_s):
+            """Call action when the threshold of entity has been crossed."""
+            variables = trigger_variables(entity)
+            variables['trigger']['from_state'] = from_s
+            variables['trigger']['to_state'] = to_s
+
+            hass.async_run_job(action, variables)
+
+        index = hass.data.get(DATA_NUMERIC_STATE_INDEX)
+
+        if index is None:
+            index = hass.data[DATA_NUMERIC_STATE_INDEX] = \
+                NumericStateIndex(hass)
+
+        return index.async_add(entity_id, below, above, threshold_listener)
+
+    value_template.hass = hass
+
+    @callback
+    def state_automation_listener(entity, from_s, to_s):
+        """Listen for state changes and calls action."""
+        if to_s is None:
+            return
+
+        variables = trigger_variables(entity)
+
         # If new one doesn't match, nothing to do
         if not condition.async_numeric_state(
                 hass, to_s, below, above, value_template, variables):
@@ -67,3 +93,177 @@ def async_trigger(hass, config, action):
         hass.async_run_job(action, variables)
 
     return async_track_state_change(hass, entity_id, state_automation_listener)
+
+
+def _state_as_number(state):
+    """Return the numeric value of a state object or None."""
+    if state is None:
+        return None
+
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+class _Threshold(object):
+    """A numeric_state trigger on a single entity."""
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ['seq', 'low', 'high', 'listener']
+
+    def __init__(self, seq, low, high, listener):
+        """Initialize the threshold."""
+        self.seq = seq
+        self.low = low
+        self.high = high
+        self.listener = listener
+
+
+class _EntityThresholds(object):
+    """Sorted threshold bounds of all triggers on a single entity."""
+
+    def __init__(self):
+        """Initialize the thresholds."""
+        self.low_keys = []
+        self.lows = []
+        self.high_keys = []
+        self.highs = []
+
+    def __len__(self):
+        """Return the number of thresholds."""
+        return len(self.lows)
+
+    def add(self, threshold):
+        """Add a threshold."""
+        pos = bisect_right(self.low_keys, threshold.low)
+        self.low_keys.insert(pos, threshold.low)
+        self.lows.insert(pos, threshold)
+        pos = bisect_right(self.high_keys, threshold.high)
+        self.high_keys.insert(pos, threshold.high)
+        self.highs.insert(pos, threshold)
+
+    def remove(self, threshold):
+        """Remove a threshold."""
+        pos = self.lows.index(threshold)
+        del self.low_keys[pos]
+        del self.lows[pos]
+        pos = self.highs.index(threshold)
+        del self.high_keys[pos]
+        del self.highs[pos]
+
+    def crossed(self, old, new):
+        """Return thresholds entered going from value old to value new.
+
+        A threshold is entered if low <= new <= high and old was outside that
+        range. Going up, old < low <= new, so only lower bounds in (old, new]
+        need to be visited. Going down, new <= high < old, so only upper
+        bounds in [new, old).
+        """
+        if old is None:
+            end = bisect_right(self.low_keys, new)
+            found = [thres for thres in self.lows[:end] if new <= thres.high]
+        elif old < new:
+            start = bisect_right(self.low_keys, old)
+            end = bisect_right(self.low_keys, new)
+            found = [thres for thres in self.lows[start:end]
+                     if new <= thres.high]
+        elif old > new:
+            start = bisect_left(self.high_keys, new)
+            end = bisect_left(self.high_keys, old)
+            found = [thres for thres in self.highs[start:end]
+                     if thres.low <= new]
+        else:
+            return []
+
+        found.sort(key=lambda thres: thres.seq)
+        return found
+
+
+class NumericStateIndex(object):
+    """Index of numeric_state triggers by entity and threshold.
+
+    All triggers share a single state_changed listener. A state change only
+    visits the triggers of that entity whose threshold was crossed.
+    """
+
+    def __init__(self, hass):
+        """Initialize the index."""
+        self.hass = hass
+        self._entities = {}
+        self._seq = count()
+        self._async_unsub_state_changed = None
+
+    @callback
+    def async_add(self, entity_ids, below, above, listener):
+        """Add a trigger on entity_ids for the range [above, below].
+
+        Listener is called with entity_id, old state and new state when the
+        state of an entity enters the range.
+
+        Returns a function that removes the trigger.
+
+        This method must be run in the event loop.
+        """
+        threshold = _Threshold(
+            next(self._seq),
+            float('-inf') if above is None else above,
+            float('inf') if below is None else below,
+            listener)
+
+        entity_ids = [entity_id.lower() for entity_id in entity_ids]
+
+        for entity_id in entity_ids:
+            thresholds = self._entities.get(entity_id)
+
+            if thresholds is None:
+                thresholds = self._entities[entity_id] = _EntityThresholds()
+
+            thresholds.add(threshold)
+
+        if self._async_unsub_state_changed is None:
+            self._async_unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed)
+
+        @callback
+        def async_remove():
+            """Remove the trigger from the index."""
+            for entity_id in entity_ids:
+                thresholds = self._entities[entity_id]
+                thresholds.remove(threshold)
+
+                if not thresholds:
+                    self._entities.pop(entity_id)
+
+            if not self._entities and \
+                    self._async_unsub_state_changed is not None:
+                self._async_unsub_state_changed()
+                self._async_unsub_state_changed = None
+
+        return async_remove
+
+    @callback
+    def _async_state_changed(self, event):
+        """Call the listeners of the thresholds that have been crossed."""
+        entity_id = event.data.get('entity_id')
+        thresholds = self._entities.get(entity_id)
+
+        if thresholds is None:
+            return
+
+        to_s = event.data.get('new_state')
+
+        if to_s is None:
+            return
+
+        new = _state_as_number(to_s)
+
+        if new is None:
+            _LOGGER.warning("Value cannot be processed as a number: %s",
+                            to_s.state)
+            return
+
+        from_s = event.data.get('old_state')
+
+        for threshold in thresholds.crossed(_state_as_number(from_s), new):
+            threshold.listener(entity_id, from_s, to_s)
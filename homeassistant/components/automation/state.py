@@ -8,7 +8,7 @@ import voluptuous as vol
 
 from homeassistant.core import callback
 import homeassistant.util.dt as dt_util
-from homeassistant.const import MATCH_ALL, CONF_PLATFORM
+from homeassistant.const import MATCH_ALL, CONF_PLATFORM, EVENT_STATE_CHANGED
 from homeassistant.helpers.event import (
     async_track_state_change, async_track_point_in_utc_time)
 import homeassistant.helpers.config_validation as cv
@@ -33,6 +33,8 @@ TRIGGER_SCHEMA = vol.All(
             cv.key_dependency(CONF_FOR, CONF_STATE))
 )
 
+DATA_STATE_INDEX = 'automation_state_index'
+
 
 def async_trigger(hass, config, action):
     """Listen for state changes based on configuration."""
@@ -84,8 +86,13 @@ def async_trigger(hass, config, action):
         async_remove_state_for_cancel = async_track_state_change(
             hass, entity, state_for_cancel_listener)
 
-    unsub = async_track_state_change(
-        hass, entity_id, state_automation_listener, from_state, to_state)
+    index = hass.data.get(DATA_STATE_INDEX)
+
+    if index is None:
+        index = hass.data[DATA_STATE_INDEX] = StateIndex(hass)
+
+    unsub = index.async_add(
+        entity_id, from_state, to_state, state_automation_listener)
 
     def async_remove():
         """Remove state listeners async."""
@@ -98,3 +105,83 @@ def async_trigger(hass, config, action):
             async_remove_state_for_listener()
 
     return async_remove
+
+
+class StateIndex(object):
+    """Index of state triggers by entity and target state.
+
+    All triggers share a single state_changed listener. A state change only
+    visits the triggers of that entity that match the new state.
+    """
+
+    def __init__(self, hass):
+        """Initialize the index."""
+        self.hass = hass
+        # entity_id -> to_state -> list of (from_state, listener)
+        self._entities = {}
+        self._async_unsub_state_changed = None
+
+    @callback
+    def async_add(self, entity_ids, from_state, to_state, listener):
+        """Add a trigger on entity_ids.
+
+        Listener is called with entity_id, old state and new state when
+        the old state matches from_state and the new state matches to_state.
+        Both can be a state or MATCH_ALL.
+
+        Returns a function that removes the trigger.
+
+        This method must be run in the event loop.
+        """
+        entry = (from_state, listener)
+        entity_ids = [entity_id.lower() for entity_id in entity_ids]
+
+        for entity_id in entity_ids:
+            self._entities.setdefault(entity_id, {}).setdefault(
+                to_state, []).append(entry)
+
+        if self._async_unsub_state_changed is None:
+            self._async_unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed)
+
+        @callback
+        def async_remove():
+            """Remove the trigger from the index."""
+            for entity_id in entity_ids:
+                by_to_state = self._entities[entity_id]
+                by_to_state[to_state].remove(entry)
+
+                if not by_to_state[to_state]:
+                    by_to_state.pop(to_state)
+
+                if not by_to_state:
+                    self._entities.pop(entity_id)
+
+            if not self._entities and \
+                    self._async_unsub_state_changed is not None:
+                self._async_unsub_state_changed()
+                self._async_unsub_state_changed = None
+
+        return async_remove
+
+    @callback
+    def _async_state_changed(self, event):
+        """Call the listeners of triggers matching the state change."""
+        entity_id = event.data.get('entity_id')
+        by_to_state = self._entities.get(entity_id)
+
+        if by_to_state is None:
+            return
+
+        from_s = event.data.get('old_state')
+        to_s = event.data.get('new_state')
+        old_state = None if from_s is None else from_s.state
+
+        entries = list(by_to_state.get(MATCH_ALL, ()))
+
+        if to_s is not None:
+            entries = entries + by_to_state.get(to_s.state, [])
+
+        for from_state, listener in entries:
+            if from_state == MATCH_ALL or from_state == old_state:
+                listener(entity_id, from_s, to_s)
@@ -6,12 +6,15 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/camera/
 """
 import asyncio
+from collections import deque
 import logging
 
 from aiohttp import web
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.image_cache import ImageCache
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA  # noqa
 from homeassistant.components.http import HomeAssistantView
 
@@ -26,6 +29,20 @@ STATE_IDLE = 'idle'
 
 ENTITY_IMAGE_URL = '/api/camera_proxy/{0}?token={1}'
 
+# Seconds a camera image is served from the cache, half the refresh interval
+# of the frontend so no viewer sees an image older than one refresh.
+IMAGE_CACHE_TTL = 5
+
+# Seconds between images when streaming a camera without a native stream
+STREAM_POLL_INTERVAL = 0.5
+
+# Frames kept for viewers of a stream that fall behind
+STREAM_BUFFER_SIZE = 5
+
+MJPEG_CHUNK_SIZE = 102400
+
+_LOGGER = logging.getLogger(__name__)
+
 
 @asyncio.coroutine
 # pylint: disable=too-many-branches
@@ -41,9 +58,221 @@ def async_setup(hass, config):
     return True
 
 
+def _content_length(headers):
+    """Return the Content-Length of multipart headers or None."""
+    for line in headers.splitlines():
+        name, _, value = line.partition(b':')
+
+        if name.strip().lower() == b'content-length':
+            try:
+                return int(value)
+            except ValueError:
+                return None
+
+    return None
+
+
+def split_mjpeg_frames(data, boundary):
+    """Split multipart MJPEG data into the complete frames and the rest.
+
+    Every part starts with the boundary line and its headers. A part with
+    a Content-Length header ends after that many bytes, other parts end at
+    the next boundary. JPEG markers are not looked at, as an embedded
+    thumbnail contains markers of its own.
+    """
+    frames = []
+    pos = 0
+
+    while True:
+        start = data.find(boundary, pos)
+
+        if start == -1:
+            # A boundary may be split between two chunks.
+            return frames, data[max(pos, len(data) - len(boundary) + 1):]
+
+        header_end = data.find(b'\r\n\r\n', start)
+        separator = 4
+
+        if header_end == -1:
+            header_end = data.find(b'\n\n', start)
+            separator = 2
+
+        if header_end == -1:
+            return frames, data[start:]
+
+        body_start = header_end + separator
+        length = _content_length(data[start + len(boundary):header_end])
+
+        if length is not None:
+            body_end = pos = body_start + length
+
+            if body_end > len(data):
+                return frames, data[start:]
+        else:
+            body_end = pos = data.find(boundary, body_start)
+
+            if body_end == -1:
+                return frames, data[start:]
+
+        frames.append(data[body_start:body_end].rstrip(b'\r\n'))
+
+
+@asyncio.coroutine
+def async_read_mjpeg_frames(read, publish):
+    """Read a multipart MJPEG stream and pass each frame in it to publish.
+
+    Read is a coroutine function that returns the next chunk of the stream
+    and an empty chunk once the stream ended. The boundary is taken from
+    the first line of the stream, as cameras do not agree on how the
+    boundary in the Content-Type header relates to the one they send.
+
+    This method is a coroutine.
+    """
+    rest = b''
+    boundary = None
+
+    while True:
+        data = yield from read(MJPEG_CHUNK_SIZE)
+
+        if not data:
+            return
+
+        rest += data
+
+        if boundary is None:
+            rest = rest.lstrip(b'\r\n')
+            line_end = rest.find(b'\n')
+
+            if line_end == -1:
+                continue
+
+            boundary = rest[:line_end].strip()
+
+            if not boundary.startswith(b'--'):
+                _LOGGER.error("Stream is not a multipart MJPEG stream")
+                return
+
+        frames, rest = split_mjpeg_frames(rest, boundary)
+
+        for frame in frames:
+            publish(frame)
+
+
+class CameraStreamHub(object):
+    """Share a single upstream stream of a camera between all viewers.
+
+    The upstream stream is only read while there are viewers. Every frame is
+    stored once in a ring buffer that all viewers read from. Viewers that
+    fall further behind than the buffer skip to the newest frame.
+    """
+
+    def __init__(self, hass, stream_frames, buffer_size=STREAM_BUFFER_SIZE):
+        """Initialize the stream hub.
+
+        Stream_frames is a coroutine function that reads the upstream stream
+        and passes each frame to the callback it is called with.
+        """
+        self.hass = hass
+        self.viewers = 0
+        self._stream_frames = stream_frames
+        self._frames = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._upstream = None
+        self._waiter = None
+
+    @callback
+    def async_add_viewer(self):
+        """Add a viewer and open the upstream stream if needed.
+
+        This method must be run in the event loop.
+        """
+        self.viewers += 1
+
+        if self._upstream is None:
+            self._frames.clear()
+            self._upstream = self.hass.loop.create_task(
+                self._async_read_upstream())
+
+    @callback
+    def async_remove_viewer(self):
+        """Remove a viewer and close the upstream stream after the last.
+
+        This method must be run in the event loop.
+        """
+        self.viewers -= 1
+
+        if self.viewers == 0 and self._upstream is not None:
+            self._upstream.cancel()
+            self._upstream = None
+
+    @asyncio.coroutine
+    def async_next_frame(self, seq=None):
+        """Return the sequence number and image of the frame after seq.
+
+        Returns the newest frame if seq is None or if the frame after seq is
+        no longer buffered. Returns None once the upstream stream ended.
+
+        This method is a coroutine.
+        """
+        while True:
+            newest = self._seq
+
+            if self._frames and (seq is None or seq < newest):
+                oldest = newest - len(self._frames) + 1
+
+                if seq is None or seq + 1 < oldest:
+                    seq = newest
+                else:
+                    seq += 1
+
+                return seq, self._frames[seq - oldest]
+
+            if self._upstream is None:
+                return None
+
+            if self._waiter is None:
+                self._waiter = asyncio.Future(loop=self.hass.loop)
+
+            # Shield the shared waiter from viewers that are cancelled.
+            yield from asyncio.shield(self._waiter, loop=self.hass.loop)
+
+    @asyncio.coroutine
+    def _async_read_upstream(self):
+        """Read the upstream stream until it ends or is cancelled."""
+        task = asyncio.Task.current_task(loop=self.hass.loop)
+
+        try:
+            yield from self._stream_frames(self._async_publish)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception('Error reading camera stream')
+        finally:
+            if self._upstream is task:
+                self._upstream = None
+            self._async_wake_viewers()
+
+    @callback
+    def _async_publish(self, image):
+        """Store a new frame and wake up the viewers."""
+        self._seq += 1
+        self._frames.append(image)
+        self._async_wake_viewers()
+
+    @callback
+    def _async_wake_viewers(self):
+        """Wake up the viewers waiting for a frame."""
+        if self._waiter is not None:
+            self._waiter.set_result(None)
+            self._waiter = None
+
+
 class Camera(Entity):
     """The base class for camera entities."""
 
+    # Shares the stream of the camera between viewers
+    _stream_hub = None
+
     def __init__(self):
         """Initialize a camera."""
         self.is_streaming = False
@@ -63,6 +292,11 @@ class Camera(Entity):
         """Return a link to the camera feed as entity picture."""
         return ENTITY_IMAGE_URL.format(self.entity_id, self.access_token)
 
+    @property
+    def image_cache_ttl(self):
+        """Return seconds an image of this camera may be served cached."""
+        return IMAGE_CACHE_TTL
+
     @property
     def is_recording(self):
         """Return true if the device is recording."""
@@ -92,9 +326,40 @@ class Camera(Entity):
             None, self.camera_image)
         return image
 
+    @property
+    def stream_hub(self):
+        """Return the hub that shares the stream of this camera."""
+        if self._stream_hub is None:
+            self._stream_hub = CameraStreamHub(
+                self.hass, self.async_stream_frames)
+
+        return self._stream_hub
+
+    @asyncio.coroutine
+    def async_stream_frames(self, publish):
+        """Read frames from the camera and pass each to publish.
+
+        Runs until the stream ends. The default implementation polls camera
+        images and only publishes the ones that changed.
+
+        This method is a coroutine.
+        """
+        last_image = None
+
+        while True:
+            img_bytes = yield from self.async_camera_image()
+            if not img_bytes:
+                break
+
+            if img_bytes != last_image:
+                publish(img_bytes)
+                last_image = img_bytes
+
+            yield from asyncio.sleep(STREAM_POLL_INTERVAL, loop=self.hass.loop)
+
     @asyncio.coroutine
     def handle_async_mjpeg_stream(self, request):
-        """Generate an HTTP MJPEG stream from camera images.
+        """Generate an HTTP MJPEG stream from the shared camera stream.
 
         This method must be run in the event loop.
         """
@@ -113,27 +378,28 @@ class Camera(Entity):
                 'Content-Length: {}\r\n\r\n'.format(
                     len(img_bytes)), 'utf-8') + img_bytes + b'\r\n')
 
-        last_image = None
+        hub = self.stream_hub
+        hub.async_add_viewer()
+        seq = None
 
         try:
             while True:
-                img_bytes = yield from self.async_camera_image()
-                if not img_bytes:
+                frame = yield from hub.async_next_frame(seq)
+                if frame is None:
                     break
 
-                if img_bytes is not None and img_bytes != last_image:
-                    write(img_bytes)
-
-                    # Chrome seems to always ignore first picture,
-                    # print it twice.
-                    if last_image is None:
-                        write(img_bytes)
+                img_bytes = frame[1]
+                write(img_bytes)
 
-                    last_image = img_bytes
-                    yield from response.drain()
+                # Chrome seems to always ignore first picture,
+                # print it twice.
+                if seq is None:
+                    write(img_bytes)
 
-                yield from asyncio.sleep(.5)
+                seq = frame[0]
+                yield from response.drain()
         finally:
+            hub.async_remove_viewer()
             self.hass.loop.create_task(response.write_eof())
 
     @property
@@ -201,15 +467,22 @@ class CameraImageView(CameraView):
     url = "/api/camera_proxy/{entity_id}"
     name = "api:camera:image"
 
+    def __init__(self, hass, entities):
+        """Initialize a camera image view."""
+        super().__init__(hass, entities)
+        self.image_cache = ImageCache(hass)
+
     @asyncio.coroutine
     def handle(self, request, camera):
         """Serve camera image."""
-        image = yield from camera.async_camera_image()
+        cached = yield from self.image_cache.async_get(
+            camera.entity_id, None, camera.async_camera_image,
+            camera.image_cache_ttl)
 
-        if image is None:
+        if cached is None:
             return web.Response(status=500)
 
-        return web.Response(body=image)
+        return self.image(request, cached.image, cached.etag)
 
 
 class CameraMjpegStream(CameraView):
@@ -8,9 +8,9 @@ import asyncio
 import logging
 
 import voluptuous as vol
-from aiohttp import web
 
-from homeassistant.components.camera import Camera, PLATFORM_SCHEMA
+from homeassistant.components.camera import (
+    Camera, PLATFORM_SCHEMA, async_read_mjpeg_frames)
 from homeassistant.components.ffmpeg import (
     async_run_test, get_binary, CONF_INPUT, CONF_EXTRA_ARGUMENTS)
 import homeassistant.helpers.config_validation as cv
@@ -65,29 +65,18 @@ class FFmpegCamera(Camera):
         return image
 
     @asyncio.coroutine
-    def handle_async_mjpeg_stream(self, request):
-        """Generate an HTTP MJPEG stream from the camera."""
+    def async_stream_frames(self, publish):
+        """Read the MJPEG stream of the camera and publish its frames."""
         from haffmpeg import CameraMjpegAsync
 
         stream = CameraMjpegAsync(get_binary(), loop=self.hass.loop)
         yield from stream.open_camera(
             self._input, extra_cmd=self._extra_arguments)
 
-        response = web.StreamResponse()
-        response.content_type = 'multipart/x-mixed-replace;boundary=ffserver'
-        response.enable_chunked_encoding()
-
-        yield from response.prepare(request)
-
         try:
-            while True:
-                data = yield from stream.read(102400)
-                if not data:
-                    break
-                response.write(data)
+            yield from async_read_mjpeg_frames(stream.read, publish)
         finally:
             self.hass.loop.create_task(stream.close())
-            self.hass.loop.create_task(response.write_eof())
 
     @property
     def name(self):
@@ -79,6 +79,15 @@ class GenericCamera(Camera):
         return run_coroutine_threadsafe(
             self.async_camera_image(), self.hass.loop).result()
 
+    @property
+    def image_cache_ttl(self):
+        """Return seconds an image of this camera may be served cached."""
+        # Images are already kept until the URL changes.
+        if self._limit_refetch:
+            return 0
+
+        return super().image_cache_ttl
+
     @asyncio.coroutine
     def async_camera_image(self):
         """Return a still image response from the camera."""
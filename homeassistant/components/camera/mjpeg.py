@@ -9,8 +9,6 @@ import logging
 from contextlib import closing
 
 import aiohttp
-from aiohttp import web
-from aiohttp.web_exceptions import HTTPGatewayTimeout
 import async_timeout
 import requests
 from requests.auth import HTTPBasicAuth, HTTPDigestAuth
@@ -19,13 +17,13 @@ import voluptuous as vol
 from homeassistant.const import (
     CONF_NAME, CONF_USERNAME, CONF_PASSWORD, CONF_AUTHENTICATION,
     HTTP_BASIC_AUTHENTICATION, HTTP_DIGEST_AUTHENTICATION)
-from homeassistant.components.camera import (PLATFORM_SCHEMA, Camera)
+from homeassistant.components.camera import (
+    PLATFORM_SCHEMA, Camera, async_read_mjpeg_frames)
 from homeassistant.helpers import config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
 
 CONF_MJPEG_URL = 'mjpeg_url'
-CONTENT_TYPE_HEADER = 'Content-Type'
 
 DEFAULT_NAME = 'Mjpeg Camera'
 
@@ -94,11 +92,11 @@ class MjpegCamera(Camera):
             return extract_image_from_mjpeg(response.iter_content(102400))
 
     @asyncio.coroutine
-    def handle_async_mjpeg_stream(self, request):
-        """Generate an HTTP MJPEG stream from the camera."""
+    def async_stream_frames(self, publish):
+        """Read the MJPEG stream of the camera and publish its frames."""
         # aiohttp don't support DigestAuth -> Fallback
         if self._authentication == HTTP_DIGEST_AUTHENTICATION:
-            yield from super().handle_async_mjpeg_stream(request)
+            yield from super().async_stream_frames(publish)
             return
 
         # connect to stream
@@ -109,23 +107,13 @@ class MjpegCamera(Camera):
                     auth=self._auth
                 )
         except asyncio.TimeoutError:
-            raise HTTPGatewayTimeout()
-
-        response = web.StreamResponse()
-        response.content_type = stream.headers.get(CONTENT_TYPE_HEADER)
-        response.enable_chunked_encoding()
-
-        yield from response.prepare(request)
+            _LOGGER.error('Timeout connecting to %s', self._mjpeg_url)
+            return
 
         try:
-            while True:
-                data = yield from stream.content.read(102400)
-                if not data:
-                    break
-                response.write(data)
+            yield from async_read_mjpeg_frames(stream.content.read, publish)
         finally:
             self.hass.loop.create_task(stream.release())
-            self.hass.loop.create_task(response.write_eof())
 
     @property
     def name(self):
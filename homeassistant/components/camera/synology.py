@@ -9,15 +9,13 @@ import logging
 
 import voluptuous as vol
 
-from aiohttp import web
-from aiohttp.web_exceptions import HTTPGatewayTimeout
 import async_timeout
 
 from homeassistant.const import (
     CONF_NAME, CONF_USERNAME, CONF_PASSWORD,
     CONF_URL, CONF_WHITELIST)
 from homeassistant.components.camera import (
-    Camera, PLATFORM_SCHEMA)
+    Camera, PLATFORM_SCHEMA, async_read_mjpeg_frames)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util.async import run_coroutine_threadsafe
 
@@ -42,7 +40,6 @@ WEBAPI_PATH = '/webapi/'
 AUTH_PATH = 'auth.cgi'
 CAMERA_PATH = 'camera.cgi'
 STREAMING_PATH = 'SurveillanceStation/videoStreaming.cgi'
-CONTENT_TYPE_HEADER = 'Content-Type'
 
 SYNO_API_URL = '{0}{1}{2}'
 
@@ -250,8 +247,8 @@ class SynologyCamera(Camera):
         return image
 
     @asyncio.coroutine
-    def handle_async_mjpeg_stream(self, request):
-        """Return a MJPEG stream image response directly from the camera."""
+    def async_stream_frames(self, publish):
+        """Read the MJPEG stream of the camera and publish its frames."""
         streaming_url = SYNO_API_URL.format(
             self._synology_url, WEBAPI_PATH, self._streaming_path)
 
@@ -271,23 +268,13 @@ class SynologyCamera(Camera):
                     cookies={'id': self._session_id}
                 )
         except asyncio.TimeoutError:
-            raise HTTPGatewayTimeout()
-
-        response = web.StreamResponse()
-        response.content_type = stream.headers.get(CONTENT_TYPE_HEADER)
-        response.enable_chunked_encoding()
-
-        yield from response.prepare(request)
+            _LOGGER.error("Timeout on %s", streaming_url)
+            return
 
         try:
-            while True:
-                data = yield from stream.content.read(102400)
-                if not data:
-                    break
-                response.write(data)
+            yield from async_read_mjpeg_frames(stream.content.read, publish)
         finally:
             self.hass.loop.create_task(stream.release())
-            self.hass.loop.create_task(response.write_eof())
 
     @property
     def name(self):
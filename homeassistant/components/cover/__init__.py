@@ -5,6 +5,7 @@ For more details about this platform, please refer to the documentation at
 https://home-assistant.io/components/cover/
 """
 import os
+import asyncio
 import logging
 
 import voluptuous as vol
@@ -129,18 +130,17 @@ def setup(hass, config):
         _LOGGER, DOMAIN, hass, SCAN_INTERVAL, GROUP_NAME_ALL_COVERS)
     component.setup(config)
 
-    def handle_cover_service(service):
+    @asyncio.coroutine
+    def async_handle_cover_service(service):
         """Handle calls to the cover services."""
         method = SERVICE_TO_METHOD.get(service.service)
         params = service.data.copy()
         params.pop(ATTR_ENTITY_ID, None)
 
         if method:
-            for cover in component.extract_from_service(service):
-                getattr(cover, method['method'])(**params)
-
-                if cover.should_poll:
-                    cover.update_ha_state(True)
+            yield from component.async_call_entity_service(
+                component.async_extract_from_service(service),
+                method['method'], **params)
 
     descriptions = load_yaml_config_file(
         os.path.join(os.path.dirname(__file__), 'services.yaml'))
@@ -148,8 +148,9 @@ def setup(hass, config):
     for service_name in SERVICE_TO_METHOD:
         schema = SERVICE_TO_METHOD[service_name].get(
             'schema', COVER_SERVICE_SCHEMA)
-        hass.services.register(DOMAIN, service_name, handle_cover_service,
-                               descriptions.get(service_name), schema=schema)
+        hass.services.register(
+            DOMAIN, service_name, async_handle_cover_service,
+            descriptions.get(service_name), schema=schema)
     return True
 
 
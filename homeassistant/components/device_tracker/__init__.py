@@ -8,16 +8,22 @@ https://home-assistant.io/components/device_tracker/
 # pylint: disable=too-many-locals
 import asyncio
 from datetime import timedelta
+import heapq
+from itertools import count
 import logging
 import os
+import re
+import subprocess
 import threading
-from typing import Any, Sequence, Callable
+from timeit import default_timer as timer
+from typing import Any, Callable, Dict, Sequence
 
 import voluptuous as vol
 import yaml
 
 from homeassistant.bootstrap import (
     prepare_setup_platform, log_exception)
+from homeassistant.core import callback
 from homeassistant.components import group, zone
 from homeassistant.components.discovery import SERVICE_NETGEAR
 from homeassistant.config import load_yaml_config_file
@@ -30,7 +36,8 @@ import homeassistant.util as util
 from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 
-from homeassistant.helpers.event import track_utc_time_change
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time, track_utc_time_change)
 from homeassistant.const import (
     ATTR_GPS_ACCURACY, ATTR_LATITUDE, ATTR_LONGITUDE,
     DEVICE_DEFAULT_NAME, STATE_HOME, STATE_NOT_HOME)
@@ -75,6 +82,16 @@ PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
                      cv.time_period, cv.positive_timedelta)
 })
 
+DATA_SCAN_METRICS = 'device_tracker_scan_metrics'
+
+PROC_NET_ARP = '/proc/net/arp'
+ARP_CACHE_TIME = 5  # seconds
+
+_ARP_ENTRY_REGEX = re.compile(
+    r'\((\d+\.\d+\.\d+\.\d+)\) at ((?:[0-9A-Fa-f]{1,2}:){5}[0-9A-Fa-f]{1,2})')
+_ARP_LOCK = threading.Lock()
+_ARP_TABLE = None
+
 DISCOVERY_PLATFORMS = {
     SERVICE_NETGEAR: 'netgear',
 }
@@ -140,10 +157,19 @@ def setup(hass: HomeAssistantType, config: ConfigType):
                     _LOGGER.error('Error setting up platform %s', p_type)
                     return
 
-                setup_scanner_platform(hass, p_config, scanner, tracker.see)
+                setup_scanner_platform(hass, p_config, scanner,
+                                       tracker.async_see, p_type)
                 return
 
-            if not platform.setup_scanner(hass, p_config, tracker.see):
+            if hasattr(platform, 'async_setup_scanner'):
+                success = run_coroutine_threadsafe(
+                    platform.async_setup_scanner(
+                        hass, p_config, tracker.async_see),
+                    hass.loop).result()
+            else:
+                success = platform.setup_scanner(hass, p_config, tracker.see)
+
+            if not success:
                 _LOGGER.error('Error setting up platform %s', p_type)
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception('Error setting up platform %s', p_type)
@@ -158,23 +184,19 @@ def setup(hass: HomeAssistantType, config: ConfigType):
     discovery.listen(hass, DISCOVERY_PLATFORMS.keys(),
                      device_tracker_discovered)
 
-    def update_stale(now):
-        """Clean up stale devices."""
-        tracker.update_stale(now)
-    track_utc_time_change(hass, update_stale, second=range(0, 60, 5))
-
     tracker.setup_group()
 
-    def see_service(call):
+    @asyncio.coroutine
+    def async_see_service(call):
         """Service to see a device."""
         args = {key: value for key, value in call.data.items() if key in
                 (ATTR_MAC, ATTR_DEV_ID, ATTR_HOST_NAME, ATTR_LOCATION_NAME,
                  ATTR_GPS, ATTR_GPS_ACCURACY, ATTR_BATTERY, ATTR_ATTRIBUTES)}
-        tracker.see(**args)
+        yield from tracker.async_see(**args)
 
     descriptions = load_yaml_config_file(
         os.path.join(os.path.dirname(__file__), 'services.yaml'))
-    hass.services.register(DOMAIN, SERVICE_SEE, see_service,
+    hass.services.register(DOMAIN, SERVICE_SEE, async_see_service,
                            descriptions.get(SERVICE_SEE))
 
     return True
@@ -197,56 +219,111 @@ class DeviceTracker(object):
                                 dev.mac)
         self.consider_home = consider_home
         self.track_new = track_new
-        self.lock = threading.Lock()
 
         for device in devices:
             if device.track:
                 device.update_ha_state()
 
         self.group = None  # type: group.Group
+        self._new_group_members = []
+        self._new_config_devices = []
+        self._config_writer = None
+        self._stale_heap = []
+        self._stale_seq = count()
+        self._stale_check_at = None
+        self._async_unsub_stale_check = None
 
     def see(self, mac: str=None, dev_id: str=None, host_name: str=None,
             location_name: str=None, gps: GPSType=None, gps_accuracy=None,
             battery: str=None, attributes: dict=None):
         """Notify the device tracker that you see a device."""
-        with self.lock:
-            if mac is None and dev_id is None:
-                raise HomeAssistantError('Neither mac or device id passed in')
-            elif mac is not None:
-                mac = str(mac).upper()
-                device = self.mac_to_dev.get(mac)
-                if not device:
-                    dev_id = util.slugify(host_name or '') or util.slugify(mac)
-            else:
-                dev_id = cv.slug(str(dev_id).lower())
-                device = self.devices.get(dev_id)
-
-            if device:
-                device.seen(host_name, location_name, gps, gps_accuracy,
-                            battery, attributes)
-                if device.track:
-                    device.update_ha_state()
-                return
+        run_coroutine_threadsafe(
+            self.async_see(mac, dev_id, host_name, location_name, gps,
+                           gps_accuracy, battery, attributes),
+            self.hass.loop).result()
+
+    @asyncio.coroutine
+    def async_see(self, mac: str=None, dev_id: str=None, host_name: str=None,
+                  location_name: str=None, gps: GPSType=None,
+                  gps_accuracy=None, battery: str=None,
+                  attributes: dict=None):
+        """Notify the device tracker that you see a device.
+
+        This method is a coroutine.
+        """
+        if mac is None and dev_id is None:
+            raise HomeAssistantError('Neither mac or device id passed in')
+        elif mac is not None:
+            mac = str(mac).upper()
+            device = self.mac_to_dev.get(mac)
+            if not device:
+                dev_id = util.slugify(host_name or '') or util.slugify(mac)
+        else:
+            dev_id = cv.slug(str(dev_id).lower())
+            device = self.devices.get(dev_id)
 
-            # If no device can be found, create it
-            dev_id = util.ensure_unique_string(dev_id, self.devices.keys())
-            device = Device(
-                self.hass, self.consider_home, self.track_new,
-                dev_id, mac, (host_name or dev_id).replace('_', ' '))
-            self.devices[dev_id] = device
-            if mac is not None:
-                self.mac_to_dev[mac] = device
-
-            device.seen(host_name, location_name, gps, gps_accuracy, battery,
-                        attributes)
+        if device:
+            yield from device.async_seen(host_name, location_name, gps,
+                                         gps_accuracy, battery, attributes)
+            self._async_schedule_stale(device)
             if device.track:
-                device.update_ha_state()
+                yield from device.async_update_ha_state()
+            return
 
-            # During init, we ignore the group
-            if self.group is not None:
-                self.group.update_tracked_entity_ids(
-                    list(self.group.tracking) + [device.entity_id])
-            update_config(self.hass.config.path(YAML_DEVICES), dev_id, device)
+        # If no device can be found, create it
+        dev_id = util.ensure_unique_string(dev_id, self.devices.keys())
+        device = Device(
+            self.hass, self.consider_home, self.track_new,
+            dev_id, mac, (host_name or dev_id).replace('_', ' '))
+        self.devices[dev_id] = device
+        if mac is not None:
+            self.mac_to_dev[mac] = device
+
+        yield from device.async_seen(host_name, location_name, gps,
+                                     gps_accuracy, battery, attributes)
+        self._async_schedule_stale(device)
+        if device.track:
+            yield from device.async_update_ha_state()
+
+        # During init, we ignore the group
+        if self.group is not None:
+            if not self._new_group_members:
+                self.hass.async_add_job(self._async_update_group)
+            self._new_group_members.append(device.entity_id)
+
+        self._new_config_devices.append(device)
+        if self._config_writer is None:
+            self._config_writer = self.hass.loop.create_task(
+                self._async_write_config())
+
+    @asyncio.coroutine
+    def _async_update_group(self):
+        """Add all devices created since the last update to the group.
+
+        This method is a coroutine.
+        """
+        new_members, self._new_group_members = self._new_group_members, []
+        yield from self.group.async_update_tracked_entity_ids(
+            list(self.group.tracking) + new_members)
+
+    @asyncio.coroutine
+    def _async_write_config(self):
+        """Append new devices to the known devices file in batches.
+
+        Devices created while a batch is being written are written by the
+        next batch.
+
+        This method is a coroutine.
+        """
+        try:
+            while self._new_config_devices:
+                devices, self._new_config_devices = \
+                    self._new_config_devices, []
+                yield from self.hass.async_add_pool_job(
+                    update_config_many, self.hass.config.path(YAML_DEVICES),
+                    devices)
+        finally:
+            self._config_writer = None
 
     def setup_group(self):
         """Initialize group for all tracked devices."""
@@ -264,13 +341,61 @@ class DeviceTracker(object):
         self.group = yield from group.Group.async_create_group(
             self.hass, GROUP_NAME_ALL_DEVICES, entity_ids, False)
 
-    def update_stale(self, now: dt_util.dt.datetime):
-        """Update stale devices."""
-        with self.lock:
-            for device in self.devices.values():
-                if (device.track and device.last_update_home and
-                        device.stale(now)):
-                    device.update_ha_state(True)
+    @callback
+    def _async_schedule_stale(self, device: 'Device'):
+        """Schedule a check for when device becomes stale.
+
+        Devices are kept in a heap ordered by the time they become stale.
+        Entries of devices that have been seen again are skipped when they
+        come up.
+
+        This method must be run in the event loop.
+        """
+        deadline = device.last_seen + device.consider_home
+        heapq.heappush(self._stale_heap,
+                       (deadline, next(self._stale_seq), device))
+
+        if self._stale_check_at is None or deadline < self._stale_check_at:
+            self._async_schedule_stale_check(deadline)
+
+    @callback
+    def _async_schedule_stale_check(self, deadline: dt_util.dt.datetime):
+        """Check for stale devices once deadline has passed.
+
+        This method must be run in the event loop.
+        """
+        if self._async_unsub_stale_check is not None:
+            self._async_unsub_stale_check()
+
+        self._stale_check_at = deadline
+        # A device is stale only after its deadline has passed.
+        self._async_unsub_stale_check = async_track_point_in_utc_time(
+            self.hass, self.async_update_stale,
+            deadline + timedelta(microseconds=1))
+
+    @callback
+    def async_update_stale(self, now: dt_util.dt.datetime):
+        """Update devices that have become stale.
+
+        This method must be run in the event loop.
+        """
+        self._stale_check_at = None
+        self._async_unsub_stale_check = None
+        heap = self._stale_heap
+
+        while heap and heap[0][0] < now:
+            deadline, _, device = heapq.heappop(heap)
+
+            if deadline != device.last_seen + device.consider_home:
+                # Seen again since this entry was added.
+                continue
+
+            if device.track and device.last_update_home:
+                self.hass.loop.create_task(
+                    device.async_update_ha_state(True))
+
+        if heap:
+            self._async_schedule_stale_check(heap[0][0])
 
 
 class Device(Entity):
@@ -361,6 +486,19 @@ class Device(Entity):
              gps: GPSType=None, gps_accuracy=0, battery: str=None,
              attributes: dict=None):
         """Mark the device as seen."""
+        run_coroutine_threadsafe(
+            self.async_seen(host_name, location_name, gps, gps_accuracy,
+                            battery, attributes),
+            self.hass.loop).result()
+
+    @asyncio.coroutine
+    def async_seen(self, host_name: str=None, location_name: str=None,
+                   gps: GPSType=None, gps_accuracy=0, battery: str=None,
+                   attributes: dict=None):
+        """Mark the device as seen.
+
+        This method is a coroutine.
+        """
         self.last_seen = dt_util.utcnow()
         self.host_name = host_name
         self.location_name = location_name
@@ -374,22 +512,26 @@ class Device(Entity):
             except (ValueError, TypeError, IndexError):
                 _LOGGER.warning('Could not parse gps value for %s: %s',
                                 self.dev_id, gps)
-        self.update()
+        yield from self.async_update()
 
     def stale(self, now: dt_util.dt.datetime=None):
         """Return if device state is stale."""
         return self.last_seen and \
             (now or dt_util.utcnow()) - self.last_seen > self.consider_home
 
-    def update(self):
-        """Update state of entity."""
+    @asyncio.coroutine
+    def async_update(self):
+        """Update state of entity.
+
+        This method is a coroutine.
+        """
         if not self.last_seen:
             return
         elif self.location_name:
             self._state = self.location_name
         elif self.gps is not None:
-            zone_state = zone.active_zone(self.hass, self.gps[0], self.gps[1],
-                                          self.gps_accuracy)
+            zone_state = zone.async_active_zone(
+                self.hass, self.gps[0], self.gps[1], self.gps_accuracy)
             if zone_state is None:
                 self._state = STATE_NOT_HOME
             elif zone_state.entity_id == zone.ENTITY_ID_HOME:
@@ -440,43 +582,157 @@ def load_config(path: str, hass: HomeAssistantType, consider_home: timedelta):
         return []
 
 
+class ScanMetrics(object):
+    """Keep track of the scans of a scanner platform."""
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self.scans = 0
+        self.skipped = 0
+        self.last_duration = None
+        self.max_duration = 0
+        self.total_duration = 0
+
+    @property
+    def mean_duration(self):
+        """Return the mean duration of a scan in seconds."""
+        if not self.scans:
+            return None
+
+        return self.total_duration / self.scans
+
+    def add_scan(self, duration: float):
+        """Record a scan that took duration seconds."""
+        self.scans += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+
+
 def setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
-                           scanner: Any, see_device: Callable):
-    """Helper method to connect scanner-based platform to device tracker."""
+                           scanner: Any, async_see_device: Callable,
+                           platform: str=None):
+    """Helper method to connect scanner-based platform to device tracker.
+
+    Scans run in the worker pool. A scan is skipped if the previous one of
+    the same scanner, including the name lookups of new devices, is still
+    running.
+    """
     interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    metrics = hass.data.setdefault(DATA_SCAN_METRICS, {}).setdefault(
+        platform or type(scanner).__name__, ScanMetrics())
+    scan_running = False
 
     # Initial scan of each mac we also tell about host name for config
     seen = set()  # type: Any
 
-    def device_tracker_scan(now: dt_util.dt.datetime):
+    @asyncio.coroutine
+    def async_device_tracker_scan(now: dt_util.dt.datetime):
         """Called when interval matches."""
-        for mac in scanner.scan_devices():
-            if mac in seen:
-                host_name = None
+        nonlocal scan_running
+
+        if scan_running:
+            metrics.skipped += 1
+            _LOGGER.warning('Skipping scan of %s, previous scan is still '
+                            'running', platform)
+            return
+
+        scan_running = True
+        start = timer()
+
+        try:
+            macs = yield from hass.async_add_pool_job(scanner.scan_devices)
+
+            for mac in macs:
+                if mac in seen:
+                    host_name = None
+                else:
+                    host_name = yield from hass.async_add_pool_job(
+                        scanner.get_device_name, mac)
+                    seen.add(mac)
+                yield from async_see_device(mac=mac, host_name=host_name)
+        finally:
+            scan_running = False
+            metrics.add_scan(timer() - start)
+
+    track_utc_time_change(hass, async_device_tracker_scan,
+                          second=range(0, 60, interval))
+
+    hass.loop.call_soon_threadsafe(
+        hass.async_add_job, async_device_tracker_scan, None)
+
+
+def get_arp_table() -> Dict[str, str]:
+    """Return the MAC addresses in the ARP cache of this host by IP.
+
+    Reads /proc/net/arp or, where that is not available, runs arp -an once.
+    The table is cached for a few seconds so scanners resolving many hosts,
+    or running at the same time, share a single read.
+    """
+    global _ARP_TABLE  # pylint: disable=global-statement
+
+    with _ARP_LOCK:
+        if _ARP_TABLE is not None and \
+                timer() - _ARP_TABLE[0] < ARP_CACHE_TIME:
+            return _ARP_TABLE[1]
+
+        try:
+            with open(PROC_NET_ARP) as arp_file:
+                table = _parse_proc_net_arp(arp_file.read())
+        except OSError:
+            try:
+                out = subprocess.check_output(['arp', '-an'])
+            except (OSError, subprocess.CalledProcessError) as err:
+                _LOGGER.error('Unable to read the ARP cache: %s', err)
+                table = {}
             else:
-                host_name = scanner.get_device_name(mac)
-                seen.add(mac)
-            see_device(mac=mac, host_name=host_name)
+                table = _parse_arp_output(out.decode('utf-8', 'replace'))
 
-    track_utc_time_change(hass, device_tracker_scan, second=range(0, 60,
-                                                                  interval))
+        _ARP_TABLE = (timer(), table)
+        return table
 
-    device_tracker_scan(None)
+
+def _parse_proc_net_arp(content: str) -> Dict[str, str]:
+    """Parse the content of /proc/net/arp."""
+    table = {}
+
+    for line in content.splitlines()[1:]:
+        fields = line.split()
+
+        # Flags 0x0 marks an incomplete entry
+        if len(fields) < 4 or fields[2] == '0x0':
+            continue
+
+        table[fields[0]] = fields[3].upper()
+
+    return table
+
+
+def _parse_arp_output(output: str) -> Dict[str, str]:
+    """Parse the output of arp -an."""
+    return {ip_address: mac.upper() for ip_address, mac
+            in _ARP_ENTRY_REGEX.findall(output)}
 
 
 def update_config(path: str, dev_id: str, device: Device):
     """Add device to YAML configuration file."""
+    update_config_many(path, [device])
+
+
+def update_config_many(path: str, devices: Sequence):
+    """Add devices to YAML configuration file."""
     with open(path, 'a') as out:
-        out.write('\n')
-
-        device = {device.dev_id: {
-            'name': device.name,
-            'mac': device.mac,
-            'picture': device.config_picture,
-            'track': device.track,
-            CONF_AWAY_HIDE: device.away_hide
-        }}
-        yaml.dump(device, out, default_flow_style=False)
+        for device in devices:
+            out.write('\n')
+
+            device = {device.dev_id: {
+                'name': device.name,
+                'mac': device.mac,
+                'picture': device.config_picture,
+                'track': device.track,
+                CONF_AWAY_HIDE: device.away_hide
+            }}
+            yaml.dump(device, out, default_flow_style=False)
 
 
 def get_gravatar_for_email(email: str):
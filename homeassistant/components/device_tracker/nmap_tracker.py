@@ -5,8 +5,6 @@ For more details about this platform, please refer to the documentation at
 https://home-assistant.io/components/device_tracker.nmap_scanner/
 """
 import logging
-import re
-import subprocess
 from collections import namedtuple
 from datetime import timedelta
 
@@ -14,7 +12,8 @@ import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
-from homeassistant.components.device_tracker import DOMAIN, PLATFORM_SCHEMA
+from homeassistant.components.device_tracker import (
+    DOMAIN, PLATFORM_SCHEMA, get_arp_table)
 from homeassistant.const import CONF_HOSTS
 from homeassistant.util import Throttle
 
@@ -46,18 +45,6 @@ def get_scanner(hass, config):
 Device = namedtuple('Device', ['mac', 'name', 'ip', 'last_update'])
 
 
-def _arp(ip_address):
-    """Get the MAC address for a given IP."""
-    cmd = ['arp', '-n', ip_address]
-    arp = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-    out, _ = arp.communicate()
-    match = re.search(r'(([0-9A-Fa-f]{1,2}\:){5}[0-9A-Fa-f]{1,2})', str(out))
-    if match:
-        return match.group(0)
-    _LOGGER.info('No MAC address found for %s', ip_address)
-    return None
-
-
 class NmapDeviceScanner(object):
     """This class scans for devices using nmap."""
 
@@ -126,13 +113,19 @@ class NmapDeviceScanner(object):
             return False
 
         now = dt_util.now()
+        arp_table = None
         for ipv4, info in result['scan'].items():
             if info['status']['state'] != 'up':
                 continue
             name = info['hostnames'][0]['name'] if info['hostnames'] else ipv4
             # Mac address only returned if nmap ran as root
-            mac = info['addresses'].get('mac') or _arp(ipv4)
+            mac = info['addresses'].get('mac')
+            if mac is None:
+                if arp_table is None:
+                    arp_table = get_arp_table()
+                mac = arp_table.get(ipv4)
             if mac is None:
+                _LOGGER.info('No MAC address found for %s', ipv4)
                 continue
             last_results.append(Device(mac.upper(), name, ipv4, now))
 
@@ -10,10 +10,10 @@ from datetime import timedelta
 import voluptuous as vol
 
 from homeassistant.const import (
-    CONF_NAME, CONF_WHITELIST, EVENT_STATE_CHANGED, STATE_UNKNOWN)
+    CONF_NAME, CONF_WHITELIST, STATE_UNKNOWN)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import state as state_helper
-from homeassistant.util import Throttle
+from homeassistant.helpers.export import EntityFilter, StateExporter
 
 REQUIREMENTS = ['dweepy==0.2.0']
 
@@ -32,40 +32,51 @@ CONFIG_SCHEMA = vol.Schema({
 }, extra=vol.ALLOW_EXTRA)
 
 
-# pylint: disable=too-many-locals
 def setup(hass, config):
     """Setup the Dweet.io component."""
     conf = config[DOMAIN]
-    name = conf.get(CONF_NAME)
     whitelist = conf.get(CONF_WHITELIST)
-    json_body = {}
 
-    def dweet_event_listener(event):
-        """Listen for new messages on the bus and sends them to Dweet.io."""
-        state = event.data.get('new_state')
-        if state is None or state.state in (STATE_UNKNOWN, '') \
-                or state.entity_id not in whitelist:
-            return
+    if not whitelist:
+        _LOGGER.warning('No entities are whitelisted for Dweet.io')
+        return True
+
+    DweetExporter(hass, conf.get(CONF_NAME),
+                  EntityFilter(include_entities=whitelist)).start()
+
+    return True
+
+
+class DweetExporter(StateExporter):
+    """Send the latest states of the whitelisted entities to Dweet.io.
+
+    All changes within MIN_TIME_BETWEEN_UPDATES are sent as one dweet.
+    """
+
+    batch_size = 1000
+    flush_interval = MIN_TIME_BETWEEN_UPDATES
+
+    def __init__(self, hass, name, entity_filter):
+        """Initialize the exporter."""
+        super().__init__(hass, DOMAIN, entity_filter)
+        self.thing = name
+        self._json_body = {}
+
+    def convert(self, event, state):
+        """Return the friendly name and value of a new state."""
+        if state.state in (STATE_UNKNOWN, ''):
+            return None
 
         try:
             _state = state_helper.state_as_number(state)
         except ValueError:
             _state = state.state
 
-        json_body[state.attributes.get('friendly_name')] = _state
-
-        send_data(name, json_body)
-
-    hass.bus.listen(EVENT_STATE_CHANGED, dweet_event_listener)
-
-    return True
+        return state.attributes.get('friendly_name'), _state
 
+    def send(self, items):
+        """Send the collected data to Dweet.io."""
+        import dweepy
 
-@Throttle(MIN_TIME_BETWEEN_UPDATES)
-def send_data(name, msg):
-    """Send the collected data to Dweet.io."""
-    import dweepy
-    try:
-        dweepy.dweet_for(name, msg)
-    except dweepy.DweepyError:
-        _LOGGER.error("Error saving data '%s' to Dweet.io", msg)
+        self._json_body.update(items)
+        dweepy.dweet_for(self.thing, self._json_body)
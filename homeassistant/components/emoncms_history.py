@@ -4,20 +4,22 @@ A component which allows you to send data to Emoncms.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/emoncms_history/
 """
+import asyncio
 import logging
 from datetime import timedelta
 
 import voluptuous as vol
-import requests
 
 from homeassistant.const import (
     CONF_API_KEY, CONF_WHITELIST,
     CONF_URL, STATE_UNKNOWN,
     STATE_UNAVAILABLE,
-    CONF_SCAN_INTERVAL)
+    CONF_SCAN_INTERVAL, EVENT_HOMEASSISTANT_STOP)
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import state as state_helper
-from homeassistant.helpers.event import track_point_in_time
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.export import StateExporter
 from homeassistant.util import dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,57 +41,79 @@ CONFIG_SCHEMA = vol.Schema({
 def setup(hass, config):
     """Setup the emoncms_history component."""
     conf = config[DOMAIN]
-    whitelist = conf.get(CONF_WHITELIST)
 
-    def send_data(url, apikey, node, payload):
-        """Send payload data to emoncms."""
-        try:
-            fullurl = "{}/input/post.json".format(url)
-            req = requests.post(fullurl,
-                                params={"node": node},
-                                data={"apikey": apikey,
-                                      "data": payload},
-                                allow_redirects=True,
-                                timeout=5)
-
-        except requests.exceptions.RequestException:
-            _LOGGER.error("Error saving data '%s' to '%s'",
-                          payload, fullurl)
-
-        else:
-            if req.status_code != 200:
-                _LOGGER.error("Error saving data '%s' to '%s'" +
-                              "(http status code = %d)", payload,
-                              fullurl, req.status_code)
-
-    def update_emoncms(time):
-        """Send whitelisted entities states reguarly to emoncms."""
-        payload_dict = {}
-
-        for entity_id in whitelist:
-            state = hass.states.get(entity_id)
-
-            if state is None or state.state in (
-                    STATE_UNKNOWN, "", STATE_UNAVAILABLE):
-                continue
-
-            try:
-                payload_dict[entity_id] = state_helper.state_as_number(
-                    state)
-            except ValueError:
-                continue
-
-        if len(payload_dict) > 0:
-            payload = "{%s}" % ",".join("{}:{}".format(key, val)
-                                        for key, val in
-                                        payload_dict.items())
-
-            send_data(conf.get(CONF_URL), conf.get(CONF_API_KEY),
-                      str(conf.get(CONF_INPUTNODE)), payload)
-
-        track_point_in_time(hass, update_emoncms, time +
-                            timedelta(seconds=conf.get(
-                                CONF_SCAN_INTERVAL)))
-
-    update_emoncms(dt_util.utcnow())
+    EmoncmsExporter(
+        hass, conf.get(CONF_URL), conf.get(CONF_API_KEY),
+        str(conf.get(CONF_INPUTNODE)), conf.get(CONF_WHITELIST),
+        timedelta(seconds=conf.get(CONF_SCAN_INTERVAL))).start()
+
     return True
+
+
+class EmoncmsExporter(StateExporter):
+    """Post the whitelisted states to an emoncms input node.
+
+    Every scan interval the current value of each whitelisted entity is
+    posted in one payload, whether it changed or not.
+    """
+
+    timeout = 5
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, hass, url, apikey, node, whitelist, scan_interval):
+        """Initialize the exporter."""
+        super().__init__(hass, DOMAIN)
+        self.fullurl = "{}/input/post.json".format(url)
+        self.apikey = apikey
+        self.node = node
+        self.whitelist = whitelist
+        self.flush_interval = scan_interval
+        self.batch_size = self.max_queue_size
+
+    def start(self):
+        """Start posting the whitelisted states every scan interval."""
+        self.hass.bus.listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop_listener)
+        self.hass.add_job(self._async_update, dt_util.utcnow())
+
+    def convert(self, event, state):
+        """Return the entity id and numeric value of a state.
+
+        This method must be run in the event loop.
+        """
+        if state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE):
+            return None
+
+        try:
+            return state.entity_id, state_helper.state_as_number(state)
+        except ValueError:
+            return None
+
+    @asyncio.coroutine
+    def async_send(self, items):
+        """Send payload data to emoncms.
+
+        This method is a coroutine.
+        """
+        payload = "{%s}" % ",".join("{}:{}".format(key, val)
+                                    for key, val in dict(items).items())
+
+        yield from self.async_post(self.fullurl,
+                                   params={"node": self.node},
+                                   data={"apikey": self.apikey,
+                                         "data": payload})
+
+    @callback
+    def _async_update(self, time):
+        """Queue the current whitelisted states and post them."""
+        for entity_id in self.whitelist:
+            state = self.hass.states.get(entity_id)
+            item = None if state is None else self.convert(None, state)
+
+            if item is not None:
+                self.async_add(item)
+
+        self.async_flush()
+
+        async_track_point_in_utc_time(
+            self.hass, self._async_update, time + self.flush_interval)
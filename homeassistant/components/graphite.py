@@ -5,8 +5,10 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/graphite/
 """
 import logging
+import pickle
 import queue
 import socket
+import struct
 import threading
 import time
 
@@ -20,16 +22,34 @@ import homeassistant.helpers.config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_FLUSH_INTERVAL = 'flush_interval'
+CONF_PROTOCOL = 'protocol'
+
+PROTOCOL_PICKLE = 'pickle'
+PROTOCOL_PLAINTEXT = 'plaintext'
+
+DATA_GRAPHITE = 'graphite_feeder'
+DEFAULT_FLUSH_INTERVAL = 1
 DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 2003
 DEFAULT_PREFIX = 'ha'
+DEFAULT_PROTOCOL = PROTOCOL_PLAINTEXT
 DOMAIN = 'graphite'
 
+# Seconds to wait before reconnecting after a failed connection, doubled on
+# every further failure.
+MIN_BACKOFF = 1
+MAX_BACKOFF = 60
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Optional(CONF_HOST, default=DEFAULT_HOST): cv.string,
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
         vol.Optional(CONF_PREFIX, default=DEFAULT_PREFIX): cv.string,
+        vol.Optional(CONF_PROTOCOL, default=DEFAULT_PROTOCOL):
+            vol.In([PROTOCOL_PLAINTEXT, PROTOCOL_PICKLE]),
+        vol.Optional(CONF_FLUSH_INTERVAL, default=DEFAULT_FLUSH_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -50,15 +70,25 @@ def setup(hass, config):
         _LOGGER.error('Not able to connect to Graphite')
         return False
 
-    GraphiteFeeder(hass, host, port, prefix)
+    hass.data[DATA_GRAPHITE] = GraphiteFeeder(
+        hass, host, port, prefix, conf.get(CONF_PROTOCOL),
+        conf.get(CONF_FLUSH_INTERVAL))
 
     return True
 
 
 class GraphiteFeeder(threading.Thread):
-    """Feed data to Graphite."""
+    """Feed data to Graphite.
 
-    def __init__(self, hass, host, port, prefix):
+    Metrics of all events within a flush interval are sent at once over a
+    single persistent connection. If the connection fails, the metrics are
+    dropped and reconnecting is delayed with an exponential backoff.
+    """
+
+    # pylint: disable=too-many-instance-attributes, too-many-arguments
+    def __init__(self, hass, host, port, prefix,
+                 protocol=DEFAULT_PROTOCOL,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
         """Initialize the feeder."""
         super(GraphiteFeeder, self).__init__(daemon=True)
         self._hass = hass
@@ -66,9 +96,19 @@ class GraphiteFeeder(threading.Thread):
         self._port = port
         # rstrip any trailing dots in case they think they need it
         self._prefix = prefix.rstrip('.')
+        self._protocol = protocol
+        self._flush_interval = flush_interval
         self._queue = queue.Queue()
         self._quit_object = object()
         self._we_started = False
+        self._sock = None
+        self._connected = False
+        self._metrics = []
+        self._backoff = 0
+        self._reconnect_at = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.last_flush_size = 0
 
         hass.bus.listen_once(EVENT_HOMEASSISTANT_START,
                              self.start_listen)
@@ -98,44 +138,137 @@ class GraphiteFeeder(threading.Thread):
             _LOGGER.error('Graphite feeder thread has died, not '
                           'queuing event!')
 
-    def _send_to_graphite(self, data):
-        """Send data to Graphite."""
+    def _connect(self):
+        """Open the connection to Graphite."""
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.settimeout(10)
         sock.connect((self._host, self._port))
-        sock.sendall(data.encode('ascii'))
-        sock.send('\n'.encode('ascii'))
-        sock.close()
+
+        if self._connected:
+            self.reconnects += 1
+
+        self._sock = sock
+        self._connected = True
+
+    def _close(self):
+        """Close the connection to Graphite."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _encode(self, metrics):
+        """Encode metrics for the configured protocol.
+
+        Return the data and the number of metrics in it. Metrics that can
+        not be encoded, like those with a non-ASCII path in the plaintext
+        protocol, are dropped.
+        """
+        encoded = []
+
+        for metric in metrics:
+            path, value, timestamp = metric
+            try:
+                if self._protocol == PROTOCOL_PICKLE:
+                    encoded.append((path, (timestamp, float(value))))
+                else:
+                    encoded.append(('%s %f %i\n' % metric).encode('ascii'))
+            except (OverflowError, UnicodeEncodeError, ValueError) as err:
+                self.dropped += 1
+                _LOGGER.warning('Unable to encode metric %s: %s', path, err)
+
+        if self._protocol == PROTOCOL_PICKLE:
+            payload = pickle.dumps(encoded, protocol=2)
+            return struct.pack('!L', len(payload)) + payload, len(encoded)
+
+        return b''.join(encoded), len(encoded)
+
+    def _send_to_graphite(self, data):
+        """Send data to Graphite over the persistent connection.
+
+        A connection that was closed by Graphite is only noticed when
+        sending fails, so sending is retried once on a new connection.
+        """
+        for attempt in range(2):
+            if self._sock is None:
+                self._connect()
+
+            try:
+                self._sock.sendall(data)
+                return
+            except socket.error:
+                self._close()
+                if attempt:
+                    raise
+
+    def _flush(self):
+        """Send the collected metrics to Graphite."""
+        metrics = self._metrics
+        self._metrics = []
+
+        if not metrics:
+            return
+
+        if time.time() < self._reconnect_at:
+            self.dropped += len(metrics)
+            return
+
+        data, count = self._encode(metrics)
+
+        if not count:
+            return
+
+        try:
+            self._send_to_graphite(data)
+        except socket.error as err:
+            self._close()
+            self.dropped += count
+            self._backoff = min(max(self._backoff * 2, MIN_BACKOFF),
+                                MAX_BACKOFF)
+            self._reconnect_at = time.time() + self._backoff
+            _LOGGER.error('Unable to send %d metrics to %s:%i, retrying in '
+                          '%is (%d dropped in total): %s', count,
+                          self._host, self._port, self._backoff,
+                          self.dropped, err)
+            return
+
+        self._backoff = 0
+        self.last_flush_size = count
+        _LOGGER.debug('Sent %d metrics to graphite', count)
 
     def _report_attributes(self, entity_id, new_state):
-        """Report the attributes."""
+        """Collect the metrics of the attributes."""
         now = time.time()
         things = dict(new_state.attributes)
         try:
             things['state'] = state.state_as_number(new_state)
         except ValueError:
             pass
-        lines = ['%s.%s.%s %f %i' % (self._prefix,
-                                     entity_id, key.replace(' ', '_'),
-                                     value, now)
-                 for key, value in things.items()
-                 if isinstance(value, (float, int))]
-        if not lines:
-            return
-        _LOGGER.debug('Sending to graphite: %s', lines)
-        try:
-            self._send_to_graphite('\n'.join(lines))
-        except socket.gaierror:
-            _LOGGER.error('Unable to connect to host %s', self._host)
-        except socket.error:
-            _LOGGER.exception('Failed to send data to graphite')
+        self._metrics.extend(
+            ('%s.%s.%s' % (self._prefix, entity_id, key.replace(' ', '_')),
+             value, now)
+            for key, value in things.items()
+            if isinstance(value, (float, int)))
 
     def run(self):
         """Run the process to export the data."""
+        flush_at = None
+
         while True:
-            event = self._queue.get()
+            try:
+                if flush_at is None:
+                    event = self._queue.get()
+                else:
+                    event = self._queue.get(
+                        timeout=max(flush_at - time.time(), 0))
+            except queue.Empty:
+                self._flush()
+                flush_at = None
+                continue
+
             if event == self._quit_object:
                 _LOGGER.debug('Event processing thread stopped')
+                self._flush()
+                self._close()
                 self._queue.task_done()
                 return
             elif (event.event_type == EVENT_STATE_CHANGED and
@@ -155,3 +288,6 @@ class GraphiteFeeder(threading.Thread):
                                 event.event_type)
 
             self._queue.task_done()
+
+            if self._metrics and flush_at is None:
+                flush_at = time.time() + self._flush_interval
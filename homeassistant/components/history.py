@@ -5,7 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/history/
 """
 import asyncio
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import timedelta
 from itertools import groupby
 import voluptuous as vol
@@ -14,6 +14,7 @@ from homeassistant.const import HTTP_BAD_REQUEST
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
+from homeassistant.components.recorder.statistics import PERIODS, period_start
 from homeassistant.components.frontend import register_built_in_panel
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
@@ -41,6 +42,13 @@ CONFIG_SCHEMA = vol.Schema({
     }),
 }, extra=vol.ALLOW_EXTRA)
 
+DEFAULT_PAGE_SIZE = 10000
+
+# Longer periods are drawn from the statistics of numeric entities
+STATISTICS_MIN_SPAN = timedelta(days=2)
+# Number of statistics per entity that a period is drawn from at most
+MAX_STATISTICS_POINTS = 2000
+
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
@@ -57,15 +65,8 @@ def last_5_states(entity_id):
         ).order_by(states.state_id.desc()).limit(5))
 
 
-def get_significant_states(start_time, end_time=None, entity_id=None,
-                           filters=None):
-    """
-    Return states changes during UTC period start_time - end_time.
-
-    Significant states are all states where there is a state change,
-    as well as all states from certain domains (for instance
-    thermostat so that we get current temperature in our graphs).
-    """
+def _significant_states_query(start_time, end_time, entity_id, filters):
+    """Return a query for the significant states of a period."""
     entity_ids = (entity_id.lower(), ) if entity_id is not None else None
     states = recorder.get_model('States')
     query = recorder.query('States').filter(
@@ -78,15 +79,226 @@ def get_significant_states(start_time, end_time=None, entity_id=None,
     if end_time is not None:
         query = query.filter(states.last_updated < end_time)
 
+    return query
+
+
+def _is_shown(state):
+    """Test if a state from the database is shown in the history."""
+    return (state is not None and _is_significant(state) and
+            not state.attributes.get(ATTR_HIDDEN, False))
+
+
+def get_significant_states(start_time, end_time=None, entity_id=None,
+                           filters=None):
+    """
+    Return states changes during UTC period start_time - end_time.
+
+    Significant states are all states where there is a state change,
+    as well as all states from certain domains (for instance
+    thermostat so that we get current temperature in our graphs).
+    """
+    states = recorder.get_model('States')
+    query = _significant_states_query(start_time, end_time, entity_id,
+                                      filters)
+
     states = (
         state for state in recorder.execute(
             query.order_by(states.entity_id, states.last_updated))
-        if (_is_significant(state) and
-            not state.attributes.get(ATTR_HIDDEN, False)))
+        if _is_shown(state))
 
     return states_to_json(states, start_time, entity_id, filters)
 
 
+def stream_significant_states(start_time, end_time=None, entity_id=None,
+                              filters=None, skip=None):
+    """Yield the significant states of a period as a list per entity.
+
+    Like get_significant_states, but the states are streamed from the
+    database so only the states of one entity are held in memory. The lists
+    are yielded in order of entity id. Skip can be a tuple of entity ids, a
+    start and an end, to leave the states of those entities from start
+    until end out of the query. This has to be consumed from a single
+    executor thread.
+    """
+    entity_ids = [entity_id] if entity_id is not None else None
+    start_states = {
+        state.entity_id: state for state in
+        get_states(start_time, entity_ids, filters=filters)}
+
+    for state in start_states.values():
+        state.last_changed = start_time
+        state.last_updated = start_time
+
+    states = recorder.get_model('States')
+    query = _significant_states_query(start_time, end_time, entity_id,
+                                      filters)
+    if skip is not None:
+        skip_entity_ids, skip_start, skip_end = skip
+        query = query.filter(
+            ~states.entity_id.in_(skip_entity_ids) |
+            (states.last_updated < skip_start) |
+            (states.last_updated >= skip_end))
+    rows = recorder.stream(
+        query.order_by(states.entity_id, states.last_updated))
+    states = (state for state in (row.to_native() for row in rows)
+              if _is_shown(state))
+
+    # Entities that only have a start state are yielded in between
+    start_ids = sorted(start_states)
+    pos = 0
+
+    for entity_id, group in groupby(states, lambda state: state.entity_id):
+        while pos < len(start_ids) and start_ids[pos] < entity_id:
+            if start_ids[pos] in start_states:
+                yield [start_states.pop(start_ids[pos])]
+            pos += 1
+
+        entity_states = []
+        if entity_id in start_states:
+            entity_states.append(start_states.pop(entity_id))
+        entity_states.extend(group)
+        yield entity_states
+
+    for start_id in sorted(start_states):
+        yield [start_states[start_id]]
+
+
+def statistics_period(start_time, end_time):
+    """Return the statistics period to draw a period from.
+
+    Returns None if the period is short enough to draw it from the states.
+    Otherwise the finest period that keeps the statistics per entity under
+    MAX_STATISTICS_POINTS is returned, or else the coarsest period.
+    """
+    span = end_time - start_time
+
+    if span <= STATISTICS_MIN_SPAN:
+        return None
+
+    for period in PERIODS:
+        if span.total_seconds() / period <= MAX_STATISTICS_POINTS:
+            return period
+
+    return PERIODS[-1]
+
+
+def stream_statistics_history(start_time, end_time, period, entity_id=None,
+                              filters=None, attributes=None):
+    """Yield the history of a period as a list of states per entity.
+
+    Numeric entities are drawn from their statistics of the given period,
+    as a state of the mean per period. Their attributes are taken from the
+    attributes dict, keyed by entity id, and entities hidden by them are
+    left out. Their significant states fill in the time before the first
+    and after the last statistics, which are only compiled going forward
+    and for finished periods. Other entities are drawn from their
+    significant states, which only change now and then. This has to be
+    consumed from a single executor thread.
+    """
+    from sqlalchemy import func
+
+    attributes = attributes or {}
+    statistics = recorder.get_model('Statistics')
+    query = recorder.query('Statistics').filter(
+        (statistics.period == period) &
+        (statistics.start >= period_start(start_time, period)) &
+        (statistics.start < end_time))
+
+    if filters:
+        entity_ids = [entity_id] if entity_id is not None else None
+        query = filters.apply(query, entity_ids, statistics)
+    elif entity_id is not None:
+        query = query.filter(statistics.entity_id == entity_id.lower())
+
+    # Only the states in the part of the period that all numeric entities
+    # have statistics for are left out of the query
+    ranges = list(recorder.stream(query.with_entities(
+        statistics.entity_id, func.min(statistics.start),
+        func.max(statistics.start)).group_by(statistics.entity_id)))
+    skip = None
+
+    if ranges:
+        skip = ([numeric_id for numeric_id, _, _ in ranges],
+                max(first for _, first, _ in ranges),
+                min(last for _, _, last in ranges) +
+                timedelta(seconds=period))
+
+    rows = recorder.stream(
+        query.order_by(statistics.entity_id, statistics.start))
+    raw_groups = stream_significant_states(
+        start_time, end_time, entity_id, filters, skip)
+    raw = next(raw_groups, None)
+
+    for numeric_id, group in groupby(rows, lambda row: row.entity_id):
+        entity_attributes = attributes.get(numeric_id)
+        numeric_states = [row.to_state(entity_attributes) for row in group]
+
+        while raw is not None and raw[0].entity_id < numeric_id:
+            yield raw
+            raw = next(raw_groups, None)
+
+        raw_states = []
+        if raw is not None and raw[0].entity_id == numeric_id:
+            raw_states = raw
+            raw = next(raw_groups, None)
+
+        if entity_attributes and entity_attributes.get(ATTR_HIDDEN, False):
+            continue
+
+        first = numeric_states[0].last_updated
+        end = numeric_states[-1].last_updated + timedelta(seconds=period)
+        yield ([state for state in raw_states if state.last_updated < first] +
+               numeric_states +
+               [state for state in raw_states if state.last_updated >= end])
+
+    while raw is not None:
+        yield raw
+        raw = next(raw_groups, None)
+
+
+def get_significant_states_page(start_time, end_time=None, entity_id=None,
+                                filters=None, limit=DEFAULT_PAGE_SIZE,
+                                cursor=None):
+    """Return a page of significant states and the cursor of the next page.
+
+    A page holds the states of at most limit rows, in order of
+    last_updated, as a list per entity. Only the first page, without a
+    cursor, includes the states at start_time. The next cursor is None on
+    the last page.
+    """
+    states = recorder.get_model('States')
+    query = _significant_states_query(start_time, end_time, entity_id,
+                                      filters)
+
+    if cursor is not None:
+        query = recorder.after_cursor(
+            query, states.last_updated, states.state_id, cursor)
+
+    rows = list(recorder.stream(
+        query.order_by(states.last_updated, states.state_id).limit(limit)))
+
+    result = OrderedDict()
+
+    if cursor is None:
+        entity_ids = [entity_id] if entity_id is not None else None
+        for state in get_states(start_time, entity_ids, filters=filters):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            result[state.entity_id] = [state]
+
+    for state in (row.to_native() for row in rows):
+        if _is_shown(state):
+            result.setdefault(state.entity_id, []).append(state)
+
+    next_cursor = None
+
+    if len(rows) == limit:
+        next_cursor = recorder.encode_cursor(
+            rows[-1].last_updated, rows[-1].state_id)
+
+    return list(result.values()), next_cursor
+
+
 def state_changes_during_period(start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     states = recorder.get_model('States')
@@ -237,14 +449,50 @@ class HistoryPeriodView(HomeAssistantView):
         else:
             start_time = dt_util.utcnow() - one_day
 
-        end_time = start_time + one_day
+        end_time = request.GET.get('end_time')
+
+        if end_time is None:
+            end_time = start_time + one_day
+        else:
+            end_time = dt_util.parse_datetime(end_time)
+
+            if end_time is None or end_time <= start_time:
+                return self.json_message('Invalid end_time', HTTP_BAD_REQUEST)
+
+            end_time = dt_util.as_utc(end_time)
+
         entity_id = request.GET.get('filter_entity_id')
 
-        result = yield from self.hass.loop.run_in_executor(
-            None, get_significant_states, start_time, end_time, entity_id,
-            self.filters)
+        try:
+            limit, cursor = recorder.get_page(request.GET, DEFAULT_PAGE_SIZE)
+        except ValueError:
+            return self.json_message('Invalid limit or cursor',
+                                     HTTP_BAD_REQUEST)
+
+        period = statistics_period(start_time, end_time)
 
-        return self.json(result.values())
+        if limit is None and period is not None:
+            attributes = {
+                state.entity_id: state.attributes
+                for state in self.hass.states.async_all()}
+            response = yield from self.json_stream(
+                request, stream_statistics_history(
+                    start_time, end_time, period, entity_id, self.filters,
+                    attributes))
+            return response
+
+        if limit is None:
+            response = yield from self.json_stream(
+                request, stream_significant_states(
+                    start_time, end_time, entity_id, self.filters))
+            return response
+
+        result, next_cursor = yield from self.hass.loop.run_in_executor(
+            None, get_significant_states_page, start_time, end_time,
+            entity_id, self.filters, limit, cursor)
+
+        response = yield from self.json_stream(request, result, next_cursor)
+        return response
 
 
 # pylint: disable=too-few-public-methods
@@ -258,9 +506,12 @@ class Filters(object):
         self.included_entities = []
         self.included_domains = []
 
-    def apply(self, query, entity_ids=None):
+    def apply(self, query, entity_ids=None, model=None):
         """Apply the include/exclude filter on domains and entities on query.
 
+        The filter is applied to the domain and entity_id columns of model,
+        States if not given.
+
         Following rules apply:
         * only the include section is configured - just query the specified
           entities or domains.
@@ -269,7 +520,7 @@ class Filters(object):
         * if include and exclude is defined - select the entities specified in
           the include and filter out the ones from the exclude list.
         """
-        states = recorder.get_model('States')
+        states = model or recorder.get_model('States')
         # specific entities requested - do not in/exclude anything
         if entity_ids is not None:
             return query.filter(states.entity_id.in_(entity_ids))
@@ -6,14 +6,15 @@ https://home-assistant.io/components/http/
 """
 import asyncio
 import hmac
-import json
 import logging
 import mimetypes
 import os
 from pathlib import Path
 import re
 import ssl
+import threading
 from ipaddress import ip_address, ip_network
+from urllib.parse import urlencode
 
 import voluptuous as vol
 from aiohttp import web, hdrs
@@ -31,6 +32,8 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_START)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.components import persistent_notification
+from homeassistant.util.async import run_coroutine_threadsafe
+import homeassistant.util.json as json_util
 
 DOMAIN = 'http'
 REQUIREMENTS = ('aiohttp_cors==0.4.0',)
@@ -47,6 +50,9 @@ CONF_TRUSTED_NETWORKS = 'trusted_networks'
 DATA_API_PASSWORD = 'api_password'
 NOTIFICATION_ID_LOGIN = 'http-login'
 
+# Number of items that json_stream encodes and writes at a time
+JSON_STREAM_CHUNK_SIZE = 500
+
 # TLS configuation follows the best-practice guidelines specified here:
 # https://wiki.mozilla.org/Security/Server_Side_TLS
 # Intermediate guidelines are followed.
@@ -407,8 +413,7 @@ class HomeAssistantView(object):
 
     def json(self, result, status_code=200):  # pylint: disable=no-self-use
         """Return a JSON response."""
-        msg = json.dumps(
-            result, sort_keys=True, cls=rem.JSONEncoder).encode('UTF-8')
+        msg = json_util.dumps(result).encode('UTF-8')
         return web.Response(
             body=msg, content_type=CONTENT_TYPE_JSON, status=status_code)
 
@@ -416,6 +421,89 @@ class HomeAssistantView(object):
         """Return a JSON message response."""
         return self.json({'message': error}, status_code)
 
+    @asyncio.coroutine
+    def json_stream(self, request, items, next_cursor=None):
+        """Return a response that streams the items as a JSON array.
+
+        The items are consumed and encoded in a single executor thread, so
+        they can be fetched lazily from the database. Only a few chunks of
+        the response are held in memory at a time.
+
+        If next_cursor is given, a Link header points to the next page. If
+        encoding fails after the response started, the connection is closed
+        so the client does not take the truncated array for the whole one.
+        """
+        loop = self.hass.loop
+        chunks = asyncio.Queue(maxsize=2, loop=loop)
+        cancelled = threading.Event()
+
+        def encode():
+            """Encode the items in chunks and pass them to the loop.
+
+            The last item passed is None or the error that stopped encoding.
+            """
+            end = None
+
+            try:
+                for chunk in _json_array_chunks(items):
+                    if cancelled.is_set():
+                        return
+                    run_coroutine_threadsafe(
+                        chunks.put(chunk), loop).result()
+            except Exception as exc:  # pylint: disable=broad-except
+                _LOGGER.exception('Error encoding response to %s',
+                                  request.path)
+                end = exc
+            finally:
+                run_coroutine_threadsafe(chunks.put(end), loop).result()
+
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+
+        if next_cursor is not None:
+            query = request.GET.copy()
+            query['cursor'] = next_cursor
+            response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+                request.path, urlencode(query))
+
+        yield from response.prepare(request)
+
+        job = loop.run_in_executor(None, encode)
+        chunk = b''
+
+        try:
+            while isinstance(chunk, bytes):
+                chunk = yield from chunks.get()
+                if isinstance(chunk, bytes):
+                    response.write(chunk)
+                    yield from response.drain()
+        finally:
+            if isinstance(chunk, bytes):
+                # The client went away, let the encoder finish.
+                cancelled.set()
+                while isinstance((yield from chunks.get()), bytes):
+                    pass
+
+        yield from job
+
+        if chunk is not None:
+            # End the response without its last chunk.
+            request.transport.close()
+
+        return response
+
+    def image(self, request, image, etag):  # pylint: disable=no-self-use
+        """Return an image or not modified if the client has this version."""
+        etag = '"{}"'.format(etag)
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+
+        if if_none_match is not None and (
+                if_none_match.strip() == '*' or
+                etag in (tag.strip() for tag in if_none_match.split(','))):
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+
+        return web.Response(body=image, headers={hdrs.ETAG: etag})
+
     @asyncio.coroutine
     def file(self, request, fil):  # pylint: disable=no-self-use
         """Return a file."""
@@ -446,6 +534,24 @@ class HomeAssistantView(object):
         #     self.app.router.add_route('*', url, self)
 
 
+def _json_array_chunks(items, chunk_size=JSON_STREAM_CHUNK_SIZE):
+    """Encode items as a JSON array, chunk_size items at a time."""
+    parts = []
+    separator = '['
+
+    for item in items:
+        parts.append(separator)
+        parts.append(json_util.dumps(item))
+        separator = ','
+
+        if len(parts) >= 2 * chunk_size:
+            yield ''.join(parts).encode('UTF-8')
+            parts = []
+
+    parts.append('[]' if separator == '[' else ']')
+    yield ''.join(parts).encode('UTF-8')
+
+
 def request_handler_factory(view, handler):
     """Factory to wrap our handler classes.
 
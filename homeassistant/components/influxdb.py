@@ -4,22 +4,29 @@ A component which allows you to send data to an Influx database.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/influxdb/
 """
+from datetime import timedelta
 import logging
+import os
+import threading
 
 import voluptuous as vol
 
 from homeassistant.const import (
-    EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN, CONF_HOST,
-    CONF_PORT, CONF_SSL, CONF_VERIFY_SSL, CONF_USERNAME, CONF_BLACKLIST,
-    CONF_PASSWORD, CONF_WHITELIST)
+    STATE_UNAVAILABLE, STATE_UNKNOWN, CONF_HOST, CONF_PORT, CONF_SSL,
+    CONF_VERIFY_SSL, CONF_USERNAME, CONF_BLACKLIST, CONF_PASSWORD,
+    CONF_WHITELIST)
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.export import (
+    EntityFilter, ExportRejected, StateExporter)
 import homeassistant.helpers.config_validation as cv
 
 REQUIREMENTS = ['influxdb==3.0.0']
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_BATCH_SIZE = 'batch_size'
 CONF_DB_NAME = 'database'
+CONF_FLUSH_INTERVAL = 'flush_interval'
 CONF_TAGS = 'tags'
 
 DEFAULT_DATABASE = 'home_assistant'
@@ -27,9 +34,16 @@ DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 8086
 DEFAULT_SSL = False
 DEFAULT_VERIFY_SSL = False
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = timedelta(seconds=1)
 DOMAIN = 'influxdb'
 TIMEOUT = 5
 
+# Points that could not be written are kept in this file until the database
+# is reachable again.
+SPOOL_FILE = 'influxdb.spool'
+MAX_SPOOL_SIZE = 50 * 1024 * 1024
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Optional(CONF_HOST, default=DEFAULT_HOST): cv.string,
@@ -45,33 +59,27 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_WHITELIST, default=[]):
             vol.All(cv.ensure_list, [cv.entity_id]),
         vol.Optional(CONF_VERIFY_SSL, default=DEFAULT_VERIFY_SSL): cv.boolean,
+        vol.Optional(CONF_BATCH_SIZE, default=DEFAULT_BATCH_SIZE):
+            cv.positive_int,
+        vol.Optional(CONF_FLUSH_INTERVAL, default=DEFAULT_FLUSH_INTERVAL):
+            vol.All(cv.time_period, cv.positive_timedelta),
     }),
 }, extra=vol.ALLOW_EXTRA)
 
 
-# pylint: disable=too-many-locals
 def setup(hass, config):
     """Setup the InfluxDB component."""
     from influxdb import InfluxDBClient, exceptions
 
     conf = config[DOMAIN]
 
-    host = conf.get(CONF_HOST)
-    port = conf.get(CONF_PORT)
-    database = conf.get(CONF_DB_NAME)
-    username = conf.get(CONF_USERNAME)
-    password = conf.get(CONF_PASSWORD)
-    ssl = conf.get(CONF_SSL)
-    verify_ssl = conf.get(CONF_VERIFY_SSL)
-    blacklist = conf.get(CONF_BLACKLIST)
-    whitelist = conf.get(CONF_WHITELIST)
-    tags = conf.get(CONF_TAGS)
-
     try:
         influx = InfluxDBClient(
-            host=host, port=port, username=username, password=password,
-            database=database, ssl=ssl, verify_ssl=verify_ssl,
-            timeout=TIMEOUT)
+            host=conf.get(CONF_HOST), port=conf.get(CONF_PORT),
+            username=conf.get(CONF_USERNAME),
+            password=conf.get(CONF_PASSWORD),
+            database=conf.get(CONF_DB_NAME), ssl=conf.get(CONF_SSL),
+            verify_ssl=conf.get(CONF_VERIFY_SSL), timeout=TIMEOUT)
         influx.query("select * from /.*/ LIMIT 1;")
     except exceptions.InfluxDBClientError as exc:
         _LOGGER.error("Database host is not accessible due to '%s', please "
@@ -79,18 +87,66 @@ def setup(hass, config):
                       "the database exists and is READ/WRITE.", exc)
         return False
 
-    def influx_event_listener(event):
-        """Listen for new messages on the bus and sends them to Influx."""
-        state = event.data.get('new_state')
-        if state is None or state.state in (
-                STATE_UNKNOWN, '', STATE_UNAVAILABLE) or \
-                state.entity_id in blacklist:
-            return
+    entity_filter = EntityFilter(include_entities=conf.get(CONF_WHITELIST),
+                                 exclude_entities=conf.get(CONF_BLACKLIST))
 
-        try:
-            if len(whitelist) > 0 and state.entity_id not in whitelist:
-                return
+    InfluxDBWriter(
+        hass, influx, conf.get(CONF_DB_NAME), conf.get(CONF_TAGS),
+        entity_filter, conf[CONF_BATCH_SIZE], conf[CONF_FLUSH_INTERVAL],
+        hass.config.path(SPOOL_FILE)).start()
+
+    return True
+
+
+class InfluxDBWriter(StateExporter):
+    """Write state changes to InfluxDB in line protocol.
+
+    Batches that can not be written because of a connection or server error
+    are not retried but appended to a spool file, which is replayed after
+    the next successful write. Batches that the database rejects are
+    dropped.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    max_retries = 0
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, hass, influx, database, tags, entity_filter,
+                 batch_size, flush_interval, spool_path):
+        """Initialize the writer."""
+        super().__init__(hass, DOMAIN, entity_filter)
+        self.influx = influx
+        self.database = database
+        self.tags = tags
+        self.batch_size = batch_size
+        self.max_queue_size = max(self.max_queue_size, batch_size)
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.spooled = 0
+        self._lock = threading.Lock()
+
+        if os.path.isfile(spool_path):
+            with open(spool_path) as spool:
+                self.spooled = sum(1 for _ in spool)
+
+    @property
+    def metrics(self):
+        """Return the metrics of the writer, including the spool size."""
+        metrics = super().metrics
+        metrics['spooled'] = self.spooled
+        return metrics
+
+    def convert(self, event, state):
+        """Return a new state as point in line protocol.
+
+        This method must be run in the event loop.
+        """
+        from influxdb.line_protocol import make_lines
+
+        if state.state in (STATE_UNKNOWN, '', STATE_UNAVAILABLE):
+            return None
 
+        try:
             _state = state_helper.state_as_number(state)
         except ValueError:
             _state = state.state
@@ -117,13 +173,80 @@ def setup(hass, config):
             if key != 'unit_of_measurement':
                 json_body[0]['fields'][key] = value
 
-        json_body[0]['tags'].update(tags)
+        json_body[0]['tags'].update(self.tags)
 
-        try:
-            influx.write_points(json_body)
-        except exceptions.InfluxDBClientError:
-            _LOGGER.exception('Error saving event "%s" to InfluxDB', json_body)
+        return make_lines({'points': json_body})
 
-    hass.bus.listen(EVENT_STATE_CHANGED, influx_event_listener)
+    def send(self, items):
+        """Write a batch and replay the spool file.
 
-    return True
+        This runs in the worker pool.
+        """
+        from influxdb import exceptions
+        import requests
+
+        errors = (exceptions.InfluxDBServerError,
+                  requests.exceptions.RequestException)
+
+        with self._lock:
+            try:
+                self._post(items)
+            except exceptions.InfluxDBClientError as exc:
+                raise ExportRejected(
+                    'InfluxDB rejected {} points: {}'.format(len(items), exc))
+
+            if not self.spooled:
+                return
+
+            with open(self.spool_path) as spool:
+                lines = spool.readlines()
+
+            for pos in range(0, len(lines), self.batch_size):
+                batch = lines[pos:pos + self.batch_size]
+
+                try:
+                    self._post(batch)
+                except exceptions.InfluxDBClientError as exc:
+                    self._drop(batch, exc)
+                    continue
+                except errors as exc:
+                    _LOGGER.warning('Unable to replay spooled points: %s',
+                                    exc)
+                    with open(self.spool_path, 'w') as spool:
+                        spool.writelines(lines[pos:])
+                    self.spooled = len(lines) - pos
+                    return
+
+                self.exported += len(batch)
+
+            os.remove(self.spool_path)
+            _LOGGER.info('Replayed %d spooled points', self.spooled)
+            self.spooled = 0
+
+    def discard(self, items, exc):
+        """Append points that could not be written to the spool file.
+
+        This runs in the worker pool.
+        """
+        _LOGGER.warning('Unable to write %d points to InfluxDB: %s',
+                        len(items), exc)
+
+        with self._lock:
+            if os.path.isfile(self.spool_path) and \
+                    os.path.getsize(self.spool_path) > MAX_SPOOL_SIZE:
+                super().discard(items, 'spool file is full')
+                return
+
+            with open(self.spool_path, 'a') as spool:
+                spool.writelines(items)
+
+            self.spooled += len(items)
+
+    def _post(self, lines):
+        """Post points in line protocol to the database."""
+        self.influx.request(
+            url='write', method='POST',
+            params={'db': self.database},
+            data=''.join(lines).encode('utf-8'),
+            expected_response_code=204,
+            headers={'Content-type': 'application/octet-stream'})
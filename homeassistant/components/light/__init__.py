@@ -4,6 +4,7 @@ Provides functionality to interact with lights.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/light/
 """
+import asyncio
 import logging
 import os
 import csv
@@ -203,61 +204,54 @@ def setup(hass, config):
                               profile_path, ex)
                 return False
 
-    def handle_light_service(service):
+    @asyncio.coroutine
+    def async_handle_light_service(service):
         """Hande a turn light on or off service call."""
         # Get the validated data
         params = service.data.copy()
 
         # Convert the entity ids to valid light ids
-        target_lights = component.extract_from_service(service)
+        target_lights = component.async_extract_from_service(service)
         params.pop(ATTR_ENTITY_ID, None)
 
-        service_fun = None
         if service.service == SERVICE_TURN_OFF:
             service_fun = 'turn_off'
         elif service.service == SERVICE_TOGGLE:
             service_fun = 'toggle'
+        else:
+            service_fun = 'turn_on'
 
-        if service_fun:
-            for light in target_lights:
-                getattr(light, service_fun)(**params)
-
-            for light in target_lights:
-                if light.should_poll:
-                    light.update_ha_state(True)
-            return
-
-        # Processing extra data for turn light on request.
-        profile = profiles.get(params.pop(ATTR_PROFILE, None))
-
-        if profile:
-            params.setdefault(ATTR_XY_COLOR, profile[:2])
-            params.setdefault(ATTR_BRIGHTNESS, profile[2])
+            # Processing extra data for turn light on request.
+            profile = profiles.get(params.pop(ATTR_PROFILE, None))
 
-        color_name = params.pop(ATTR_COLOR_NAME, None)
+            if profile:
+                params.setdefault(ATTR_XY_COLOR, profile[:2])
+                params.setdefault(ATTR_BRIGHTNESS, profile[2])
 
-        if color_name is not None:
-            params[ATTR_RGB_COLOR] = color_util.color_name_to_rgb(color_name)
+            color_name = params.pop(ATTR_COLOR_NAME, None)
 
-        for light in target_lights:
-            light.turn_on(**params)
+            if color_name is not None:
+                params[ATTR_RGB_COLOR] = \
+                    color_util.color_name_to_rgb(color_name)
 
-        for light in target_lights:
-            if light.should_poll:
-                light.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            target_lights, service_fun, **params)
 
     # Listen for light on and light off service calls.
     descriptions = load_yaml_config_file(
         os.path.join(os.path.dirname(__file__), 'services.yaml'))
-    hass.services.register(DOMAIN, SERVICE_TURN_ON, handle_light_service,
+    hass.services.register(DOMAIN, SERVICE_TURN_ON,
+                           async_handle_light_service,
                            descriptions.get(SERVICE_TURN_ON),
                            schema=LIGHT_TURN_ON_SCHEMA)
 
-    hass.services.register(DOMAIN, SERVICE_TURN_OFF, handle_light_service,
+    hass.services.register(DOMAIN, SERVICE_TURN_OFF,
+                           async_handle_light_service,
                            descriptions.get(SERVICE_TURN_OFF),
                            schema=LIGHT_TURN_OFF_SCHEMA)
 
-    hass.services.register(DOMAIN, SERVICE_TOGGLE, handle_light_service,
+    hass.services.register(DOMAIN, SERVICE_TOGGLE,
+                           async_handle_light_service,
                            descriptions.get(SERVICE_TOGGLE),
                            schema=LIGHT_TOGGLE_SCHEMA)
 
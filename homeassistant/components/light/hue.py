@@ -32,6 +32,8 @@ REQUIREMENTS = ['phue==0.8']
 _CONFIGURED_BRIDGES = {}
 # Map ip to request id for configuring
 _CONFIGURING = {}
+# Map bridge to the light ids of each of its groups
+_BRIDGE_GROUPS = {}
 _LOGGER = logging.getLogger(__name__)
 
 CONF_ALLOW_UNREACHABLE = 'allow_unreachable'
@@ -162,6 +164,14 @@ def setup_bridge(host, hass, add_devices, filename, allow_unreachable):
             else:
                 lights[light_id].info = info
 
+        groups = api.get('groups')
+
+        if isinstance(groups, dict):
+            _BRIDGE_GROUPS[bridge] = {
+                group_id: frozenset(int(light) for light in group['lights'])
+                for group_id, group in groups.items()
+                if group.get('lights')}
+
         if new_lights:
             add_devices(new_lights)
 
@@ -196,6 +206,60 @@ def request_configuration(host, hass, add_devices, filename,
     )
 
 
+def turn_on_many(lights, **kwargs):
+    """Turn on Hue lights that make up a group of the bridge at once.
+
+    Returns the lights that have to be turned on one by one.
+    """
+    return _set_groups([(light, light.turn_on_command(**kwargs))
+                        for light in lights])
+
+
+def turn_off_many(lights, **kwargs):
+    """Turn off Hue lights that make up a group of the bridge at once.
+
+    Returns the lights that have to be turned off one by one.
+    """
+    return _set_groups([(light, light.turn_off_command(**kwargs))
+                        for light in lights])
+
+
+def _set_groups(light_commands):
+    """Send commands that are equal for all lights of a group to the group.
+
+    The bridge applies a group action with a single request. Returns the
+    lights that are not part of such a group.
+    """
+    requests = []
+
+    for light, command in light_commands:
+        for bridge, group_lights, group_command in requests:
+            if bridge is light.bridge and group_command == command:
+                group_lights.append(light)
+                break
+        else:
+            requests.append((light.bridge, [light], command))
+
+    remaining = []
+
+    for bridge, group_lights, command in requests:
+        light_ids = frozenset(light.light_id for light in group_lights)
+        group_id = None
+
+        if len(light_ids) > 1:
+            group_id = next(
+                (group_id for group_id, group_light_ids
+                 in _BRIDGE_GROUPS.get(bridge, {}).items()
+                 if group_light_ids == light_ids), None)
+
+        if group_id is None:
+            remaining.extend(group_lights)
+        else:
+            bridge.set_group(int(group_id), command)
+
+    return remaining
+
+
 class HueLight(Light):
     """Representation of a Hue light."""
 
@@ -254,6 +318,10 @@ class HueLight(Light):
 
     def turn_on(self, **kwargs):
         """Turn the specified or all lights on."""
+        self.bridge.set_light(self.light_id, self.turn_on_command(**kwargs))
+
+    def turn_on_command(self, **kwargs):
+        """Return the bridge command that turns the light on."""
         command = {'on': True}
 
         if ATTR_TRANSITION in kwargs:
@@ -294,10 +362,14 @@ class HueLight(Light):
         elif self.bridge_type == 'hue':
             command['effect'] = 'none'
 
-        self.bridge.set_light(self.light_id, command)
+        return command
 
     def turn_off(self, **kwargs):
         """Turn the specified or all lights off."""
+        self.bridge.set_light(self.light_id, self.turn_off_command(**kwargs))
+
+    def turn_off_command(self, **kwargs):
+        """Return the bridge command that turns the light off."""
         command = {'on': False}
 
         if ATTR_TRANSITION in kwargs:
@@ -316,7 +388,7 @@ class HueLight(Light):
         elif self.bridge_type == 'hue':
             command['alert'] = 'none'
 
-        self.bridge.set_light(self.light_id, command)
+        return command
 
     def update(self):
         """Synchronize state with bridge."""
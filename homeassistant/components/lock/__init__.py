@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation
 at https://home-assistant.io/components/lock/
 """
 from datetime import timedelta
+import asyncio
 import logging
 import os
 
@@ -73,27 +74,27 @@ def setup(hass, config):
         _LOGGER, DOMAIN, hass, SCAN_INTERVAL, GROUP_NAME_ALL_LOCKS)
     component.setup(config)
 
-    def handle_lock_service(service):
+    @asyncio.coroutine
+    def async_handle_lock_service(service):
         """Handle calls to the lock services."""
-        target_locks = component.extract_from_service(service)
+        target_locks = component.async_extract_from_service(service)
 
         code = service.data.get(ATTR_CODE)
 
-        for item in target_locks:
-            if service.service == SERVICE_LOCK:
-                item.lock(code=code)
-            else:
-                item.unlock(code=code)
+        if service.service == SERVICE_LOCK:
+            method = 'lock'
+        else:
+            method = 'unlock'
 
-            if item.should_poll:
-                item.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            target_locks, method, code=code)
 
     descriptions = load_yaml_config_file(
         os.path.join(os.path.dirname(__file__), 'services.yaml'))
-    hass.services.register(DOMAIN, SERVICE_UNLOCK, handle_lock_service,
+    hass.services.register(DOMAIN, SERVICE_UNLOCK, async_handle_lock_service,
                            descriptions.get(SERVICE_UNLOCK),
                            schema=LOCK_SERVICE_SCHEMA)
-    hass.services.register(DOMAIN, SERVICE_LOCK, handle_lock_service,
+    hass.services.register(DOMAIN, SERVICE_LOCK, async_handle_lock_service,
                            descriptions.get(SERVICE_LOCK),
                            schema=LOCK_SERVICE_SCHEMA)
     return True
@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/logbook/
 """
 import asyncio
+import json
 import logging
 from datetime import timedelta
 from itertools import groupby
@@ -21,7 +22,8 @@ from homeassistant.const import (EVENT_HOMEASSISTANT_START,
                                  EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
                                  STATE_NOT_HOME, STATE_OFF, STATE_ON,
                                  ATTR_HIDDEN, HTTP_BAD_REQUEST)
-from homeassistant.core import State, split_entity_id, DOMAIN as HA_DOMAIN
+from homeassistant.core import (
+    Event, State, split_entity_id, DOMAIN as HA_DOMAIN)
 from homeassistant.util.async import run_callback_threadsafe
 
 DOMAIN = "logbook"
@@ -51,8 +53,14 @@ CONFIG_SCHEMA = vol.Schema({
 
 EVENT_LOGBOOK_ENTRY = 'logbook_entry'
 
+# Only these events can show up in the logbook
+LOGBOOK_EVENT_TYPES = (EVENT_STATE_CHANGED, EVENT_HOMEASSISTANT_START,
+                       EVENT_HOMEASSISTANT_STOP, EVENT_LOGBOOK_ENTRY)
+
 GROUP_BY_MINUTES = 15
 
+DEFAULT_PAGE_SIZE = 10000
+
 ATTR_NAME = 'name'
 ATTR_MESSAGE = 'message'
 ATTR_DOMAIN = 'domain'
@@ -137,18 +145,26 @@ class LogbookView(HomeAssistantView):
         start_day = dt_util.as_utc(datetime)
         end_day = start_day + timedelta(days=1)
 
-        def get_results():
-            """Query DB for results."""
-            events = recorder.get_model('Events')
-            query = recorder.query('Events').filter(
-                (events.time_fired > start_day) &
-                (events.time_fired < end_day))
-            events = recorder.execute(query)
-            return _exclude_events(events, self.config)
-
-        events = yield from self.hass.loop.run_in_executor(None, get_results)
+        try:
+            limit, cursor = recorder.get_page(request.GET, DEFAULT_PAGE_SIZE)
+        except ValueError:
+            return self.json_message('Invalid limit or cursor',
+                                     HTTP_BAD_REQUEST)
+
+        if limit is None:
+            # The events are fetched and converted lazily while streaming.
+            events = (event for _, event in
+                      _get_events(start_day, end_day, self.config))
+            next_cursor = None
+        else:
+            events, next_cursor = yield from self.hass.loop.run_in_executor(
+                None, _get_events_page, start_day, end_day, self.config,
+                limit, cursor)
 
-        return self.json(humanify(events))
+        response = yield from self.json_stream(
+            request, humanify(_exclude_events(events, self.config)),
+            next_cursor)
+        return response
 
 
 class Entry(object):
@@ -224,7 +240,7 @@ def humanify(events):
         for event in events_batch:
             if event.event_type == EVENT_STATE_CHANGED:
 
-                to_state = State.from_dict(event.data.get('new_state'))
+                to_state = _new_state(event)
 
                 # If last_changed != last_updated only attributes have changed
                 # we do not report on that yet. Also filter auto groups.
@@ -286,9 +302,8 @@ def humanify(events):
                     entity_id)
 
 
-def _exclude_events(events, config):
-    """Get lists of excluded entities and platforms."""
-    # pylint: disable=too-many-branches
+def _get_filters(config):
+    """Return included and excluded entities and domains of the config."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -301,13 +316,152 @@ def _exclude_events(events, config):
     if include:
         included_entities = include[CONF_ENTITIES]
         included_domains = include[CONF_DOMAINS]
+    return (excluded_entities, excluded_domains, included_entities,
+            included_domains)
+
+
+def _state_filter_clauses(states, config):
+    """Return SQL clauses for the states that pass the config filters.
+
+    These only skip states that _exclude_events would exclude as well.
+    """
+    excluded_entities, excluded_domains, included_entities, \
+        included_domains = _get_filters(config)
+    clauses = []
+
+    if excluded_entities:
+        clauses.append(~states.entity_id.in_(excluded_entities))
+
+    if excluded_domains:
+        clause = ~states.domain.in_(excluded_domains)
+        if included_entities:
+            clause |= states.entity_id.in_(included_entities)
+        clauses.append(clause)
+
+    if included_domains:
+        clause = states.domain.in_(included_domains)
+        if included_entities:
+            clause |= states.entity_id.in_(included_entities)
+        clauses.append(clause)
+    elif included_entities and not excluded_domains:
+        clauses.append(states.entity_id.in_(included_entities))
+
+    return clauses
+
+
+def _get_events(start_day, end_day, config, cursor=None):
+    """Yield event id and event of the events that can be in the logbook.
+
+    The database skips events of other types, attribute changes and state
+    changes of filtered entities. The new state of a state change is read
+    from the states table instead of decoding the event data. Rows are
+    streamed from the database, so this has to be consumed from a single
+    executor thread.
+    """
+    from sqlalchemy import and_, case, null, or_
+    from homeassistant.components.recorder.models import _process_timestamp
+
+    events = recorder.get_model('Events')
+    states = recorder.get_model('States')
+
+    query = recorder.query(
+        events.event_id, events.event_type,
+        # State changes are built from the states table
+        case([(events.event_type == EVENT_STATE_CHANGED, null())],
+             else_=events.event_data),
+        events.time_fired, states.entity_id, states.state,
+        states.attributes, states.last_changed, states.last_updated
+    ).outerjoin(
+        states, states.event_id == events.event_id
+    ).filter(
+        events.event_type.in_(LOGBOOK_EVENT_TYPES) &
+        (events.time_fired > start_day) &
+        (events.time_fired < end_day)
+    ).filter(or_(
+        events.event_type != EVENT_STATE_CHANGED,
+        and_(states.last_changed == states.last_updated,
+             *_state_filter_clauses(states, config))
+    ))
+
+    if cursor is not None:
+        query = recorder.after_cursor(
+            query, events.time_fired, events.event_id, cursor)
+
+    query = query.order_by(events.time_fired, events.event_id)
+
+    for event_id, event_type, event_data, time_fired, entity_id, state, \
+            attributes, last_changed, last_updated in recorder.stream(query):
+        try:
+            if event_type != EVENT_STATE_CHANGED:
+                data = json.loads(event_data)
+            elif entity_id is None:
+                continue
+            elif state == '':
+                # The entity was removed
+                data = {'entity_id': entity_id, 'new_state': None}
+            else:
+                data = {'entity_id': entity_id, 'new_state': State(
+                    entity_id, state, json.loads(attributes),
+                    _process_timestamp(last_changed),
+                    _process_timestamp(last_updated))}
+        except ValueError:
+            _LOGGER.exception('Error converting %s event of %s',
+                              event_type, time_fired)
+            continue
+
+        yield event_id, Event(event_type, data,
+                              time_fired=_process_timestamp(time_fired))
+
+
+def _get_events_page(start_day, end_day, config, limit, cursor=None):
+    """Return a page of events and the cursor of the next page.
+
+    A page holds at least limit events, if there are, and is extended to
+    the end of the GROUP_BY_MINUTES window of its last event so humanify
+    groups the same events as without pagination. The next cursor is None
+    on the last page.
+    """
+    page = []
+    last_id = None
+    events = _get_events(start_day, end_day, config, cursor)
+
+    try:
+        for event_id, event in events:
+            if len(page) >= limit and \
+                    event.time_fired.minute // GROUP_BY_MINUTES != \
+                    page[-1].time_fired.minute // GROUP_BY_MINUTES:
+                return page, recorder.encode_cursor(
+                    page[-1].time_fired, last_id)
+
+            page.append(event)
+            last_id = event_id
+    finally:
+        events.close()
+
+    return page, None
+
+
+def _new_state(event):
+    """Return the new state of a state changed event."""
+    new_state = event.data.get('new_state')
+
+    if new_state is None or isinstance(new_state, State):
+        return new_state
+
+    return State.from_dict(new_state)
+
+
+def _exclude_events(events, config):
+    """Yield the events that are not filtered by the config."""
+    # pylint: disable=too-many-branches
+    excluded_entities, excluded_domains, included_entities, \
+        included_domains = _get_filters(config)
 
-    filtered_events = []
     for event in events:
         domain, entity_id = None, None
 
         if event.event_type == EVENT_STATE_CHANGED:
-            to_state = State.from_dict(event.data.get('new_state'))
+            to_state = _new_state(event)
             # Do not report on new entities
             if not to_state:
                 continue
@@ -351,8 +505,7 @@ def _exclude_events(events, config):
             # check if logbook entry is excluded for this entity
             if entity_id in excluded_entities:
                 continue
-        filtered_events.append(event)
-    return filtered_events
+        yield event
 
 
 def _entry_message_from_state(domain, state):
@@ -4,15 +4,18 @@ Support for sending data to Logentries webhook endpoint.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/logentries/
 """
+import asyncio
 import json
 import logging
-import requests
 
 import voluptuous as vol
 
-from homeassistant.const import (CONF_TOKEN, EVENT_STATE_CHANGED)
+from homeassistant.const import CONF_TOKEN
 from homeassistant.helpers import state as state_helper
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.export import (
+    CONF_EXCLUDE, CONF_INCLUDE, FILTER_LIST_SCHEMA, EntityFilter,
+    StateExporter)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +26,8 @@ DEFAULT_HOST = 'https://webhook.logentries.com/noformat/logs/'
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Required(CONF_TOKEN): cv.string,
+        vol.Optional(CONF_INCLUDE): FILTER_LIST_SCHEMA,
+        vol.Optional(CONF_EXCLUDE): FILTER_LIST_SCHEMA,
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -33,15 +38,26 @@ def setup(hass, config):
     token = conf.get(CONF_TOKEN)
     le_wh = '{}{}'.format(DEFAULT_HOST, token)
 
-    def logentries_event_listener(event):
-        """Listen for new messages on the bus and sends them to Logentries."""
-        state = event.data.get('new_state')
-        if state is None:
-            return
+    LogentriesExporter(hass, le_wh, EntityFilter.from_config(conf)).start()
+
+    return True
+
+
+class LogentriesExporter(StateExporter):
+    """Send state changes to a Logentries webhook."""
+
+    def __init__(self, hass, le_wh, entity_filter):
+        """Initialize the exporter."""
+        super().__init__(hass, DOMAIN, entity_filter)
+        self.le_wh = le_wh
+
+    def convert(self, event, state):
+        """Return the log entry of a new state."""
         try:
             _state = state_helper.state_as_number(state)
         except ValueError:
             _state = state.state
+
         json_body = [
             {
                 'domain': state.domain,
@@ -51,13 +67,13 @@ def setup(hass, config):
                 'value': _state,
             }
         ]
-        try:
-            payload = {"host": le_wh,
-                       "event": json_body}
-            requests.post(le_wh, data=json.dumps(payload), timeout=10)
-        except requests.exceptions.RequestException as error:
-            _LOGGER.exception('Error sending to Logentries: %s', error)
 
-    hass.bus.listen(EVENT_STATE_CHANGED, logentries_event_listener)
+        return json.dumps({'host': self.le_wh, 'event': json_body})
 
-    return True
+    @asyncio.coroutine
+    def async_send(self, items):
+        """Post a batch of log entries, one per line.
+
+        This method is a coroutine.
+        """
+        yield from self.async_post(self.le_wh, data='\n'.join(items))
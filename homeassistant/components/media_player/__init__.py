@@ -8,14 +8,16 @@ import asyncio
 import hashlib
 import logging
 import os
-import requests
 
+import aiohttp
 from aiohttp import web
+import async_timeout
 import voluptuous as vol
 
 from homeassistant.config import load_yaml_config_file
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.image_cache import ImageCache
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA  # noqa
 from homeassistant.components.http import HomeAssistantView
 import homeassistant.helpers.config_validation as cv
@@ -37,6 +39,10 @@ ENTITY_ID_FORMAT = DOMAIN + '.{}'
 
 ENTITY_IMAGE_URL = '/api/media_player_proxy/{0}?token={1}&cache={2}'
 
+# Seconds a media image is served from the cache. Images are cached per URL,
+# so a new image is fetched as soon as the media changes.
+MEDIA_IMAGE_CACHE_TTL = 300
+
 SERVICE_PLAY_MEDIA = 'play_media'
 SERVICE_SELECT_SOURCE = 'select_source'
 SERVICE_CLEAR_PLAYLIST = 'clear_playlist'
@@ -300,79 +306,82 @@ def setup(hass, config):
     descriptions = load_yaml_config_file(
         os.path.join(os.path.dirname(__file__), 'services.yaml'))
 
-    def media_player_service_handler(service):
+    @asyncio.coroutine
+    def async_media_player_service_handler(service):
         """Map services to methods on MediaPlayerDevice."""
         method = SERVICE_TO_METHOD[service.service]
 
-        for player in component.extract_from_service(service):
-            getattr(player, method)()
-
-            if player.should_poll:
-                player.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            component.async_extract_from_service(service), method)
 
     for service in SERVICE_TO_METHOD:
-        hass.services.register(DOMAIN, service, media_player_service_handler,
+        hass.services.register(DOMAIN, service,
+                               async_media_player_service_handler,
                                descriptions.get(service),
                                schema=MEDIA_PLAYER_SCHEMA)
 
-    def volume_set_service(service):
+    @asyncio.coroutine
+    def async_volume_set_service(service):
         """Set specified volume on the media player."""
         volume = service.data.get(ATTR_MEDIA_VOLUME_LEVEL)
 
-        for player in component.extract_from_service(service):
-            player.set_volume_level(volume)
+        players = component.async_extract_from_service(service)
 
-            if player.should_poll:
-                player.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            players, 'set_volume_level', volume)
 
-    hass.services.register(DOMAIN, SERVICE_VOLUME_SET, volume_set_service,
+    hass.services.register(DOMAIN, SERVICE_VOLUME_SET,
+                           async_volume_set_service,
                            descriptions.get(SERVICE_VOLUME_SET),
                            schema=MEDIA_PLAYER_SET_VOLUME_SCHEMA)
 
-    def volume_mute_service(service):
+    @asyncio.coroutine
+    def async_volume_mute_service(service):
         """Mute (true) or unmute (false) the media player."""
         mute = service.data.get(ATTR_MEDIA_VOLUME_MUTED)
 
-        for player in component.extract_from_service(service):
-            player.mute_volume(mute)
+        players = component.async_extract_from_service(service)
 
-            if player.should_poll:
-                player.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            players, 'mute_volume', mute)
 
-    hass.services.register(DOMAIN, SERVICE_VOLUME_MUTE, volume_mute_service,
+    hass.services.register(DOMAIN, SERVICE_VOLUME_MUTE,
+                           async_volume_mute_service,
                            descriptions.get(SERVICE_VOLUME_MUTE),
                            schema=MEDIA_PLAYER_MUTE_VOLUME_SCHEMA)
 
-    def media_seek_service(service):
+    @asyncio.coroutine
+    def async_media_seek_service(service):
         """Seek to a position."""
         position = service.data.get(ATTR_MEDIA_SEEK_POSITION)
 
-        for player in component.extract_from_service(service):
-            player.media_seek(position)
+        players = component.async_extract_from_service(service)
 
-            if player.should_poll:
-                player.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            players, 'media_seek', position)
 
-    hass.services.register(DOMAIN, SERVICE_MEDIA_SEEK, media_seek_service,
+    hass.services.register(DOMAIN, SERVICE_MEDIA_SEEK,
+                           async_media_seek_service,
                            descriptions.get(SERVICE_MEDIA_SEEK),
                            schema=MEDIA_PLAYER_MEDIA_SEEK_SCHEMA)
 
-    def select_source_service(service):
+    @asyncio.coroutine
+    def async_select_source_service(service):
         """Change input to selected source."""
         input_source = service.data.get(ATTR_INPUT_SOURCE)
 
-        for player in component.extract_from_service(service):
-            player.select_source(input_source)
+        players = component.async_extract_from_service(service)
 
-            if player.should_poll:
-                player.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            players, 'select_source', input_source)
 
     hass.services.register(DOMAIN, SERVICE_SELECT_SOURCE,
-                           select_source_service,
+                           async_select_source_service,
                            descriptions.get(SERVICE_SELECT_SOURCE),
                            schema=MEDIA_PLAYER_SELECT_SOURCE_SCHEMA)
 
-    def play_media_service(service):
+    @asyncio.coroutine
+    def async_play_media_service(service):
         """Play specified media_id on the media player."""
         media_type = service.data.get(ATTR_MEDIA_CONTENT_TYPE)
         media_id = service.data.get(ATTR_MEDIA_CONTENT_ID)
@@ -382,13 +391,13 @@ def setup(hass, config):
             ATTR_MEDIA_ENQUEUE: enqueue,
         }
 
-        for player in component.extract_from_service(service):
-            player.play_media(media_type, media_id, **kwargs)
+        players = component.async_extract_from_service(service)
 
-            if player.should_poll:
-                player.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            players, 'play_media', media_type, media_id, **kwargs)
 
-    hass.services.register(DOMAIN, SERVICE_PLAY_MEDIA, play_media_service,
+    hass.services.register(DOMAIN, SERVICE_PLAY_MEDIA,
+                           async_play_media_service,
                            descriptions.get(SERVICE_PLAY_MEDIA),
                            schema=MEDIA_PLAYER_PLAY_MEDIA_SCHEMA)
 
@@ -442,6 +451,11 @@ class MediaPlayerDevice(Entity):
         """Image url of current playing media."""
         return None
 
+    @property
+    def media_image_cache_ttl(self):
+        """Seconds the image of the current media may be served cached."""
+        return MEDIA_IMAGE_CACHE_TTL
+
     @property
     def media_title(self):
         """Title of current playing media."""
@@ -686,6 +700,7 @@ class MediaPlayerImageView(HomeAssistantView):
         """Initialize a media player view."""
         super().__init__(hass)
         self.entities = entities
+        self.image_cache = ImageCache(hass)
 
     @asyncio.coroutine
     def get(self, request, entity_id):
@@ -705,16 +720,27 @@ class MediaPlayerImageView(HomeAssistantView):
         if image_url is None:
             return web.Response(status=404)
 
+        @asyncio.coroutine
         def fetch_image():
             """Helper method to fetch image."""
             try:
-                return requests.get(image_url).content
-            except requests.RequestException:
+                with async_timeout.timeout(10, loop=self.hass.loop):
+                    response = yield from self.hass.websession.get(image_url)
+                    image = yield from response.read()
+                    self.hass.loop.create_task(response.release())
+            except (asyncio.TimeoutError, aiohttp.errors.ClientError):
+                _LOGGER.error('Error fetching media image %s', image_url)
                 return None
 
-        response = yield from self.hass.loop.run_in_executor(None, fetch_image)
+            if response.status != 200:
+                return None
+
+            return image
+
+        cached = yield from self.image_cache.async_get(
+            entity_id, image_url, fetch_image, player.media_image_cache_ttl)
 
-        if response is None:
+        if cached is None:
             return web.Response(status=500)
 
-        return web.Response(body=response)
+        return self.image(request, cached.image, cached.etag)
@@ -13,9 +13,10 @@ from homeassistant.components.mqtt import (
     valid_publish_topic, valid_subscribe_topic)
 from homeassistant.const import (
     ATTR_SERVICE_DATA, EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED,
-    EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
+    EVENT_STATE_CHANGED, EVENT_STATE_CHANGED_BULK, EVENT_TIME_CHANGED,
+    MATCH_ALL)
 from homeassistant.core import EventOrigin, State
-from homeassistant.remote import JSONEncoder
+import homeassistant.util.json as json_util
 
 DOMAIN = "mqtt_eventstream"
 DEPENDENCIES = ['mqtt']
@@ -45,6 +46,10 @@ def setup(hass, config):
         if event.event_type == EVENT_TIME_CHANGED:
             return
 
+        # State changes of bulk events are published individually
+        if event.event_type == EVENT_STATE_CHANGED_BULK:
+            return
+
         # Filter out the events that were triggered by publishing
         # to the MQTT topic, or you will end up in an infinite loop.
         if event.event_type == EVENT_CALL_SERVICE:
@@ -66,7 +71,7 @@ def setup(hass, config):
             return
 
         event_info = {'event_type': event.event_type, 'event_data': event.data}
-        msg = json.dumps(event_info, cls=JSONEncoder)
+        msg = json_util.dumps(event_info)
         mqtt.publish(hass, pub_topic, msg)
 
     # Only listen for local events if you are going to publish them.
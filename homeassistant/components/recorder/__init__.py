@@ -12,18 +12,20 @@ import queue
 import threading
 import time
 from datetime import timedelta, datetime
-from typing import Any, Union, Optional, List
+from typing import Any, Iterator, Union, Optional, List, Tuple
 
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.const import (EVENT_HOMEASSISTANT_START,
+from homeassistant.const import (ATTR_NOW, EVENT_HOMEASSISTANT_START,
                                  EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
-                                 EVENT_TIME_CHANGED, MATCH_ALL)
+                                 EVENT_STATE_CHANGED_BULK, EVENT_TIME_CHANGED,
+                                 MATCH_ALL)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import track_point_in_utc_time
 from homeassistant.helpers.typing import ConfigType, QueryType
 import homeassistant.util.dt as dt_util
+from homeassistant.components.recorder.statistics import StatisticsCompiler
 
 DOMAIN = 'recorder'
 
@@ -36,6 +38,7 @@ CONF_DB_URL = 'db_url'
 CONF_PURGE_DAYS = 'purge_days'
 
 RETRIES = 3
+STREAM_CHUNK_SIZE = 1000
 CONNECT_RETRY_WAIT = 10
 QUERY_RETRY_WAIT = 0.1
 
@@ -47,6 +50,8 @@ CONFIG_SCHEMA = vol.Schema({
     })
 }, extra=vol.ALLOW_EXTRA)
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_util.UTC)
+
 _INSTANCE = None  # type: Any
 _LOGGER = logging.getLogger(__name__)
 
@@ -76,6 +81,71 @@ def execute(q: QueryType) -> List[Any]:
     return []
 
 
+def stream(q: QueryType, chunk_size: int=STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """Iterate over the rows of a query without loading all of them.
+
+    Rows are fetched chunk_size at a time, with a server-side cursor where
+    the database supports it. All rows have to be consumed from the thread
+    that started the iteration.
+    """
+    try:
+        yield from q.yield_per(chunk_size)
+    finally:
+        Session.close()
+
+
+def encode_cursor(point_in_time: datetime, row_id: int) -> str:
+    """Return a pagination cursor that points after a row."""
+    if point_in_time.tzinfo is None:
+        point_in_time = dt_util.UTC.localize(point_in_time)
+
+    delta = dt_util.as_utc(point_in_time) - _EPOCH
+    return '{}-{}'.format(
+        (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds,
+        row_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the time and id of the row a cursor points after.
+
+    Raises ValueError if the cursor is invalid.
+    """
+    microseconds, row_id = (int(part) for part in cursor.split('-'))
+    return _EPOCH + timedelta(microseconds=microseconds), row_id
+
+
+def after_cursor(q: QueryType, time_column: Any, id_column: Any,
+                 cursor: Tuple[datetime, int]) -> QueryType:
+    """Filter a query ordered by time and id to rows after the cursor."""
+    point_in_time, row_id = cursor
+    return q.filter(
+        (time_column > point_in_time) |
+        ((time_column == point_in_time) & (id_column > row_id)))
+
+
+def get_page(params: Any, default_limit: int) -> Tuple[Optional[int], Any]:
+    """Return the page size and decoded cursor of request parameters.
+
+    The page size is None if the request is not paginated. Raises
+    ValueError if the limit or cursor are invalid.
+    """
+    limit = params.get('limit')
+    cursor = params.get('cursor')
+
+    if limit is None and cursor is None:
+        return None, None
+
+    limit = int(limit) if limit is not None else default_limit
+
+    if limit < 1:
+        raise ValueError('limit should be positive')
+
+    if cursor is not None:
+        cursor = decode_cursor(cursor)
+
+    return limit, cursor
+
+
 def run_information(point_in_time: Optional[datetime]=None):
     """Return information about current run.
 
@@ -165,6 +235,7 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_ready = threading.Event()
         self.engine = None  # type: Any
+        self.statistics = StatisticsCompiler()
         self._run = None  # type: Any
 
         def start_recording(event):
@@ -202,12 +273,20 @@ class Recorder(threading.Thread):
             event = self.queue.get()
 
             if event is None:
+                self._save_statistics(self.statistics.flush())
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
 
             if event.event_type == EVENT_TIME_CHANGED:
+                self._save_statistics(
+                    self.statistics.compile(event.data[ATTR_NOW]))
+                self.queue.task_done()
+                continue
+
+            # State changes of bulk events are recorded individually
+            if event.event_type == EVENT_STATE_CHANGED_BULK:
                 self.queue.task_done()
                 continue
 
@@ -222,6 +301,9 @@ class Recorder(threading.Thread):
             dbstate.event_id = dbevent.event_id
             self._commit(dbstate)
 
+            self._save_statistics(
+                self.statistics.add_state(event.data.get('new_state')))
+
             self.queue.task_done()
 
     @callback
@@ -299,8 +381,17 @@ class Recorder(threading.Thread):
         self._commit(self._run)
         self._run = None
 
+    def _save_statistics(self, rollups):
+        """Save the rollups of periods that passed."""
+        if rollups:
+            self._commit(
+                lambda session: self.statistics.save(session, rollups))
+
     def _purge_old_data(self):
-        """Purge events and states older than purge_days ago."""
+        """Purge events and states older than purge_days ago.
+
+        The statistics that states were rolled up into are kept.
+        """
         from homeassistant.components.recorder.models import Events, States
 
         if not self.purge_days or self.purge_days < 1:
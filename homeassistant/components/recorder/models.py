@@ -4,13 +4,12 @@ import json
 from datetime import datetime
 import logging
 
-from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
-                        String, Text, distinct)
+from sqlalchemy import (Boolean, Column, DateTime, Float, ForeignKey, Index,
+                        Integer, String, Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import Event, EventOrigin, State, split_entity_id
-from homeassistant.remote import JSONEncoder
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
@@ -35,7 +34,7 @@ class Events(Base):  # type: ignore
     def from_event(event):
         """Create an event database object from a native event."""
         return Events(event_type=event.event_type,
-                      event_data=json.dumps(event.data, cls=JSONEncoder),
+                      event_data=event.data_json(),
                       origin=str(event.origin),
                       time_fired=event.time_fired)
 
@@ -92,8 +91,7 @@ class States(Base):   # type: ignore
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes),
-                                            cls=JSONEncoder)
+            dbstate.attributes = state.attributes_json()
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -114,6 +112,54 @@ class States(Base):   # type: ignore
             return None
 
 
+class Statistics(Base):   # type: ignore
+    # pylint: disable=too-few-public-methods
+    """Rollup of the numeric states of an entity over a period."""
+
+    __tablename__ = 'statistics'
+    statistic_id = Column(Integer, primary_key=True)
+    domain = Column(String(64))
+    entity_id = Column(String(255))
+    period = Column(Integer)
+    start = Column(DateTime(timezone=True))
+    min = Column(Float)
+    max = Column(Float)
+    mean = Column(Float)
+    last = Column(Float)
+    count = Column(Integer)
+    created = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (Index('statistics__period_start',
+                            'period', 'start', 'entity_id'), )
+
+    @staticmethod
+    def from_rollup(rollup):
+        """Create a statistics row from a rollup of the recorder."""
+        return Statistics(domain=split_entity_id(rollup.entity_id)[0],
+                          entity_id=rollup.entity_id,
+                          period=rollup.period,
+                          start=rollup.start,
+                          min=rollup.min,
+                          max=rollup.max,
+                          mean=rollup.mean,
+                          last=rollup.last,
+                          count=rollup.count)
+
+    def to_state(self, attributes=None):
+        """Return the rollup as a state of the mean at the period start.
+
+        Min, max and last are added to the attributes.
+        """
+        attributes = dict(attributes or {})
+        attributes.update(min=self.min, max=self.max, last=self.last)
+        start = _process_timestamp(self.start)
+        return State(self.entity_id, str(self.mean), attributes, start, start)
+
+    def to_native(self):
+        """Return self, native format is this model."""
+        return self
+
+
 class RecorderRuns(Base):   # type: ignore
     # pylint: disable=too-few-public-methods
     """Representation of recorder run."""
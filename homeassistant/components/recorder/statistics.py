@@ -0,0 +1,163 @@
+"""Long-term statistics of numeric states.
+
+The recorder rolls the numeric states of every entity up into the min, max,
+mean and last value per 5 minutes and per hour. Rollups are written to the
+statistics table once their period has passed and are kept when old states
+are purged, so graphs over long periods can be drawn from them.
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple  # NOQA
+
+import homeassistant.util.dt as dt_util
+
+PERIOD_5MIN = 300
+PERIOD_HOUR = 3600
+
+# Periods that states are rolled up into, finest first
+PERIODS = (PERIOD_5MIN, PERIOD_HOUR)
+
+
+def period_start(point_in_time: datetime, period: int) -> datetime:
+    """Return the start of the period that point_in_time falls in."""
+    timestamp = dt_util.as_timestamp(point_in_time)
+    return dt_util.utc_from_timestamp(timestamp - timestamp % period)
+
+
+def numeric_value(state: Any) -> Optional[float]:
+    """Return the value of a state or None if it is not a finite number."""
+    if state is None:
+        return None
+
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+
+    return value if math.isfinite(value) else None
+
+
+class Rollup(object):
+    """Min, max, mean and last of the values of an entity in a period."""
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ['entity_id', 'period', 'start', 'end', 'min', 'max',
+                 'total', 'count', 'last']
+
+    def __init__(self, entity_id: str, period: int, start: datetime) -> None:
+        """Initialize an empty rollup."""
+        self.entity_id = entity_id
+        self.period = period
+        self.start = start
+        self.end = start + timedelta(seconds=period)
+        self.min = None  # type: float
+        self.max = None  # type: float
+        self.total = 0.0
+        self.count = 0
+        self.last = None  # type: float
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the values."""
+        return self.total / self.count
+
+    def add(self, value: float) -> None:
+        """Add a value to the rollup."""
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.total += value
+        self.count += 1
+        self.last = value
+
+
+class StatisticsCompiler(object):
+    """Roll up numeric states per period.
+
+    Only used from the recorder thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compiler."""
+        self.started = dt_util.utcnow()
+        self._rollups = {}  # type: Dict[Tuple[str, int], Rollup]
+        self._next_end = None  # type: datetime
+
+    def add_state(self, state: Any) -> List[Rollup]:
+        """Add a new state and return the rollups that it completed."""
+        value = numeric_value(state)
+
+        if value is None:
+            return []
+
+        completed = []
+
+        for period in PERIODS:
+            key = (state.entity_id, period)
+            start = period_start(state.last_updated, period)
+            rollup = self._rollups.get(key)
+
+            if rollup is not None and rollup.start != start:
+                completed.append(rollup)
+                rollup = None
+
+            if rollup is None:
+                rollup = self._rollups[key] = Rollup(
+                    state.entity_id, period, start)
+
+                if self._next_end is None or rollup.end < self._next_end:
+                    self._next_end = rollup.end
+
+            rollup.add(value)
+
+        return completed
+
+    def compile(self, now: datetime) -> List[Rollup]:
+        """Return and forget the rollups of periods that ended before now."""
+        if self._next_end is None or now < self._next_end:
+            return []
+
+        completed = [rollup for rollup in self._rollups.values()
+                     if rollup.end <= now]
+
+        for rollup in completed:
+            del self._rollups[(rollup.entity_id, rollup.period)]
+
+        self._next_end = min(
+            (rollup.end for rollup in self._rollups.values()), default=None)
+
+        return completed
+
+    def flush(self) -> List[Rollup]:
+        """Return and forget all rollups, including unfinished ones."""
+        rollups = list(self._rollups.values())
+        self._rollups.clear()
+        self._next_end = None
+        return rollups
+
+    def save(self, session: Any, rollups: List[Rollup]) -> None:
+        """Add rollups to the statistics table.
+
+        Rollups of periods that started before the compiler may have been
+        saved partially on the previous shutdown and are merged into the
+        existing row.
+        """
+        from homeassistant.components.recorder.models import Statistics
+
+        for rollup in rollups:
+            row = None
+
+            if rollup.start < self.started:
+                row = session.query(Statistics).filter_by(
+                    entity_id=rollup.entity_id, period=rollup.period,
+                    start=rollup.start).first()
+
+            if row is None:
+                session.add(Statistics.from_rollup(rollup))
+                continue
+
+            count = row.count + rollup.count
+            row.min = min(row.min, rollup.min)
+            row.max = max(row.max, rollup.max)
+            row.mean = (row.mean * row.count + rollup.total) / count
+            row.count = count
+            row.last = rollup.last
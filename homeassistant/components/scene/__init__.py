@@ -4,6 +4,7 @@ Allow users to set and activate scenes.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/scene/
 """
+import asyncio
 import logging
 from collections import namedtuple
 
@@ -61,14 +62,15 @@ def setup(hass, config):
 
     component.setup(config)
 
-    def handle_scene_service(service):
+    @asyncio.coroutine
+    def async_handle_scene_service(service):
         """Handle calls to the switch services."""
-        target_scenes = component.extract_from_service(service)
+        target_scenes = component.async_extract_from_service(service)
 
-        for scene in target_scenes:
-            scene.activate()
+        yield from component.async_call_entity_service(
+            target_scenes, 'activate')
 
-    hass.services.register(DOMAIN, SERVICE_TURN_ON, handle_scene_service,
+    hass.services.register(DOMAIN, SERVICE_TURN_ON, async_handle_scene_service,
                            schema=SCENE_SERVICE_SCHEMA)
 
     return True
@@ -4,13 +4,15 @@ Allow users to set and activate scenes.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/scene/
 """
+import asyncio
 from collections import namedtuple
 
 from homeassistant.components.scene import Scene
 from homeassistant.const import (
     ATTR_ENTITY_ID, STATE_OFF, STATE_ON)
 from homeassistant.core import State
-from homeassistant.helpers.state import reproduce_state
+from homeassistant.helpers.state import (
+    async_reproduce_state, reproduce_state)
 
 DEPENDENCIES = ['group']
 STATE = 'scening'
@@ -84,3 +86,12 @@ class HomeAssistantScene(Scene):
     def activate(self):
         """Activate scene. Try to get entities into requested state."""
         reproduce_state(self.hass, self.scene_config.states.values(), True)
+
+    @asyncio.coroutine
+    def async_activate(self):
+        """Activate scene. Try to get entities into requested state.
+
+        This method must be run in the event loop.
+        """
+        yield from async_reproduce_state(
+            self.hass, self.scene_config.states.values(), True)
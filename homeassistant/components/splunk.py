@@ -4,16 +4,19 @@ Support to send data to an Splunk instance.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/splunk/
 """
+import asyncio
 import json
 import logging
 
-import requests
 import voluptuous as vol
 
 from homeassistant.const import (
-    CONF_HOST, CONF_PORT, CONF_SSL, CONF_TOKEN, EVENT_STATE_CHANGED)
+    CONF_HOST, CONF_PORT, CONF_SSL, CONF_TOKEN)
 from homeassistant.helpers import state as state_helper
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.export import (
+    CONF_EXCLUDE, CONF_INCLUDE, FILTER_LIST_SCHEMA, EntityFilter,
+    StateExporter)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +32,8 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_HOST, default=DEFAULT_HOST): cv.string,
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
         vol.Optional(CONF_SSL, default=False): cv.boolean,
+        vol.Optional(CONF_INCLUDE): FILTER_LIST_SCHEMA,
+        vol.Optional(CONF_EXCLUDE): FILTER_LIST_SCHEMA,
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -48,15 +53,24 @@ def setup(hass, config):
 
     event_collector = '{}{}:{}/services/collector/event'.format(
         uri_scheme, host, port)
-    headers = {'Authorization': 'Splunk {}'.format(token)}
 
-    def splunk_event_listener(event):
-        """Listen for new messages on the bus and sends them to Splunk."""
-        state = event.data.get('new_state')
+    SplunkExporter(hass, event_collector, token,
+                   EntityFilter.from_config(conf)).start()
 
-        if state is None:
-            return
+    return True
+
+
+class SplunkExporter(StateExporter):
+    """Send state changes to the Splunk HTTP event collector."""
+
+    def __init__(self, hass, event_collector, token, entity_filter):
+        """Initialize the exporter."""
+        super().__init__(hass, DOMAIN, entity_filter)
+        self.event_collector = event_collector
+        self.headers = {'Authorization': 'Splunk {}'.format(token)}
 
+    def convert(self, event, state):
+        """Return the Splunk event of a new state."""
         try:
             _state = state_helper.state_as_number(state)
         except ValueError:
@@ -72,14 +86,15 @@ def setup(hass, config):
             }
         ]
 
-        try:
-            payload = {"host": event_collector,
-                       "event": json_body}
-            requests.post(event_collector, data=json.dumps(payload),
-                          headers=headers)
-        except requests.exceptions.RequestException as error:
-            _LOGGER.exception('Error saving event to Splunk: %s', error)
+        return json.dumps({'host': self.event_collector, 'event': json_body})
 
-    hass.bus.listen(EVENT_STATE_CHANGED, splunk_event_listener)
+    @asyncio.coroutine
+    def async_send(self, items):
+        """Post a batch of events to Splunk.
 
-    return True
+        The event collector accepts multiple concatenated events.
+
+        This method is a coroutine.
+        """
+        yield from self.async_post(self.event_collector, data=''.join(items),
+                                   headers=self.headers)
@@ -9,9 +9,12 @@ import logging
 import voluptuous as vol
 
 from homeassistant.const import (
-    CONF_HOST, CONF_PORT, CONF_PREFIX, EVENT_STATE_CHANGED)
+    CONF_HOST, CONF_PORT, CONF_PREFIX)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.export import (
+    CONF_EXCLUDE, CONF_INCLUDE, FILTER_LIST_SCHEMA, EntityFilter,
+    StateExporter)
 
 REQUIREMENTS = ['statsd==3.2.1']
 
@@ -34,6 +37,8 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PREFIX, default=DEFAULT_PREFIX): cv.string,
         vol.Optional(CONF_RATE, default=DEFAULT_RATE):
             vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_INCLUDE): FILTER_LIST_SCHEMA,
+        vol.Optional(CONF_EXCLUDE): FILTER_LIST_SCHEMA,
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -45,50 +50,70 @@ def setup(hass, config):
     conf = config[DOMAIN]
     host = conf.get(CONF_HOST)
     port = conf.get(CONF_PORT)
-    sample_rate = conf.get(CONF_RATE)
     prefix = conf.get(CONF_PREFIX)
-    show_attribute_flag = conf.get(CONF_ATTR)
 
     statsd_client = statsd.StatsClient(host=host, port=port, prefix=prefix)
 
-    def statsd_event_listener(event):
-        """Listen for new messages on the bus and sends them to StatsD."""
-        state = event.data.get('new_state')
+    StatsdExporter(hass, statsd_client, conf.get(CONF_RATE),
+                   conf.get(CONF_ATTR), EntityFilter.from_config(conf)).start()
 
-        if state is None:
-            return
+    return True
+
+
+class StatsdExporter(StateExporter):
+    """Send state changes to StatsD.
+
+    The stats of a batch are sent through a pipeline, which combines them
+    into as few packets as possible.
+    """
+
+    def __init__(self, hass, statsd_client, sample_rate, show_attribute_flag,
+                 entity_filter):
+        """Initialize the exporter."""
+        super().__init__(hass, DOMAIN, entity_filter)
+        self.statsd_client = statsd_client
+        self.sample_rate = sample_rate
+        self.show_attribute_flag = show_attribute_flag
 
+    def convert(self, event, state):
+        """Return the gauges and counter to send for a new state."""
         try:
             _state = state_helper.state_as_number(state)
         except ValueError:
             # Set the state to none and continue for any numeric attributes.
             _state = None
 
-        states = dict(state.attributes)
+        stats = []
 
-        _LOGGER.debug('Sending %s', state.entity_id)
-
-        if show_attribute_flag is True:
+        if self.show_attribute_flag is True:
             if isinstance(_state, (float, int)):
-                statsd_client.gauge(
-                    "%s.state" % state.entity_id,
-                    _state,
-                    sample_rate
-                )
+                stats.append(('gauge', "%s.state" % state.entity_id, _state))
 
             # Send attribute values
-            for key, value in states.items():
+            for key, value in state.attributes.items():
                 if isinstance(value, (float, int)):
                     stat = "%s.%s" % (state.entity_id, key.replace(' ', '_'))
-                    statsd_client.gauge(stat, value, sample_rate)
+                    stats.append(('gauge', stat, value))
 
         else:
             if isinstance(_state, (float, int)):
-                statsd_client.gauge(state.entity_id, _state, sample_rate)
+                stats.append(('gauge', state.entity_id, _state))
 
         # Increment the count
-        statsd_client.incr(state.entity_id, rate=sample_rate)
+        stats.append(('incr', state.entity_id, 1))
 
-    hass.bus.listen(EVENT_STATE_CHANGED, statsd_event_listener)
+        return stats
 
-    return True
+    def send(self, items):
+        """Send the stats of a batch of states."""
+        pipe = self.statsd_client.pipeline()
+
+        for stats in items:
+            for kind, stat, value in stats:
+                if kind == 'gauge':
+                    pipe.gauge(stat, value, self.sample_rate)
+                else:
+                    pipe.incr(stat, value, rate=self.sample_rate)
+
+        _LOGGER.debug('Sending %d states', len(items))
+        pipe.send()
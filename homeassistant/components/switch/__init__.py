@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation
 at https://home-assistant.io/components/switch/
 """
 from datetime import timedelta
+import asyncio
 import logging
 import os
 
@@ -75,30 +76,33 @@ def setup(hass, config):
         _LOGGER, DOMAIN, hass, SCAN_INTERVAL, GROUP_NAME_ALL_SWITCHES)
     component.setup(config)
 
-    def handle_switch_service(service):
+    @asyncio.coroutine
+    def async_handle_switch_service(service):
         """Handle calls to the switch services."""
-        target_switches = component.extract_from_service(service)
+        target_switches = component.async_extract_from_service(service)
 
-        for switch in target_switches:
-            if service.service == SERVICE_TURN_ON:
-                switch.turn_on()
-            elif service.service == SERVICE_TOGGLE:
-                switch.toggle()
-            else:
-                switch.turn_off()
+        if service.service == SERVICE_TURN_ON:
+            method = 'turn_on'
+        elif service.service == SERVICE_TOGGLE:
+            method = 'toggle'
+        else:
+            method = 'turn_off'
 
-            if switch.should_poll:
-                switch.update_ha_state(True)
+        yield from component.async_call_entity_service(
+            target_switches, method)
 
     descriptions = load_yaml_config_file(
         os.path.join(os.path.dirname(__file__), 'services.yaml'))
-    hass.services.register(DOMAIN, SERVICE_TURN_OFF, handle_switch_service,
+    hass.services.register(DOMAIN, SERVICE_TURN_OFF,
+                           async_handle_switch_service,
                            descriptions.get(SERVICE_TURN_OFF),
                            schema=SWITCH_SERVICE_SCHEMA)
-    hass.services.register(DOMAIN, SERVICE_TURN_ON, handle_switch_service,
+    hass.services.register(DOMAIN, SERVICE_TURN_ON,
+                           async_handle_switch_service,
                            descriptions.get(SERVICE_TURN_ON),
                            schema=SWITCH_SERVICE_SCHEMA)
-    hass.services.register(DOMAIN, SERVICE_TOGGLE, handle_switch_service,
+    hass.services.register(DOMAIN, SERVICE_TOGGLE,
+                           async_handle_switch_service,
                            descriptions.get(SERVICE_TOGGLE),
                            schema=SWITCH_SERVICE_SCHEMA)
 
@@ -1,4 +1,5 @@
 """A component to submit data to thingspeak."""
+from datetime import timedelta
 import logging
 
 import voluptuous as vol
@@ -9,7 +10,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE, STATE_UNKNOWN)
 from homeassistant.helpers import state as state_helper
 import homeassistant.helpers.config_validation as cv
-import homeassistant.helpers.event as event
+from homeassistant.helpers.export import EntityFilter, StateExporter
 
 REQUIREMENTS = ['thingspeak==0.4.0']
 
@@ -18,6 +19,9 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = 'thingspeak'
 TIMEOUT = 5
 
+# ThingSpeak accepts one update of a channel every 15 seconds.
+MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=15)
+
 # Validate the config
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
@@ -48,24 +52,33 @@ def setup(hass, config):
                       "API key is correct.")
         return False
 
-    def thingspeak_listener(entity_id, old_state, new_state):
-        """Listen for new events and send them to thingspeak."""
-        if new_state is None or new_state.state in (
-                STATE_UNKNOWN, '', STATE_UNAVAILABLE):
-            return
+    ThingSpeakExporter(
+        hass, channel, EntityFilter(include_entities=[entity])).start()
+
+    return True
+
+
+class ThingSpeakExporter(StateExporter):
+    """Send the latest state of an entity to a ThingSpeak channel."""
+
+    batch_size = 1000
+    flush_interval = MIN_TIME_BETWEEN_UPDATES
+
+    def __init__(self, hass, channel, entity_filter):
+        """Initialize the exporter."""
+        super().__init__(hass, DOMAIN, entity_filter)
+        self.channel = channel
+
+    def convert(self, event, state):
+        """Return the numeric value of a new state."""
+        if state.state in (STATE_UNKNOWN, '', STATE_UNAVAILABLE):
+            return None
+
         try:
-            if new_state.entity_id != entity:
-                return
-            _state = state_helper.state_as_number(new_state)
+            return state_helper.state_as_number(state)
         except ValueError:
-            return
-        try:
-            channel.update({'field1': _state})
-        except RequestException:
-            _LOGGER.error(
-                'Error while sending value "%s" to Thingspeak',
-                _state)
-
-    event.track_state_change(hass, entity, thingspeak_listener)
+            return None
 
-    return True
+    def send(self, items):
+        """Send the latest value to ThingSpeak."""
+        self.channel.update({'field1': items[-1]})
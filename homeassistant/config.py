@@ -15,10 +15,10 @@ from homeassistant.const import (
     CONF_TIME_ZONE, CONF_CUSTOMIZE, CONF_ELEVATION, CONF_UNIT_SYSTEM_METRIC,
     CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
     __version__)
-from homeassistant.core import valid_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util.yaml import load_yaml
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.coalesce import CONF_COALESCE, COALESCE_SCHEMA
 from homeassistant.helpers.entity import set_customize
 from homeassistant.util import dt as date_util, location as loc_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
@@ -79,19 +79,23 @@ sensor:
 """
 
 
-def _valid_customize(value):
-    """Config validator for customize."""
-    if not isinstance(value, dict):
-        raise vol.Invalid('Expected dictionary')
+# A coalesce option without settings uses the defaults
+_CUSTOMIZE_COALESCE_SCHEMA = vol.All(lambda value: value or {},
+                                     COALESCE_SCHEMA)
 
-    for key, val in value.items():
-        if not valid_entity_id(key):
-            raise vol.Invalid('Invalid entity ID: {}'.format(key))
+ENTITY_CUSTOMIZE_SCHEMA = vol.Schema({
+    vol.Optional(CONF_COALESCE): _CUSTOMIZE_COALESCE_SCHEMA,
+}, extra=vol.ALLOW_EXTRA)
 
-        if not isinstance(val, dict):
-            raise vol.Invalid('Value of {} is not a dictionary'.format(key))
+# Domains can only be customized to coalesce state writes
+DOMAIN_CUSTOMIZE_SCHEMA = vol.Schema({
+    vol.Required(CONF_COALESCE): _CUSTOMIZE_COALESCE_SCHEMA,
+})
 
-    return value
+CUSTOMIZE_SCHEMA = vol.Schema({
+    cv.entity_id: ENTITY_CUSTOMIZE_SCHEMA,
+    cv.slug: DOMAIN_CUSTOMIZE_SCHEMA,
+})
 
 CORE_CONFIG_SCHEMA = vol.Schema({
     CONF_NAME: vol.Coerce(str),
@@ -102,7 +106,7 @@ CORE_CONFIG_SCHEMA = vol.Schema({
     CONF_UNIT_SYSTEM: cv.unit_system,
     CONF_TIME_ZONE: cv.time_zone,
     vol.Required(CONF_CUSTOMIZE,
-                 default=MappingProxyType({})): _valid_customize,
+                 default=MappingProxyType({})): CUSTOMIZE_SCHEMA,
 })
 
 
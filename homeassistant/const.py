@@ -147,6 +147,7 @@ CONF_ZONE = 'zone'
 EVENT_HOMEASSISTANT_START = 'homeassistant_start'
 EVENT_HOMEASSISTANT_STOP = 'homeassistant_stop'
 EVENT_STATE_CHANGED = 'state_changed'
+EVENT_STATE_CHANGED_BULK = 'state_changed_bulk'
 EVENT_TIME_CHANGED = 'time_changed'
 EVENT_CALL_SERVICE = 'call_service'
 EVENT_SERVICE_EXECUTED = 'service_executed'
@@ -182,6 +183,9 @@ ATTR_ATTRIBUTION = 'attribution'
 # Contains current time for a TIME_CHANGED event
 ATTR_NOW = 'now'
 
+# Contains the state changes of a bulk state write
+ATTR_CHANGES = 'changes'
+
 # Contains domain, service for a SERVICE_CALL event
 ATTR_DOMAIN = 'domain'
 ATTR_SERVICE = 'service'
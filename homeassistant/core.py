@@ -24,11 +24,11 @@ import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
 from homeassistant.const import (
-    ATTR_DOMAIN, ATTR_FRIENDLY_NAME, ATTR_NOW, ATTR_SERVICE,
+    ATTR_CHANGES, ATTR_DOMAIN, ATTR_FRIENDLY_NAME, ATTR_NOW, ATTR_SERVICE,
     ATTR_SERVICE_CALL_ID, ATTR_SERVICE_DATA, EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
     EVENT_SERVICE_EXECUTED, EVENT_SERVICE_REGISTERED, EVENT_STATE_CHANGED,
-    EVENT_TIME_CHANGED, MATCH_ALL, RESTART_EXIT_CODE,
+    EVENT_STATE_CHANGED_BULK, EVENT_TIME_CHANGED, MATCH_ALL, RESTART_EXIT_CODE,
     SERVICE_HOMEASSISTANT_RESTART, SERVICE_HOMEASSISTANT_STOP, __version__)
 from homeassistant.exceptions import (
     HomeAssistantError, InvalidEntityFormatError)
@@ -36,6 +36,7 @@ from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe)
 import homeassistant.util as util
 import homeassistant.util.dt as dt_util
+import homeassistant.util.json as json_util
 import homeassistant.util.location as location
 from homeassistant.util.unit_system import UnitSystem, METRIC_SYSTEM  # NOQA
 
@@ -242,6 +243,32 @@ class HomeAssistant(object):
         else:
             self.add_job(target, *args)
 
+    @callback
+    def async_add_pool_job(self, target: Callable[..., Any], *args: Any,
+                           priority: JobPriority=JobPriority.EVENT_DEFAULT):
+        """Run a job in the worker pool and return a future for its result.
+
+        This method must be run in the event loop.
+
+        target: target to call.
+        args: parameters for method to call.
+        """
+        fut = asyncio.Future(loop=self.loop)
+
+        def run_job():
+            """Run target and pass its outcome to the future."""
+            try:
+                result = target(*args)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.loop.call_soon_threadsafe(_async_set_exception,
+                                               fut, exc)
+            else:
+                self.loop.call_soon_threadsafe(_async_set_result,
+                                               fut, result)
+
+        self.add_job(run_job, priority=priority)
+        return fut
+
     @callback
     def async_run_job(self, target: Callable[..., None], *args: Any):
         """Run a job from within the event loop.
@@ -367,7 +394,7 @@ class Event(object):
     # pylint: disable=too-few-public-methods
     """Represents an event within the Bus."""
 
-    __slots__ = ['event_type', 'data', 'origin', 'time_fired']
+    __slots__ = ['event_type', 'data', 'origin', 'time_fired', '_json']
 
     def __init__(self, event_type, data=None, origin=EventOrigin.local,
                  time_fired=None):
@@ -376,6 +403,7 @@ class Event(object):
         self.data = data or {}
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
+        self._json = None
 
     def as_dict(self):
         """Create a dict representation of this Event.
@@ -389,6 +417,41 @@ class Event(object):
             'time_fired': self.time_fired,
         }
 
+    def _json_cache(self):
+        """Return the cached JSON of the data and the event.
+
+        The cache is invalidated when data, origin or time_fired are
+        replaced. The data itself should not be modified after firing.
+        """
+        cache = self._json
+
+        if cache is None or cache[0] is not self.data or \
+                cache[1] is not self.origin or \
+                cache[2] is not self.time_fired:
+            data_json = json_util.dumps(self.data)
+            cache = self._json = (
+                self.data, self.origin, self.time_fired, data_json,
+                '{{"data":{},"event_type":{},"origin":{},"time_fired":{}}}'
+                .format(data_json, json_util.dumps(self.event_type),
+                        json_util.dumps(str(self.origin)),
+                        json_util.dumps(self.time_fired.isoformat())))
+
+        return cache
+
+    def data_json(self):
+        """Return the JSON representation of the event data.
+
+        Async friendly.
+        """
+        return self._json_cache()[3]
+
+    def as_json(self):
+        """Return the JSON representation of the event.
+
+        Async friendly.
+        """
+        return self._json_cache()[4]
+
     def __repr__(self):
         """Return the representation."""
         # pylint: disable=maybe-no-member
@@ -414,6 +477,8 @@ class EventBus(object):
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
+        # Listeners per event type are kept in tuples that are replaced, not
+        # modified, so firing can iterate them while listeners are removed.
         self._listeners = {}
         self._hass = hass
 
@@ -449,22 +514,27 @@ class EventBus(object):
                 self._hass.state == CoreState.stopping:
             raise HomeAssistantError('Home Assistant is shutting down.')
 
-        # Copy the list of the current listeners because some listeners
-        # remove themselves as a listener while being executed which
-        # causes the iterator to be confused.
         get = self._listeners.get
-        listeners = get(MATCH_ALL, []) + get(event_type, [])
+        match_all_listeners = get(MATCH_ALL, ())
+        listeners = get(event_type, ())
+        log = event_type != EVENT_TIME_CHANGED and \
+            _LOGGER.isEnabledFor(logging.INFO)
+
+        if not (match_all_listeners or listeners or log):
+            return
 
         event = Event(event_type, event_data, origin)
 
-        if event_type != EVENT_TIME_CHANGED:
+        if log:
             _LOGGER.info("Bus:Handling %s", event)
 
-        if not listeners:
-            return
+        add_job = self._hass.async_add_job
+
+        for func in match_all_listeners:
+            add_job(func, event)
 
         for func in listeners:
-            self._hass.async_add_job(func, event)
+            add_job(func, event)
 
     def listen(self, event_type, listener):
         """Listen for all events or events of a specific type.
@@ -491,10 +561,8 @@ class EventBus(object):
 
         This method must be run in the event loop.
         """
-        if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
-        else:
-            self._listeners[event_type] = [listener]
+        self._listeners[event_type] = \
+            self._listeners.get(event_type, ()) + (listener,)
 
         def remove_listener():
             """Remove the listener."""
@@ -556,10 +624,13 @@ class EventBus(object):
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            listeners = list(self._listeners[event_type])
+            listeners.remove(listener)
 
-            # delete event_type list if empty
-            if not self._listeners[event_type]:
+            # delete event_type listeners if empty
+            if listeners:
+                self._listeners[event_type] = tuple(listeners)
+            else:
                 self._listeners.pop(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
@@ -579,7 +650,7 @@ class State(object):
     """
 
     __slots__ = ['entity_id', 'state', 'attributes',
-                 'last_changed', 'last_updated']
+                 'last_changed', 'last_updated', '_json']
 
     # pylint: disable=too-many-arguments
     def __init__(self, entity_id, state, attributes=None, last_changed=None,
@@ -590,12 +661,31 @@ class State(object):
                 "Invalid entity id encountered: {}. "
                 "Format should be <domain>.<object_id>").format(entity_id))
 
-        self.entity_id = entity_id.lower()
+        self.entity_id = sys.intern(entity_id.lower())
         self.state = str(state)
         self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
 
         self.last_changed = last_changed or self.last_updated
+        self._json = None
+
+    @classmethod
+    def _from_trusted(cls, entity_id, state, attributes, last_changed,
+                      last_updated):
+        """Initialize a state from values that are known to be valid.
+
+        entity_id has to be a valid, lowercase and interned entity id, state
+        a string and attributes a read-only mapping that is not modified
+        afterwards.
+        """
+        obj = cls.__new__(cls)
+        obj.entity_id = entity_id
+        obj.state = state
+        obj.attributes = attributes
+        obj.last_updated = last_updated
+        obj.last_changed = last_changed or last_updated
+        obj._json = None
+        return obj
 
     @property
     def domain(self):
@@ -628,6 +718,48 @@ class State(object):
                 'last_changed': self.last_changed,
                 'last_updated': self.last_updated}
 
+    def _json_cache(self):
+        """Return the cached JSON of the attributes and the state.
+
+        States are shared by all consumers, so each is serialized once. The
+        cache is invalidated when any of the fields is replaced.
+        """
+        cache = self._json
+
+        if cache is None or cache[0] is not self.state or \
+                cache[1] is not self.attributes or \
+                cache[2] is not self.last_changed or \
+                cache[3] is not self.last_updated or \
+                cache[4] is not self.entity_id:
+            attributes_json = json_util.dumps(dict(self.attributes))
+            cache = self._json = (
+                self.state, self.attributes, self.last_changed,
+                self.last_updated, self.entity_id, attributes_json,
+                '{{"attributes":{},"entity_id":{},"last_changed":{},'
+                '"last_updated":{},"state":{}}}'.format(
+                    attributes_json, json_util.dumps(self.entity_id),
+                    json_util.dumps(self.last_changed.isoformat()),
+                    json_util.dumps(self.last_updated.isoformat()),
+                    json_util.dumps(self.state)))
+
+        return cache
+
+    def attributes_json(self):
+        """Return the JSON representation of the attributes.
+
+        Async friendly.
+        """
+        return self._json_cache()[5]
+
+    def as_json(self):
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        Equal to the JSON of as_dict.
+        """
+        return self._json_cache()[6]
+
     @classmethod
     def from_dict(cls, json_dict):
         """Initialize a state from a dict.
@@ -795,34 +927,106 @@ class StateMachine(object):
 
         This method must be run in the event loop.
         """
-        entity_id = entity_id.lower()
+        event_data = self._async_update(
+            entity_id, new_state, attributes, force_update)
+
+        if event_data is not None:
+            self._bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    def set_many(self, states, force_update=False):
+        """Set the state of multiple entities at once.
+
+        States is an iterable of (entity_id, new_state, attributes) tuples.
+        """
+        run_callback_threadsafe(
+            self._loop, self.async_set_many, list(states), force_update,
+        ).result()
+
+    @callback
+    def async_set_many(self, states, force_update=False):
+        """Set the state of multiple entities at once.
+
+        States is an iterable of (entity_id, new_state, attributes) tuples.
+
+        A state changed event is fired for each changed entity, in order.
+        Afterwards a single state changed bulk event is fired that contains
+        the data of all these events for listeners that handle batches.
+
+        Returns the number of changed entities.
+
+        This method must be run in the event loop.
+        """
+        changes = []
+
+        for entity_id, new_state, attributes in states:
+            event_data = self._async_update(
+                entity_id, new_state, attributes, force_update)
+
+            if event_data is not None:
+                self._bus.async_fire(EVENT_STATE_CHANGED, event_data)
+                changes.append(event_data)
+
+        if changes:
+            self._bus.async_fire(EVENT_STATE_CHANGED_BULK,
+                                 {ATTR_CHANGES: changes})
+
+        return len(changes)
+
+    @callback
+    def _async_update(self, entity_id, new_state, attributes, force_update):
+        """Update the state of an entity.
+
+        Returns the data for the state changed event or None if the state
+        did not change.
+
+        This method must be run in the event loop.
+        """
         new_state = str(new_state)
         attributes = attributes or {}
 
+        # Known entity ids are stored lowercase, so only lower on a miss.
         old_state = self._states.get(entity_id)
 
-        is_existing = old_state is not None
-        same_state = (is_existing and old_state.state == new_state and
-                      not force_update)
-        same_attr = is_existing and old_state.attributes == attributes
+        if old_state is None:
+            entity_id = entity_id.lower()
+            old_state = self._states.get(entity_id)
+
+        if old_state is None:
+            if not valid_entity_id(entity_id):
+                raise InvalidEntityFormatError((
+                    "Invalid entity id encountered: {}. "
+                    "Format should be <domain>.<object_id>").format(entity_id))
+
+            entity_id = sys.intern(entity_id)
+            same_state = same_attr = False
+        else:
+            entity_id = old_state.entity_id
+            same_state = old_state.state == new_state and not force_update
+            same_attr = old_state.attributes == attributes
 
         if same_state and same_attr:
-            return
+            return None
 
         # If state did not exist or is different, set it
         last_changed = old_state.last_changed if same_state else None
 
-        state = State(entity_id, new_state, attributes, last_changed)
+        # Share the attributes of the previous state if they are equal,
+        # otherwise take a copy so states stay immutable.
+        if same_attr:
+            attributes = old_state.attributes
+        else:
+            attributes = MappingProxyType(dict(attributes))
+
+        state = State._from_trusted(  # pylint: disable=protected-access
+            entity_id, new_state, attributes, last_changed, dt_util.utcnow())
         self._states[entity_id] = state
 
-        event_data = {
+        return {
             'entity_id': entity_id,
             'old_state': old_state,
             'new_state': state,
         }
 
-        self._bus.async_fire(EVENT_STATE_CHANGED, event_data)
-
 
 # pylint: disable=too-few-public-methods
 class Service(object):
@@ -881,6 +1085,9 @@ class ServiceRegistry(object):
         self._loop = loop
         self._cur_id = 0
         self._async_unsub_call_event = None
+        self._async_unsub_executed_event = None
+        # Futures of blocking calls waiting to be executed, by call id
+        self._pending_calls = {}
 
     @property
     def services(self):
@@ -964,7 +1171,8 @@ class ServiceRegistry(object):
         Waits a maximum of SERVICE_CALL_LIMIT.
 
         If blocking = True, will return boolean if service executed
-        succesfully within SERVICE_CALL_LIMIT.
+        succesfully within SERVICE_CALL_LIMIT. If the service raised an
+        exception, it is raised again here.
 
         This method will fire an event to call the service.
         This event will be picked up by this ServiceRegistry and any
@@ -987,7 +1195,8 @@ class ServiceRegistry(object):
         Waits a maximum of SERVICE_CALL_LIMIT.
 
         If blocking = True, will return boolean if service executed
-        succesfully within SERVICE_CALL_LIMIT.
+        succesfully within SERVICE_CALL_LIMIT. If the service raised an
+        exception, it is raised again here.
 
         This method will fire an event to call the service.
         This event will be picked up by this ServiceRegistry and any
@@ -1007,26 +1216,67 @@ class ServiceRegistry(object):
             ATTR_SERVICE_CALL_ID: call_id,
         }
 
-        if blocking:
-            fut = asyncio.Future(loop=self._loop)
+        if not blocking:
+            self._bus.async_fire(EVENT_CALL_SERVICE, event_data)
+            return
 
-            @callback
-            def service_executed(event):
-                """Callback method that is called when service is executed."""
-                if event.data[ATTR_SERVICE_CALL_ID] == call_id:
-                    fut.set_result(True)
+        fut = asyncio.Future(loop=self._loop)
+        self._pending_calls[call_id] = fut
 
-            unsub = self._bus.async_listen(EVENT_SERVICE_EXECUTED,
-                                           service_executed)
+        # Services executed by a remote instance report back via the bus.
+        if self._async_unsub_executed_event is None:
+            self._async_unsub_executed_event = self._bus.async_listen(
+                EVENT_SERVICE_EXECUTED, self._async_service_executed_event)
 
         self._bus.async_fire(EVENT_CALL_SERVICE, event_data)
 
-        if blocking:
+        try:
             done, _ = yield from asyncio.wait([fut], loop=self._loop,
                                               timeout=SERVICE_CALL_LIMIT)
-            success = bool(done)
-            unsub()
-            return success
+        finally:
+            self._pending_calls.pop(call_id, None)
+
+        if not done:
+            return False
+
+        # Raises the exception of the service, if any
+        return fut.result()
+
+    @callback
+    def _async_service_executed(self, call_id, exception=None,
+                                success=True, remote=False):
+        """Resolve the pending blocking call with call_id.
+
+        If the call was made by a remote instance, a SERVICE_EXECUTED event
+        is fired so that instance can resolve it. Local calls nobody waits
+        for are not reported.
+
+        This method must be run in the event loop.
+        """
+        if not call_id:
+            return
+
+        fut = self._pending_calls.pop(call_id, None)
+
+        if fut is None:
+            if remote:
+                self._bus.async_fire(
+                    EVENT_SERVICE_EXECUTED, {ATTR_SERVICE_CALL_ID: call_id})
+        elif fut.done():
+            pass
+        elif exception is not None:
+            fut.set_exception(exception)
+        else:
+            fut.set_result(success)
+
+    @callback
+    def _async_service_executed_event(self, event):
+        """Resolve a pending blocking call executed by a remote instance."""
+        fut = self._pending_calls.pop(
+            event.data.get(ATTR_SERVICE_CALL_ID), None)
+
+        if fut is not None and not fut.done():
+            fut.set_result(True)
 
     @asyncio.coroutine
     def _event_to_service_call(self, event):
@@ -1035,6 +1285,7 @@ class ServiceRegistry(object):
         domain = event.data.get(ATTR_DOMAIN).lower()
         service = event.data.get(ATTR_SERVICE).lower()
         call_id = event.data.get(ATTR_SERVICE_CALL_ID)
+        remote = event.origin == EventOrigin.remote
 
         if not self.has_service(domain, service):
             if event.origin == EventOrigin.local:
@@ -1044,41 +1295,44 @@ class ServiceRegistry(object):
 
         service_handler = self._services[domain][service]
 
-        def fire_service_executed():
-            """Fire service executed event."""
-            if not call_id:
-                return
-
-            data = {ATTR_SERVICE_CALL_ID: call_id}
-
-            if (service_handler.is_coroutinefunction or
-                    service_handler.is_callback):
-                self._bus.async_fire(EVENT_SERVICE_EXECUTED, data)
-            else:
-                self._bus.fire(EVENT_SERVICE_EXECUTED, data)
-
         try:
             if service_handler.schema:
                 service_data = service_handler.schema(service_data)
         except vol.Invalid as ex:
             _LOGGER.error('Invalid service data for %s.%s: %s',
                           domain, service, humanize_error(service_data, ex))
-            fire_service_executed()
+            self._async_service_executed(
+                call_id, success=False, remote=remote)
             return
 
         service_call = ServiceCall(domain, service, service_data, call_id)
 
-        if service_handler.is_callback:
-            service_handler.func(service_call)
-            fire_service_executed()
-        elif service_handler.is_coroutinefunction:
-            yield from service_handler.func(service_call)
-            fire_service_executed()
+        if service_handler.is_callback or \
+                service_handler.is_coroutinefunction:
+            try:
+                if service_handler.is_callback:
+                    service_handler.func(service_call)
+                else:
+                    yield from service_handler.func(service_call)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._async_service_executed(call_id, exc, remote=remote)
+                raise
+
+            self._async_service_executed(call_id, remote=remote)
         else:
             def execute_service():
-                """Execute a service and fires a SERVICE_EXECUTED event."""
-                service_handler.func(service_call)
-                fire_service_executed()
+                """Execute a service and resolve the call when done."""
+                try:
+                    service_handler.func(service_call)
+                except Exception as exc:  # pylint: disable=broad-except
+                    self._loop.call_soon_threadsafe(
+                        self._async_service_executed, call_id, exc, True,
+                        remote)
+                    raise
+
+                self._loop.call_soon_threadsafe(
+                    self._async_service_executed, call_id, None, True,
+                    remote)
 
             self._add_job(execute_service, priority=JobPriority.EVENT_SERVICE)
 
@@ -1149,6 +1403,20 @@ class Config(object):
         }
 
 
+@callback
+def _async_set_result(fut, result):
+    """Set the result of a future unless it was cancelled."""
+    if not fut.done():
+        fut.set_result(result)
+
+
+@callback
+def _async_set_exception(fut, exc):
+    """Set the exception of a future unless it was cancelled."""
+    if not fut.done():
+        fut.set_exception(exc)
+
+
 def _async_create_timer(hass, interval=TIMER_INTERVAL):
     """Create a timer that will start on HOMEASSISTANT_START."""
     stop_event = asyncio.Event(loop=hass.loop)
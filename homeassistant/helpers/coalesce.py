@@ -0,0 +1,186 @@
+"""Coalesce frequent state writes of an entity.
+
+High-frequency sensors can be configured via customize to limit how often
+their state is written to the state machine:
+
+homeassistant:
+  customize:
+    sensor.power_meter:
+      coalesce:
+        window: 5
+        aggregate: mean
+        deadband: 2.5
+    # Apply to all entities of a domain
+    binary_sensor:
+      coalesce:
+        window: 1
+"""
+from datetime import timedelta
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_point_in_utc_time
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_COALESCE = 'coalesce'
+CONF_WINDOW = 'window'
+CONF_AGGREGATE = 'aggregate'
+CONF_DEADBAND = 'deadband'
+
+AGGREGATE_LATEST = 'latest'
+AGGREGATE_MIN = 'min'
+AGGREGATE_MAX = 'max'
+AGGREGATE_MEAN = 'mean'
+
+AGGREGATES = [AGGREGATE_LATEST, AGGREGATE_MIN, AGGREGATE_MAX, AGGREGATE_MEAN]
+
+DEFAULT_WINDOW = timedelta(seconds=1)
+
+COALESCE_SCHEMA = vol.Schema({
+    vol.Optional(CONF_WINDOW, default=DEFAULT_WINDOW):
+        vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_AGGREGATE, default=AGGREGATE_LATEST):
+        vol.In(AGGREGATES),
+    vol.Optional(CONF_DEADBAND): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+
+def _as_number(value):
+    """Return value as a float or None if it is not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class StateCoalescer(object):
+    """Rate limit the state writes of a single entity.
+
+    The first write after a quiet window is passed through directly. Writes
+    within the window are buffered and written as one state at the end of
+    the window, either the latest value or the min, max or mean of the
+    numeric values seen. Numeric values within the deadband of the last
+    written value are dropped. Non-numeric states are never aggregated.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, hass, entity_id, config):
+        """Initialize the coalescer."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.config = config
+        self._window = config[CONF_WINDOW]
+        self._aggregate = config[CONF_AGGREGATE]
+        self._deadband = config.get(CONF_DEADBAND)
+        self._last_write = None
+        self._last_value = None
+        self._async_unsub_flush = None
+        self._pending = None
+        self._samples = []
+        self.writes = 0
+        self.skipped = 0
+
+    @callback
+    def async_set(self, state, attributes, force_update=False):
+        """Set the state of the entity, coalescing frequent writes.
+
+        This method must be run in the event loop.
+        """
+        value = _as_number(state)
+
+        if value is None:
+            # Never hold back changes like unavailable.
+            self.async_flush()
+            self._async_write(state, attributes, force_update, value)
+            return
+
+        if self._deadband is not None and self._last_value is not None \
+                and abs(value - self._last_value) < self._deadband \
+                and self._pending is None:
+            cur = self.hass.states.get(self.entity_id)
+            if cur is not None and cur.attributes == attributes:
+                self.skipped += 1
+                return
+
+        now = dt_util.utcnow()
+
+        if self._async_unsub_flush is None and (
+                self._last_write is None or
+                now - self._last_write >= self._window):
+            self._async_write(state, attributes, force_update, value)
+            return
+
+        if self._pending is not None:
+            self.skipped += 1
+
+        self._pending = (state, attributes, force_update)
+        self._samples.append((value, str(state)))
+
+        if self._async_unsub_flush is None:
+            self._async_unsub_flush = async_track_point_in_utc_time(
+                self.hass, self._async_flush_listener,
+                self._last_write + self._window)
+
+    @callback
+    def async_flush(self):
+        """Write the buffered state, if any.
+
+        This method must be run in the event loop.
+        """
+        if self._async_unsub_flush is not None:
+            self._async_unsub_flush()
+            self._async_unsub_flush = None
+
+        if self._pending is None:
+            return
+
+        state, attributes, force_update = self._pending
+        value, state = self._aggregated(state)
+        self._pending = None
+        self._samples = []
+
+        if self._deadband is not None and self._last_value is not None \
+                and abs(value - self._last_value) < self._deadband:
+            self.skipped += 1
+            return
+
+        self._async_write(state, attributes, force_update, value)
+
+    @callback
+    def _async_flush_listener(self, now):
+        """Flush the buffered state at the end of the window."""
+        self._async_unsub_flush = None
+        self.async_flush()
+
+    def _aggregated(self, latest):
+        """Return value and state that represent the buffered samples."""
+        samples = self._samples
+
+        if self._aggregate == AGGREGATE_MIN:
+            return min(samples, key=lambda sample: sample[0])
+
+        if self._aggregate == AGGREGATE_MAX:
+            return max(samples, key=lambda sample: sample[0])
+
+        if self._aggregate == AGGREGATE_MEAN:
+            mean = sum(value for value, _ in samples) / len(samples)
+            # Keep the precision of the samples, plus one digit.
+            decimals = max(len(state.partition('.')[2])
+                           for _, state in samples) + 1
+            mean = round(mean, decimals)
+            return mean, str(mean)
+
+        return samples[-1][0], latest
+
+    def _async_write(self, state, attributes, force_update, value):
+        """Write the state to the state machine."""
+        self._last_write = dt_util.utcnow()
+        self._last_value = value
+        self.writes += 1
+        self.hass.states.async_set(
+            self.entity_id, state, attributes, force_update)
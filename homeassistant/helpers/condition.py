@@ -23,6 +23,18 @@ from homeassistant.util.async import run_callback_threadsafe
 FROM_CONFIG_FORMAT = '{}_from_config'
 ASYNC_FROM_CONFIG_FORMAT = 'async_{}_from_config'
 
+# Relative cost of evaluating a condition. Checks of 'and' and 'or'
+# conditions are ordered cheapest first so they short-circuit early.
+CONDITION_COST = {
+    'state': 0,
+    'time': 1,
+    'zone': 2,
+    'numeric_state': 3,
+    'sun': 4,
+    'template': 5,
+}
+DEFAULT_CONDITION_COST = 6
+
 _LOGGER = logging.getLogger(__name__)
 
 # PyLint does not like the use of _threaded_factory
@@ -70,6 +82,26 @@ def async_from_config(config: ConfigType, config_validation: bool=True):
 from_config = _threaded_factory(async_from_config)
 
 
+def sort_by_cost(configs):
+    """Return condition configs ordered by evaluation cost, cheapest first.
+
+    Async friendly.
+    """
+    return sorted(configs, key=lambda conf: CONDITION_COST.get(
+        conf.get(CONF_CONDITION), DEFAULT_CONDITION_COST))
+
+
+def _flatten_and(configs):
+    """Inline the conditions of nested 'and' conditions."""
+    flat = []
+    for conf in configs:
+        if conf.get(CONF_CONDITION) == 'and':
+            flat.extend(_flatten_and(conf['conditions']))
+        else:
+            flat.append(conf)
+    return flat
+
+
 def async_and_from_config(config: ConfigType, config_validation: bool=True):
     """Create multi condition matcher using 'AND'."""
     if config_validation:
@@ -83,7 +115,7 @@ def async_and_from_config(config: ConfigType, config_validation: bool=True):
 
         if checks is None:
             checks = [async_from_config(entry, False) for entry
-                      in config['conditions']]
+                      in sort_by_cost(_flatten_and(config['conditions']))]
 
         try:
             for check in checks:
@@ -114,7 +146,7 @@ def async_or_from_config(config: ConfigType, config_validation: bool=True):
 
         if checks is None:
             checks = [async_from_config(entry, False) for entry
-                      in config['conditions']]
+                      in sort_by_cost(config['conditions'])]
 
         try:
             for check in checks:
@@ -307,50 +339,62 @@ def async_template_from_config(config, config_validation=True):
 template_from_config = _threaded_factory(async_template_from_config)
 
 
-def time(before=None, after=None, weekday=None):
-    """Test if local time condition matches.
+def _compile_time(before=None, after=None, weekday=None):
+    """Precompute a time condition into a check against a given datetime.
 
     Handle the fact that time is continuous and we may be testing for
     a period that crosses midnight. In that case it is easier to test
     for the opposite. "(23:59 <= now < 00:01)" would be the same as
     "not (00:01 <= now < 23:59)".
     """
-    now = dt_util.now()
-    now_time = now.time()
-
     if after is None:
         after = dt_util.dt.time(0)
     if before is None:
         before = dt_util.dt.time(23, 59, 59, 999999)
 
-    if after < before:
-        if not after <= now_time < before:
-            return False
+    crosses_midnight = not after < before
+
+    if weekday is None:
+        weekdays = None
+    elif isinstance(weekday, str):
+        weekdays = (weekday,)
     else:
-        if before <= now_time < after:
-            return False
+        weekdays = frozenset(weekday)
 
-    if weekday is not None:
-        now_weekday = WEEKDAYS[now.weekday()]
+    def time_check(now):
+        """Test if now matches the time condition."""
+        now_time = now.time()
 
-        if isinstance(weekday, str) and weekday != now_weekday or \
-           now_weekday not in weekday:
+        if crosses_midnight:
+            if before <= now_time < after:
+                return False
+        elif not after <= now_time < before:
             return False
 
-    return True
+        if weekdays is not None and WEEKDAYS[now.weekday()] not in weekdays:
+            return False
+
+        return True
+
+    return time_check
+
+
+def time(before=None, after=None, weekday=None):
+    """Test if local time condition matches."""
+    return _compile_time(before, after, weekday)(dt_util.now())
 
 
 def time_from_config(config, config_validation=True):
     """Wrap action method with time based condition."""
     if config_validation:
         config = cv.TIME_CONDITION_SCHEMA(config)
-    before = config.get(CONF_BEFORE)
-    after = config.get(CONF_AFTER)
-    weekday = config.get(CONF_WEEKDAY)
+    time_check = _compile_time(config.get(CONF_BEFORE),
+                               config.get(CONF_AFTER),
+                               config.get(CONF_WEEKDAY))
 
     def time_if(hass, variables=None):
         """Validate time based if-condition."""
-        return time(before, after, weekday)
+        return time_check(dt_util.now())
 
     return time_if
 
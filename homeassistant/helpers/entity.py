@@ -9,8 +9,9 @@ from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT, DEVICE_DEFAULT_NAME, STATE_OFF, STATE_ON,
     STATE_UNAVAILABLE, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT,
     ATTR_ENTITY_PICTURE)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, split_entity_id
 from homeassistant.exceptions import NoEntitySpecifiedError
+from homeassistant.helpers.coalesce import CONF_COALESCE, StateCoalescer
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe)
@@ -18,6 +19,18 @@ from homeassistant.util.async import (
 # Entity attributes that we will overwrite
 _OVERWRITE = {}  # type: Dict[str, Any]
 
+# State write coalescing per entity id or domain
+_COALESCE = {}  # type: Dict[str, Any]
+
+# Attributes that are derived from rarely changing properties
+_STATIC_ATTRS = (
+    (ATTR_FRIENDLY_NAME, str),
+    (ATTR_ICON, str),
+    (ATTR_ENTITY_PICTURE, str),
+    (ATTR_HIDDEN, bool),
+    (ATTR_ASSUMED_STATE, bool),
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -60,9 +73,21 @@ def set_customize(customize: Dict[str, Any]) -> None:
 
     Async friendly.
     """
-    global _OVERWRITE
+    global _OVERWRITE, _COALESCE
+
+    _OVERWRITE = {}
+    _COALESCE = {}
 
-    _OVERWRITE = {key.lower(): val for key, val in customize.items()}
+    for key, val in customize.items():
+        key = key.lower()
+        val = dict(val)
+        coalesce = val.pop(CONF_COALESCE, None)
+
+        if coalesce is not None:
+            _COALESCE[key] = coalesce
+
+        if val:
+            _OVERWRITE[key] = val
 
 
 class Entity(object):
@@ -77,6 +102,20 @@ class Entity(object):
     # Owning hass instance. Will be set by EntityComponent
     hass = None  # type: Optional[HomeAssistant]
 
+    # Coalesces state writes if configured via customize
+    _coalescer = None  # type: Optional[StateCoalescer]
+
+    # Converted static attributes and the property values they came from
+    _static_attr_cache = None  # type: Optional[tuple]
+
+    # State, volatile attributes and customize overrides of the last write
+    # and the state object it created
+    _last_write = None  # type: Optional[tuple]
+
+    # Number of state writes and of writes skipped because nothing changed
+    _state_writes = 0
+    _state_writes_skipped = 0
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -192,6 +231,11 @@ class Entity(object):
 
         If force_refresh == True will update entity before setting state.
 
+        Nothing is written if the state, state attributes and device state
+        attributes did not change since the last write. Changes of the name,
+        icon, entity picture, hidden or assumed state only show up with the
+        next write that is not skipped.
+
         This method must be run in the event loop.
         """
         if self.hass is None:
@@ -211,28 +255,49 @@ class Entity(object):
                 yield from self.hass.loop.run_in_executor(None, self.update)
 
         state = STATE_UNKNOWN if self.state is None else str(self.state)
-        attr = self.state_attributes or {}
+        volatile_attr = self.state_attributes or {}
 
         device_attr = self.device_state_attributes
 
         if device_attr is not None:
-            attr.update(device_attr)
+            volatile_attr.update(device_attr)
 
         self._attr_setter('unit_of_measurement', str, ATTR_UNIT_OF_MEASUREMENT,
-                          attr)
+                          volatile_attr)
 
         if not self.available:
             state = STATE_UNAVAILABLE
-            attr = {}
+            volatile_attr = {}
+
+        overwrite = _OVERWRITE.get(self.entity_id)
+        coalesce = None
+
+        if _COALESCE:
+            coalesce = _COALESCE.get(self.entity_id) or \
+                _COALESCE.get(split_entity_id(self.entity_id)[0])
+
+        last = self._last_write
+        # Copy the attributes, entities may change their dict in place.
+        written = (state, dict(volatile_attr), overwrite)
+
+        # Skip the write if the state machine still holds the state we wrote
+        # last and neither the state nor the volatile attributes changed.
+        # The static attributes are only read again with the next write.
+        if coalesce is None and last is not None and \
+                not self.force_update and last[0] == state and \
+                last[2] is overwrite and last[1] == volatile_attr and \
+                self.hass.states.get(self.entity_id) is last[3]:
+            self._state_writes_skipped += 1
+            return
+
+        attr = dict(volatile_attr)
 
-        self._attr_setter('name', str, ATTR_FRIENDLY_NAME, attr)
-        self._attr_setter('icon', str, ATTR_ICON, attr)
-        self._attr_setter('entity_picture', str, ATTR_ENTITY_PICTURE, attr)
-        self._attr_setter('hidden', bool, ATTR_HIDDEN, attr)
-        self._attr_setter('assumed_state', bool, ATTR_ASSUMED_STATE, attr)
+        for key, value in self._static_attributes().items():
+            attr.setdefault(key, value)
 
         # Overwrite properties that have been set in the config file.
-        attr.update(_OVERWRITE.get(self.entity_id, {}))
+        if overwrite is not None:
+            attr.update(overwrite)
 
         # Remove hidden property if false so it won't show up.
         if not attr.get(ATTR_HIDDEN, True):
@@ -249,8 +314,22 @@ class Entity(object):
             # Could not convert state to float
             pass
 
-        self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update)
+        if coalesce is None:
+            self.hass.states.async_set(
+                self.entity_id, state, attr, self.force_update)
+            self._state_writes += 1
+            self._last_write = written + (
+                self.hass.states.get(self.entity_id),)
+            return
+
+        if self._coalescer is None or self._coalescer.config is not coalesce \
+                or self._coalescer.entity_id != self.entity_id:
+            if self._coalescer is not None:
+                self._coalescer.async_flush()
+            self._coalescer = StateCoalescer(
+                self.hass, self.entity_id, coalesce)
+
+        self._coalescer.async_set(state, attr, self.force_update)
 
     def remove(self) -> None:
         """Remove entitiy from HASS."""
@@ -264,8 +343,38 @@ class Entity(object):
 
         This method must be run in the event loop.
         """
+        if self._coalescer is not None:
+            self._coalescer.async_flush()
+            self._coalescer = None
+
         self.hass.states.async_remove(self.entity_id)
 
+    def _static_attributes(self):
+        """Return the static attributes.
+
+        The attributes are only converted again when one of the properties
+        they come from changes.
+        """
+        values = (self.name, self.icon, self.entity_picture, self.hidden,
+                  self.assumed_state)
+        cache = self._static_attr_cache
+
+        if cache is None or cache[0] != values:
+            static_attr = {}
+
+            for (attr, typ), value in zip(_STATIC_ATTRS, values):
+                if not value:
+                    continue
+
+                try:
+                    static_attr[attr] = typ(value)
+                except (TypeError, ValueError):
+                    pass
+
+            cache = self._static_attr_cache = (values, static_attr)
+
+        return cache[1]
+
     def _attr_setter(self, name, typ, attr, attrs):
         """Helper method to populate attributes based on properties."""
         if attr in attrs:
@@ -1,5 +1,7 @@
 """Helpers for components that manage entities."""
 import asyncio
+from collections import OrderedDict
+import functools as ft
 
 from homeassistant import config as conf_util
 from homeassistant.bootstrap import (
@@ -7,13 +9,13 @@ from homeassistant.bootstrap import (
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_SCAN_INTERVAL, CONF_ENTITY_NAMESPACE,
     DEVICE_DEFAULT_NAME)
-from homeassistant.core import callback
+from homeassistant.core import callback, JobPriority
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import get_component
 from homeassistant.helpers import config_per_platform, discovery
-from homeassistant.helpers.entity import async_generate_entity_id
 from homeassistant.helpers.event import async_track_utc_time_change
 from homeassistant.helpers.service import extract_entity_ids
+from homeassistant.util import slugify
 from homeassistant.util.async import (
     run_callback_threadsafe, run_coroutine_threadsafe)
 
@@ -38,6 +40,9 @@ class EntityComponent(object):
 
         self.entities = {}
         self.group = None
+        self._entity_platforms = {}
+        self._unique_ids = set()
+        self._entity_id_suffixes = {}
 
         self.config = None
 
@@ -111,6 +116,105 @@ class EntityComponent(object):
                 in extract_entity_ids(self.hass, service)
                 if entity_id in self.entities]
 
+    @asyncio.coroutine
+    def async_call_entity_service(self, entities, method, *args, **kwargs):
+        """Call a method on entities concurrently and refresh their state.
+
+        Entities that implement async_<method> have it called in the event
+        loop, for the others method is run in the worker pool. Platforms can
+        limit how many of their entities are called at once by defining
+        PARALLEL_UPDATES. Polled entities are updated once their command is
+        done.
+
+        Platforms that define async_<method>_many or <method>_many are
+        called once with all their targeted entities instead, so they can
+        send a single request to a hub for all of them. The batch method
+        can return the entities it did not handle, which are then called
+        one by one.
+
+        This method must be run in the event loop.
+        """
+        tasks = []
+        batches = OrderedDict()
+
+        for entity in entities:
+            platform = self._entity_platforms.get(entity.entity_id)
+
+            if platform is not None and platform.has_batch_method(method):
+                batches.setdefault(platform, []).append(entity)
+            else:
+                tasks.append(_async_run_limited(
+                    platform, self._async_call_entity(
+                        entity, method, args, kwargs)))
+
+        for platform, batch in batches.items():
+            tasks.append(self._async_call_batch(
+                platform, batch, method, args, kwargs))
+
+        if tasks:
+            yield from asyncio.gather(*tasks, loop=self.hass.loop)
+
+    @asyncio.coroutine
+    def _async_call_entity(self, entity, method, args, kwargs):
+        """Call a method on an entity and update it if it is polled.
+
+        This method must be run in the event loop.
+        """
+        async_method = getattr(entity, 'async_' + method, None)
+
+        if async_method is not None:
+            yield from async_method(*args, **kwargs)
+        else:
+            yield from self.hass.async_add_pool_job(
+                ft.partial(getattr(entity, method), *args, **kwargs),
+                priority=JobPriority.EVENT_SERVICE)
+
+        yield from self._async_update_polled(entity)
+
+    @asyncio.coroutine
+    def _async_call_batch(self, platform, entities, method, args, kwargs):
+        """Call the batch method of a platform and update polled entities.
+
+        This method must be run in the event loop.
+        """
+        module = platform.platform
+        async_method = getattr(module, 'async_{}_many'.format(method), None)
+
+        if async_method is not None:
+            remaining = yield from async_method(entities, *args, **kwargs)
+        else:
+            remaining = yield from self.hass.async_add_pool_job(
+                ft.partial(getattr(module, '{}_many'.format(method)),
+                           entities, *args, **kwargs),
+                priority=JobPriority.EVENT_SERVICE)
+
+        remaining = remaining or []
+        tasks = [
+            _async_run_limited(platform, self._async_update_polled(entity))
+            for entity in entities if entity not in remaining]
+        tasks.extend(
+            _async_run_limited(platform, self._async_call_entity(
+                entity, method, args, kwargs))
+            for entity in remaining)
+
+        yield from asyncio.gather(*tasks, loop=self.hass.loop)
+
+    @asyncio.coroutine
+    def _async_update_polled(self, entity):
+        """Update the state of an entity if it is polled.
+
+        This method must be run in the event loop.
+        """
+        if not entity.should_poll:
+            return
+
+        if hasattr(entity, 'async_update'):
+            yield from entity.async_update_ha_state(True)
+        else:
+            yield from self.hass.async_add_pool_job(
+                entity.update, priority=JobPriority.EVENT_SERVICE)
+            yield from entity.async_update_ha_state()
+
     @asyncio.coroutine
     def _async_setup_platform(self, platform_type, platform_config,
                               discovery_info=None):
@@ -133,8 +237,8 @@ class EntityComponent(object):
         key = (platform_type, scan_interval, entity_namespace)
 
         if key not in self._platforms:
-            self._platforms[key] = EntityPlatform(self, scan_interval,
-                                                  entity_namespace)
+            self._platforms[key] = EntityPlatform(
+                self, scan_interval, entity_namespace, platform)
         entity_platform = self._platforms[key]
 
         try:
@@ -168,7 +272,7 @@ class EntityComponent(object):
 
         This method must be run in the event loop.
         """
-        if entity is None or entity in self.entities.values():
+        if entity is None or entity.unique_id in self._unique_ids:
             return False
 
         entity.hass = self.hass
@@ -187,15 +291,40 @@ class EntityComponent(object):
                 object_id = '{} {}'.format(platform.entity_namespace,
                                            object_id)
 
-            entity.entity_id = async_generate_entity_id(
-                self.entity_id_format, object_id,
-                self.entities.keys())
+            entity.entity_id = self._async_unique_entity_id(object_id)
 
         self.entities[entity.entity_id] = entity
+        self._unique_ids.add(entity.unique_id)
+
+        if platform is not None:
+            self._entity_platforms[entity.entity_id] = platform
+
         yield from entity.async_update_ha_state()
 
         return True
 
+    @callback
+    def _async_unique_entity_id(self, object_id):
+        """Generate an entity id for object_id that is not in use.
+
+        Like async_generate_entity_id, but the last suffix given out for an
+        id is remembered, so adding many entities with the same name does not
+        try all earlier suffixes again.
+
+        This method must be run in the event loop.
+        """
+        preferred = self.entity_id_format.format(slugify(object_id.lower()))
+        tries = self._entity_id_suffixes.get(preferred, 1)
+        entity_id = preferred if tries == 1 else \
+            '{}_{}'.format(preferred, tries)
+
+        while entity_id in self.entities:
+            tries += 1
+            entity_id = '{}_{}'.format(preferred, tries)
+
+        self._entity_id_suffixes[preferred] = tries
+        return entity_id
+
     def update_group(self):
         """Set up and/or update component group."""
         run_callback_threadsafe(
@@ -236,6 +365,9 @@ class EntityComponent(object):
             'core': self._platforms['core']
         }
         self.entities = {}
+        self._entity_platforms = {}
+        self._unique_ids = set()
+        self._entity_id_suffixes = {}
         self.config = None
 
         if self.group is not None:
@@ -274,14 +406,27 @@ class EntityPlatform(object):
     """Keep track of entities for a single platform and stay in loop."""
 
     # pylint: disable=too-few-public-methods
-    def __init__(self, component, scan_interval, entity_namespace):
+    def __init__(self, component, scan_interval, entity_namespace,
+                 platform=None):
         """Initalize the entity platform."""
         self.component = component
         self.scan_interval = scan_interval
         self.entity_namespace = entity_namespace
+        self.platform = platform
+        self.parallel_updates = None
+        parallel_updates = getattr(platform, 'PARALLEL_UPDATES', None)
+        if parallel_updates:
+            self.parallel_updates = asyncio.Semaphore(
+                parallel_updates, loop=component.hass.loop)
         self.platform_entities = []
         self._async_unsub_polling = None
 
+    def has_batch_method(self, method):
+        """Return if the platform handles method for many entities at once."""
+        return self.platform is not None and (
+            hasattr(self.platform, 'async_{}_many'.format(method)) or
+            hasattr(self.platform, '{}_many'.format(method)))
+
     def add_entities(self, new_entities, update_before_add=False):
         """Add entities for a single platform."""
         run_coroutine_threadsafe(
@@ -344,3 +489,13 @@ class EntityPlatform(object):
                 self.component.hass.loop.create_task(
                     entity.async_update_ha_state(True)
                 )
+
+
+@asyncio.coroutine
+def _async_run_limited(platform, coro):
+    """Run coro within the concurrency limit of platform."""
+    if platform is None or platform.parallel_updates is None:
+        return (yield from coro)
+
+    with (yield from platform.parallel_updates):
+        return (yield from coro)
@@ -0,0 +1,357 @@
+"""Export state changes to external services.
+
+Components that forward state changes to a service subclass StateExporter.
+An exporter converts the state changes that pass its entity filter into
+items, queues them and sends them in batches. Batches that can not be sent
+are retried with an exponential backoff. Blocking client libraries are only
+called from the worker pool and HTTP services are posted to with the shared
+aiohttp session of Home Assistant. When Home Assistant stops, the whole
+queue is sent from the worker pool.
+
+The exporters of a Home Assistant instance and their metrics are available
+in hass.data[DATA_EXPORTERS], keyed by name.
+"""
+import asyncio
+from collections import deque
+from datetime import timedelta
+import logging
+from timeit import default_timer as timer
+
+import aiohttp
+import async_timeout
+import voluptuous as vol
+
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED)
+from homeassistant.core import callback, split_entity_id
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_point_in_utc_time
+import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_coroutine_threadsafe
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_EXCLUDE = 'exclude'
+CONF_INCLUDE = 'include'
+CONF_ENTITIES = 'entities'
+CONF_DOMAINS = 'domains'
+
+DATA_EXPORTERS = 'exporters'
+
+FILTER_LIST_SCHEMA = vol.Schema({
+    vol.Optional(CONF_ENTITIES, default=[]): cv.entity_ids,
+    vol.Optional(CONF_DOMAINS, default=[]):
+        vol.All(cv.ensure_list, [cv.string]),
+})
+
+
+class ExportError(HomeAssistantError):
+    """Error to indicate that a batch could not be exported."""
+
+    pass
+
+
+class ExportRejected(ExportError):
+    """Error to indicate that a batch was rejected and must not be retried."""
+
+    pass
+
+
+class EntityFilter(object):
+    """Decide which entities are exported.
+
+    Excluded entities are never exported and included entities always are.
+    Otherwise entities of excluded domains are not exported and, if anything
+    is included, only entities of included domains are.
+    """
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, include_entities=(), include_domains=(),
+                 exclude_entities=(), exclude_domains=()):
+        """Initialize the filter."""
+        self.include_entities = frozenset(include_entities)
+        self.include_domains = frozenset(include_domains)
+        self.exclude_entities = frozenset(exclude_entities)
+        self.exclude_domains = frozenset(exclude_domains)
+        self._include_all = not (self.include_entities or
+                                 self.include_domains)
+
+    @classmethod
+    def from_config(cls, config, include_entities=()):
+        """Create a filter from the include and exclude config.
+
+        Entities of an older whitelist option can be passed in as
+        include_entities.
+        """
+        include = config.get(CONF_INCLUDE, {})
+        exclude = config.get(CONF_EXCLUDE, {})
+        return cls(
+            list(include_entities) + include.get(CONF_ENTITIES, []),
+            include.get(CONF_DOMAINS, []),
+            exclude.get(CONF_ENTITIES, []), exclude.get(CONF_DOMAINS, []))
+
+    def __call__(self, entity_id):
+        """Return True if the entity should be exported."""
+        if entity_id in self.exclude_entities:
+            return False
+
+        if entity_id in self.include_entities:
+            return True
+
+        domain = split_entity_id(entity_id)[0]
+
+        if domain in self.exclude_domains:
+            return False
+
+        return self._include_all or domain in self.include_domains
+
+
+class StateExporter(object):
+    """Base class to export state changes in batches.
+
+    A batch is sent once batch_size items are queued or flush_interval after
+    the first item was queued. Only one batch is sent at a time; items that
+    arrive meanwhile are queued. The queue holds at most max_queue_size
+    items, the oldest are dropped when it is full. Batches that still fail
+    after max_retries are passed to discard, batches that are rejected with
+    ExportRejected are dropped right away.
+
+    Subclasses implement convert and either async_send or, for blocking
+    client libraries, send.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    batch_size = 100
+    max_queue_size = 10000
+    flush_interval = timedelta(seconds=1)
+    max_retries = 3
+    min_backoff = 1
+    max_backoff = 60
+    timeout = 10
+
+    def __init__(self, hass, name, entity_filter=None):
+        """Initialize the exporter."""
+        self.hass = hass
+        self.name = name
+        self.entity_filter = entity_filter or EntityFilter()
+        self.exported = 0
+        self.batches = 0
+        self.errors = 0
+        self.dropped = 0
+        self.send_latency = None
+        self._queue = deque()
+        self._sending = False
+        self._async_unsub_flush = None
+
+        hass.data.setdefault(DATA_EXPORTERS, {})[name] = self
+
+    @property
+    def queue_size(self):
+        """Return the number of items waiting to be sent."""
+        return len(self._queue)
+
+    @property
+    def metrics(self):
+        """Return the throughput and error metrics of the exporter."""
+        return {
+            'exported': self.exported,
+            'batches': self.batches,
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'queue_size': self.queue_size,
+            'send_latency': self.send_latency,
+        }
+
+    def start(self):
+        """Start exporting state changes."""
+        self.hass.bus.listen(EVENT_STATE_CHANGED, self._async_state_changed)
+        self.hass.bus.listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop_listener)
+
+    def convert(self, event, state):
+        """Return the item to export for a new state or None to skip it.
+
+        This method must be run in the event loop.
+        """
+        raise NotImplementedError()
+
+    def send(self, items):
+        """Send a batch of items, raising an exception on failure.
+
+        Runs async_send in the event loop and waits for it by default.
+        This runs in the worker pool.
+        """
+        run_coroutine_threadsafe(
+            self.async_send(items), self.hass.loop).result()
+
+    @asyncio.coroutine
+    def async_send(self, items):
+        """Send a batch of items, raising an exception on failure.
+
+        This method is a coroutine.
+        """
+        yield from self.hass.async_add_pool_job(self.send, items)
+
+    def discard(self, items, exc):
+        """Handle items that could not be sent.
+
+        This runs in the worker pool.
+        """
+        self._drop(items, exc)
+
+    def _drop(self, items, exc):
+        """Count and log items that are dropped."""
+        self.dropped += len(items)
+        _LOGGER.error('%s: dropped %d items: %s', self.name, len(items), exc)
+
+    @asyncio.coroutine
+    def async_post(self, url, **kwargs):
+        """Post to url with the shared session, raise ExportError on failure.
+
+        This method is a coroutine.
+        """
+        try:
+            with async_timeout.timeout(self.timeout, loop=self.hass.loop):
+                response = yield from self.hass.websession.post(
+                    url, **kwargs)
+        except (asyncio.TimeoutError, aiohttp.errors.ClientError) as exc:
+            raise ExportError('Error posting to {}: {}'.format(url, exc))
+
+        try:
+            if response.status != 200:
+                raise ExportError('Error posting to {}: HTTP status {}'.format(
+                    url, response.status))
+        finally:
+            yield from response.release()
+
+    @callback
+    def async_add(self, item):
+        """Queue an item to be sent.
+
+        This method must be run in the event loop.
+        """
+        if len(self._queue) >= self.max_queue_size:
+            self._queue.popleft()
+            self.dropped += 1
+
+        self._queue.append(item)
+
+        if len(self._queue) >= self.batch_size:
+            self.async_flush()
+        elif self._async_unsub_flush is None and not self._sending:
+            self._async_unsub_flush = async_track_point_in_utc_time(
+                self.hass, self._async_flush_listener,
+                dt_util.utcnow() + self.flush_interval)
+
+    @callback
+    def async_flush(self):
+        """Send the queued items unless a batch is being sent.
+
+        This method must be run in the event loop.
+        """
+        if self._async_unsub_flush is not None:
+            self._async_unsub_flush()
+            self._async_unsub_flush = None
+
+        if self._sending or not self._queue:
+            return
+
+        batch = [self._queue.popleft()
+                 for _ in range(min(self.batch_size, len(self._queue)))]
+        self._sending = True
+        self.hass.loop.create_task(self._async_send_batch(batch))
+
+    @callback
+    def _async_state_changed(self, event):
+        """Queue the new state of an entity that passes the filter."""
+        state = event.data.get('new_state')
+
+        if state is None or not self.entity_filter(state.entity_id):
+            return
+
+        item = self.convert(event, state)
+
+        if item is not None:
+            self.async_add(item)
+
+    @callback
+    def _async_flush_listener(self, now):
+        """Send the queued items after the flush interval."""
+        self._async_unsub_flush = None
+        self.async_flush()
+
+    @callback
+    def _async_stop_listener(self, event):
+        """Send all queued items when Home Assistant stops."""
+        if self._async_unsub_flush is not None:
+            self._async_unsub_flush()
+            self._async_unsub_flush = None
+
+        items = list(self._queue)
+        self._queue.clear()
+        self.hass.async_add_pool_job(self._drain, items)
+
+    def _drain(self, items):
+        """Send items in batches and discard them after a failed batch.
+
+        This runs in the worker pool.
+        """
+        for pos in range(0, len(items), self.batch_size):
+            batch = items[pos:pos + self.batch_size]
+
+            try:
+                self.send(batch)
+            except ExportRejected as exc:
+                self.errors += 1
+                self._drop(batch, exc)
+                continue
+            except Exception as exc:  # pylint: disable=broad-except
+                self.errors += 1
+                self.discard(items[pos:], exc)
+                return
+
+            self.exported += len(batch)
+            self.batches += 1
+
+    @asyncio.coroutine
+    def _async_send_batch(self, batch):
+        """Send a batch, retrying with an exponential backoff."""
+        backoff = self.min_backoff
+
+        for attempt in range(self.max_retries + 1):
+            start = timer()
+
+            try:
+                yield from self.async_send(batch)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.errors += 1
+
+                if isinstance(exc, ExportRejected):
+                    self._drop(batch, exc)
+                    break
+
+                if attempt == self.max_retries:
+                    yield from self.hass.async_add_pool_job(
+                        self.discard, batch, exc)
+                    break
+
+                _LOGGER.warning('%s: unable to send %d items, retrying in '
+                                '%ds: %s', self.name, len(batch), backoff, exc)
+                yield from asyncio.sleep(backoff, loop=self.hass.loop)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            self.send_latency = timer() - start
+            self.exported += len(batch)
+            self.batches += 1
+            break
+
+        self._sending = False
+
+        if len(self._queue) >= self.batch_size:
+            self.async_flush()
+        elif self._queue and self._async_unsub_flush is None:
+            self._async_unsub_flush = async_track_point_in_utc_time(
+                self.hass, self._async_flush_listener,
+                dt_util.utcnow() + self.flush_interval)
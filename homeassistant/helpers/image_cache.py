@@ -0,0 +1,117 @@
+"""Cache images that are proxied from devices.
+
+Images are kept in an LRU cache that is bounded by the total size of the
+images and each image expires after the time to live of its entity. Only the
+image of the latest source is kept per entity. Concurrent requests for an
+image that is not cached share a single fetch.
+"""
+import asyncio
+from collections import OrderedDict
+import hashlib
+
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+
+
+class CachedImage(object):
+    """A cached image."""
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ['image', 'etag', 'expires']
+
+    def __init__(self, image, expires):
+        """Initialize a cached image."""
+        self.image = image
+        self.etag = hashlib.md5(image).hexdigest()
+        self.expires = expires
+
+
+class ImageCache(object):
+    """Size bounded LRU cache of images with a time to live per entity."""
+
+    def __init__(self, hass, max_size=DEFAULT_MAX_SIZE):
+        """Initialize the image cache."""
+        self.hass = hass
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sources = {}
+        self._pending = {}
+
+    @asyncio.coroutine
+    def async_get(self, entity_id, source, fetch, ttl):
+        """Return the cached image of entity_id and source or fetch it.
+
+        Fetch is a coroutine function that returns the image or None if the
+        image could not be retrieved. The image is cached for ttl seconds.
+
+        Returns a CachedImage or None if the image could not be fetched.
+
+        This method is a coroutine.
+        """
+        key = (entity_id, source)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if entry.expires > self.hass.loop.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            self._remove(key)
+
+        pending = self._pending.get(key)
+
+        if pending is None:
+            self.misses += 1
+            pending = self._pending[key] = self.hass.loop.create_task(
+                self._async_fetch(key, fetch, ttl))
+
+        # A cancelled request should not cancel the fetch of the others.
+        entry = yield from asyncio.shield(pending, loop=self.hass.loop)
+        return entry
+
+    @asyncio.coroutine
+    def _async_fetch(self, key, fetch, ttl):
+        """Fetch an image and store it in the cache."""
+        try:
+            image = yield from fetch()
+        finally:
+            self._pending.pop(key)
+
+        if image is None:
+            return None
+
+        entry = CachedImage(image, self.hass.loop.time() + ttl)
+
+        if ttl <= 0 or len(image) > self.max_size:
+            return entry
+
+        # Only keep the image of the latest source of an entity.
+        entity_id = key[0]
+        previous = self._sources.get(entity_id)
+
+        if previous is not None:
+            self._remove(previous)
+
+        self._entries[key] = entry
+        self._sources[entity_id] = key
+        self.size += len(image)
+
+        while self.size > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+        return entry
+
+    def _remove(self, key):
+        """Remove an image from the cache."""
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return
+
+        self.size -= len(entry.image)
+
+        if self._sources.get(key[0]) == key:
+            del self._sources[key[0]]
@@ -142,8 +142,13 @@ class Script():
         """
         self.last_action = action.get(CONF_ALIAS, 'call service')
         self._log("Executing step %s" % self.last_action)
-        yield from service.async_call_from_config(
-            self.hass, action, True, variables, validate_config=False)
+        try:
+            yield from service.async_call_from_config(
+                self.hass, action, True, variables, validate_config=False)
+        except Exception as ex:  # pylint: disable=broad-except
+            # The service already logged the error, continue the script
+            _LOGGER.warning("Script %s: Error executing step %s: %s",
+                            self.name, self.last_action, ex)
 
     def _async_fire_event(self, action):
         """Fire an event."""
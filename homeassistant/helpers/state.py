@@ -1,4 +1,5 @@
 """Helpers that help with state related things."""
+import asyncio
 import json
 import logging
 from collections import defaultdict
@@ -33,6 +34,7 @@ from homeassistant.const import (
     STATE_OFF, STATE_ON, STATE_OPEN, STATE_PAUSED, STATE_PLAYING,
     STATE_UNKNOWN, STATE_UNLOCKED)
 from homeassistant.core import State
+from homeassistant.util.async import run_coroutine_threadsafe
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -76,6 +78,13 @@ SERVICE_TO_STATE = {
     SERVICE_CLOSE_COVER: STATE_CLOSED
 }
 
+STATE_TO_SERVICE = {state: service for service, state
+                    in SERVICE_TO_STATE.items()}
+
+# Services that need most attributes first, as they are the most specific.
+_SERVICE_ATTRIBUTES_SORTED = sorted(
+    SERVICE_ATTRIBUTES.items(), key=lambda item: (-len(item[1]), item[0]))
+
 
 # pylint: disable=too-few-public-methods, attribute-defined-outside-init
 class AsyncTrackStates(object):
@@ -112,6 +121,18 @@ def get_changed_since(states, utc_point_in_time):
 
 def reproduce_state(hass, states, blocking=False):
     """Reproduce given state."""
+    return run_coroutine_threadsafe(
+        async_reproduce_state(hass, states, blocking), hass.loop).result()
+
+
+@asyncio.coroutine
+def async_reproduce_state(hass, states, blocking=False):
+    """Reproduce given state.
+
+    All service calls are made concurrently.
+
+    This method must be run in the event loop.
+    """
     if isinstance(states, State):
         states = [states]
 
@@ -129,19 +150,7 @@ def reproduce_state(hass, states, blocking=False):
         else:
             service_domain = state.domain
 
-        domain_services = hass.services.services[service_domain]
-
-        service = None
-        for _service in domain_services.keys():
-            if (_service in SERVICE_ATTRIBUTES and
-                    all(attr in state.attributes
-                        for attr in SERVICE_ATTRIBUTES[_service]) or
-                    _service in SERVICE_TO_STATE and
-                    SERVICE_TO_STATE[_service] == state.state):
-                service = _service
-            if (_service in SERVICE_TO_STATE and
-                    SERVICE_TO_STATE[_service] == state.state):
-                break
+        service = _service_for_state(hass, service_domain, state)
 
         if not service:
             _LOGGER.warning("reproduce_state: Unable to reproduce state %s",
@@ -154,10 +163,35 @@ def reproduce_state(hass, states, blocking=False):
                json.dumps(dict(state.attributes), sort_keys=True))
         to_call[key].append(state.entity_id)
 
+    tasks = []
+
     for (service_domain, service, service_data), entity_ids in to_call.items():
         data = json.loads(service_data)
         data[ATTR_ENTITY_ID] = entity_ids
-        hass.services.call(service_domain, service, data, blocking)
+        tasks.append(hass.services.async_call(
+            service_domain, service, data, blocking))
+
+    if tasks:
+        yield from asyncio.gather(*tasks, loop=hass.loop)
+
+
+def _service_for_state(hass, domain, state):
+    """Return the service of domain that reproduces state, or None.
+
+    A service that leads to the state is preferred over one that sets the
+    attributes of the state.
+    """
+    service = STATE_TO_SERVICE.get(state.state)
+
+    if service is not None and hass.services.has_service(domain, service):
+        return service
+
+    for service, attributes in _SERVICE_ATTRIBUTES_SORTED:
+        if hass.services.has_service(domain, service) and \
+                all(attr in state.attributes for attr in attributes):
+            return service
+
+    return None
 
 
 def state_as_number(state):
@@ -253,8 +253,11 @@ class EventForwarder(object):
     def _event_listener(self, event):
         """Listen and forward all events."""
         with self._lock:
-            # We don't forward time events or, if enabled, non-local events
-            if event.event_type == ha.EVENT_TIME_CHANGED or \
+            # We don't forward time events, bulk state changes (their state
+            # changes are forwarded individually) or, if enabled, non-local
+            # events
+            if event.event_type in (ha.EVENT_TIME_CHANGED,
+                                    ha.EVENT_STATE_CHANGED_BULK) or \
                (self.restrict_origin and event.origin != self.restrict_origin):
                 return
 
@@ -284,6 +287,12 @@ class StateMachine(ha.StateMachine):
         """Call set_state on remote API."""
         set_state(self._api, entity_id, new_state, attributes, force_update)
 
+    def set_many(self, states, force_update=False):
+        """Call set_state on remote API for each state."""
+        for entity_id, new_state, attributes in states:
+            set_state(self._api, entity_id, new_state, attributes,
+                      force_update)
+
     def mirror(self):
         """Discard current data and mirrors the remote state machine."""
         self._states = {state.entity_id: state for state
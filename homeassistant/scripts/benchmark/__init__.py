@@ -0,0 +1,215 @@
+"""Script to run benchmarks."""
+import argparse
+import asyncio
+import logging
+from timeit import default_timer as timer
+import tracemalloc
+from typing import Callable, Dict, List  # NOQA
+
+from homeassistant import core
+from homeassistant.components.sensor.demo import DemoSensor
+from homeassistant.const import TEMP_CELSIUS
+from homeassistant.helpers import condition
+from homeassistant.helpers.entity_component import EntityComponent
+
+BENCHMARKS = {}  # type: Dict[str, Callable]
+
+
+def run(script_args: List) -> int:
+    """Handle benchmark commandline script."""
+    # Disable logging
+    logging.getLogger('homeassistant.core').setLevel(logging.CRITICAL)
+
+    parser = argparse.ArgumentParser(
+        description=("Run a Home Assistant benchmark."))
+    parser.add_argument('name', choices=sorted(BENCHMARKS))
+    parser.add_argument(
+        '-n', '--runs', type=int, default=1,
+        help="Number of times to run the benchmark")
+
+    args = parser.parse_args(script_args)
+
+    bench = BENCHMARKS[args.name]
+
+    print('Using event loop:', asyncio.get_event_loop_policy().__module__)
+
+    for _ in range(args.runs):
+        loop = asyncio.new_event_loop()
+        hass = core.HomeAssistant(loop)
+        result = loop.run_until_complete(bench(hass))
+        print('Benchmark {} done: {}'.format(args.name, result))
+        loop.run_until_complete(hass.async_stop())
+        loop.close()
+
+    return 0
+
+
+def benchmark(func):
+    """Mark a function as a benchmark."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _format_rate(count, runtime, unit):
+    """Format a throughput result."""
+    return '{} {} in {:.3f}s ({:.0f} {}/s)'.format(
+        count, unit, runtime, count / runtime, unit)
+
+
+@benchmark
+@asyncio.coroutine
+def condition_evaluation(hass):
+    """Measure condition evaluation throughput.
+
+    Evaluates a typical automation condition block against the state a
+    high-frequency sensor trigger passes in.
+    """
+    count = 10**5
+    check = condition.async_from_config({
+        'condition': 'and',
+        'conditions': [
+            {
+                'condition': 'template',
+                'value_template':
+                '{{ states.sensor.power.state | float > 5 }}',
+            }, {
+                'condition': 'numeric_state',
+                'entity_id': 'sensor.power',
+                'above': 5,
+                'below': 5000,
+            }, {
+                'condition': 'time',
+                'weekday': ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'],
+            }, {
+                'condition': 'state',
+                'entity_id': 'input_boolean.enabled',
+                'state': 'on',
+            },
+        ]
+    })
+
+    hass.states.async_set('input_boolean.enabled', 'on')
+    hass.states.async_set('sensor.power', 1200)
+    variables = {
+        'trigger': {
+            'platform': 'state',
+            'entity_id': 'sensor.power',
+            'to_state': hass.states.get('sensor.power'),
+        }
+    }
+
+    start = timer()
+    for _ in range(count):
+        check(hass, variables)
+    return _format_rate(count, timer() - start, 'evaluations')
+
+
+@benchmark
+@asyncio.coroutine
+def add_entities(hass):
+    """Measure adding many entities of a single platform.
+
+    All entities share a name, so every one of them needs a suffixed
+    entity id.
+    """
+    count = 10**4
+    component = EntityComponent(
+        logging.getLogger(__name__), 'sensor', hass)
+    entities = [DemoSensor('Outside Temperature', 12, TEMP_CELSIUS, None)
+                for _ in range(count)]
+
+    start = timer()
+    yield from component.async_add_entities(entities)
+    return _format_rate(count, timer() - start, 'entities')
+
+
+@benchmark
+@asyncio.coroutine
+def state_writes(hass):
+    """Measure state writes that only change the state value.
+
+    Reports the throughput of the writes and the memory held by the states
+    of all entities afterwards.
+    """
+    count = 10**5
+    entity_ids = ['sensor.power_{}'.format(i) for i in range(1000)]
+    attributes = {
+        'unit_of_measurement': 'W',
+        'friendly_name': 'Power',
+        'icon': 'mdi:flash',
+    }
+
+    def write(count):
+        """Write count states, cycling through the entities."""
+        for i in range(count):
+            hass.states.async_set(
+                entity_ids[i % len(entity_ids)], i, dict(attributes))
+
+    start = timer()
+    write(count)
+    runtime = timer() - start
+
+    # Replace all states while tracing to see what the new ones hold.
+    tracemalloc.start()
+    write(len(entity_ids))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return '{}, {:.0f} KiB held by {} states'.format(
+        _format_rate(count, runtime, 'writes'), memory / 1024,
+        len(entity_ids))
+
+
+@asyncio.coroutine
+def _fire_events(hass, count, event_types):
+    """Fire count events with a listener on each of the event types."""
+    done = asyncio.Event(loop=hass.loop)
+    handled = 0
+
+    @core.callback
+    def listener(event):
+        """Count the handled events."""
+        nonlocal handled
+        handled += 1
+        if handled == count:
+            done.set()
+
+    for event_type in event_types:
+        hass.bus.async_listen(event_type, listener)
+
+    start = timer()
+    for _ in range(count):
+        hass.bus.async_fire('benchmark_event')
+    yield from done.wait()
+    return _format_rate(count, timer() - start, 'events')
+
+
+@benchmark
+@asyncio.coroutine
+def fire_event(hass):
+    """Measure events per second with a single listener."""
+    return (yield from _fire_events(hass, 10**5, ['benchmark_event']))
+
+
+@benchmark
+@asyncio.coroutine
+def fire_event_many_listeners(hass):
+    """Measure events per second with listeners on other event types.
+
+    Only the listener on the fired event type is called.
+    """
+    event_types = ['other_event_{}'.format(i) for i in range(100)]
+    event_types.append('benchmark_event')
+    return (yield from _fire_events(hass, 10**5, event_types))
+
+
+@benchmark
+@asyncio.coroutine
+def fire_event_no_listeners(hass):
+    """Measure events per second without any listener."""
+    count = 10**5
+
+    start = timer()
+    for _ in range(count):
+        hass.bus.async_fire('benchmark_event')
+    return _format_rate(count, timer() - start, 'events')
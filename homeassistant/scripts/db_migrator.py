@@ -5,14 +5,18 @@ import os.path
 import sqlite3
 import sys
 
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, List
 
 import homeassistant.config as config_util
+from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.util.dt as dt_util
 # pylint: disable=unused-import
 from homeassistant.components.recorder import REQUIREMENTS  # NOQA
 
+# Number of rows that are inserted per transaction in bulk mode
+BULK_CHUNK_SIZE = 10000
+
 
 def ts_to_dt(timestamp: Optional[float]) -> Optional[datetime]:
     """Turn a datetime into an integer for in the DB."""
@@ -47,10 +51,134 @@ def print_progress(iteration: int, total: int, prefix: str='', suffix: str='',
         print("\n")
 
 
+def set_bulk_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Speed up writing to a SQLite database during an import.
+
+    Write ahead logging lets readers continue while rows are inserted and
+    without syncing a crash during the import may corrupt the database.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=OFF')
+    cursor.close()
+
+
+def bulk_copy(conn: sqlite3.Connection, engine: Any, table: Any,
+              convert: Callable[[tuple], Dict[str, Any]],
+              chunk_size: int=BULK_CHUNK_SIZE) -> int:
+    """Copy the rows of a table of the old database to the new one.
+
+    Rows are streamed from the old database and inserted with executemany,
+    one transaction per chunk_size rows. Returns the number of copied rows.
+    """
+    c = conn.cursor()
+    c.execute("SELECT count(*) FROM {}".format(table.name))
+    num_rows = c.fetchone()[0]
+    print("Converting {} {}".format(num_rows, table.name))
+
+    c.execute("SELECT * FROM {}".format(table.name))
+    n = 0
+    rows = c.fetchmany(chunk_size)
+    while rows:
+        with engine.begin() as dst:
+            dst.execute(table.insert(), [convert(row) for row in rows])
+        n += len(rows)
+        print_progress(n, num_rows)
+        rows = c.fetchmany(chunk_size)
+    c.close()
+    return n
+
+
+def bulk_import(conn: sqlite3.Connection, engine: Any,
+                chunk_size: int=BULK_CHUNK_SIZE) -> None:
+    """Copy an old format database into a new format one in bulk.
+
+    Instead of keeping a mapping of all event ids, the ids of the imported
+    events are offset by the highest event id in the new database.
+    """
+    # pylint: disable=invalid-name
+    from sqlalchemy import func, select, text
+    from homeassistant.components.recorder import models
+
+    with engine.begin() as dst:
+        offset = dst.scalar(select([func.max(models.Events.event_id)])) or 0
+
+    def remap(event_id: Optional[int]) -> Optional[int]:
+        """Return the event id in the new database."""
+        return None if event_id is None else event_id + offset
+
+    bulk_copy(conn, engine, models.RecorderRuns.__table__, lambda row: {
+        'start': ts_to_dt(row[1]),
+        'end': ts_to_dt(row[2]),
+        'closed_incorrect': row[3],
+        'created': ts_to_dt(row[4]),
+    }, chunk_size)
+
+    bulk_copy(conn, engine, models.Events.__table__, lambda row: {
+        'event_id': remap(row[0]),
+        'event_type': row[1],
+        'event_data': row[2],
+        'origin': row[3],
+        'created': ts_to_dt(row[4]),
+        'time_fired': ts_to_dt(row[5]),
+    }, chunk_size)
+
+    bulk_copy(conn, engine, models.States.__table__, lambda row: {
+        'entity_id': row[1],
+        'state': row[2],
+        'attributes': row[3],
+        'last_changed': ts_to_dt(row[4]),
+        'last_updated': ts_to_dt(row[5]),
+        'event_id': remap(row[6]),
+        'domain': row[7],
+    }, chunk_size)
+
+    # Inserting explicit ids does not advance the sequence of PostgreSQL
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as dst:
+            dst.execute(text(
+                "SELECT setval(pg_get_serial_sequence('events', 'event_id'), "
+                "(SELECT max(event_id) FROM events))"))
+
+
+def downsample(engine: Any, keep_days: int) -> int:
+    """Remove states older than keep_days that history does not show.
+
+    Older states are only kept if the state changed or if they belong to a
+    significant domain. The state_changed events of removed states are
+    removed as well. Returns the number of removed states.
+    """
+    from sqlalchemy import select
+    from homeassistant.components.history import SIGNIFICANT_DOMAINS
+    from homeassistant.components.recorder import models
+
+    states = models.States.__table__
+    events = models.Events.__table__
+    purge_before = dt_util.utcnow() - timedelta(days=keep_days)
+
+    print("Removing insignificant states older than {} days".format(
+        keep_days))
+
+    with engine.begin() as dst:
+        removed = dst.execute(states.delete().where(
+            (states.c.last_updated < purge_before) &
+            (states.c.last_changed != states.c.last_updated) &
+            ~states.c.domain.in_(SIGNIFICANT_DOMAINS))).rowcount
+
+        dst.execute(events.delete().where(
+            (events.c.event_type == EVENT_STATE_CHANGED) &
+            (events.c.time_fired < purge_before) &
+            ~events.c.event_id.in_(select([states.c.event_id]).where(
+                states.c.event_id.isnot(None)))))
+
+    print("Removed {} states".format(removed))
+    return removed
+
+
 def run(script_args: List) -> int:
     """The actual script body."""
     # pylint: disable=too-many-locals,invalid-name,too-many-statements
-    from sqlalchemy import create_engine
+    from sqlalchemy import create_engine, event
     from sqlalchemy.orm import sessionmaker
     from homeassistant.components.recorder import models
 
@@ -71,6 +199,17 @@ def run(script_args: List) -> int:
         type=str,
         help="Connect to URI and import (implies --append)"
              "eg: mysql://localhost/homeassistant")
+    parser.add_argument(
+        '-b', '--bulk',
+        action='store_true',
+        default=False,
+        help="Insert rows in bulk, much faster for large databases")
+    parser.add_argument(
+        '--keep-days',
+        type=int,
+        metavar='days',
+        help="Only keep significant states older than the given number "
+             "of days")
     parser.add_argument(
         '--script',
         choices=['db_migrator'])
@@ -96,15 +235,25 @@ def run(script_args: List) -> int:
     if not args.uri and (os.path.exists(dst_db) and not args.append):
         print("Fatal Error: New format database '{}' exists already - "
               "Remove it or use --append".format(dst_db))
-        print("Note: --append must maintain an ID mapping and is much slower"
-              "and requires sufficient memory to track all event IDs")
+        print("Note: --append must maintain an ID mapping and is much slower "
+              "and requires sufficient memory to track all event IDs, "
+              "unless --bulk is used")
         return 1
 
     conn = sqlite3.connect(src_db)
     uri = args.uri or "sqlite:///{}".format(dst_db)
 
     engine = create_engine(uri, echo=False)
+    if args.bulk and engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', set_bulk_pragmas)
     models.Base.metadata.create_all(engine)
+
+    if args.bulk:
+        bulk_import(conn, engine)
+        if args.keep_days is not None:
+            downsample(engine, args.keep_days)
+        return 0
+
     session_factory = sessionmaker(bind=engine)
     session = session_factory()
 
@@ -188,4 +337,7 @@ def run(script_args: List) -> int:
     print_progress(n, num_rows)
     session.commit()
     c.close()
+
+    if args.keep_days is not None:
+        downsample(engine, args.keep_days)
     return 0
@@ -1,5 +1,5 @@
 """Helper methods for various modules."""
-from collections.abc import MutableSet
+from collections.abc import MutableSet, Set
 from itertools import chain
 import threading
 import queue
@@ -70,7 +70,12 @@ def ensure_unique_string(preferred_string: str, current_strings:
     If preferred string exists will append _2, _3, ..
     """
     test_string = preferred_string
-    current_strings_set = set(current_strings)
+
+    # Sets and dict key views can be tested for membership directly.
+    if isinstance(current_strings, Set):
+        current_strings_set = current_strings
+    else:
+        current_strings_set = set(current_strings)
 
     tries = 1
 
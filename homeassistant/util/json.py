@@ -0,0 +1,136 @@
+"""JSON serialization of Home Assistant objects.
+
+Data that only holds native JSON types is encoded by the fastest available
+backend: ujson if it is installed, otherwise the json module of the
+standard library. Objects with an as_json method, like states and events,
+are embedded as the JSON they return, which they cache. Other objects are
+converted like remote.JSONEncoder does.
+
+All output has sorted keys and no whitespace between items.
+"""
+from collections import OrderedDict
+from datetime import datetime
+import json
+import logging
+from types import MappingProxyType
+
+_LOGGER = logging.getLogger(__name__)
+
+_NATIVE_SCALARS = (str, int, float, bool, type(None))
+
+
+def _ujson_backend():
+    """Return the dumps function of ujson."""
+    import ujson
+
+    def dumps(obj):
+        """Encode native data with ujson."""
+        return ujson.dumps(obj, sort_keys=True, escape_forward_slashes=False,
+                           double_precision=15)
+
+    return dumps
+
+
+def _json_backend():
+    """Return the dumps function of the standard library."""
+    return json.JSONEncoder(sort_keys=True, separators=(',', ':')).encode
+
+
+# Backends in order of preference
+BACKENDS = OrderedDict([
+    ('ujson', _ujson_backend),
+    ('json', _json_backend),
+])
+
+_backend = None  # type: str
+_native_dumps = None
+
+
+def set_backend(name=None):
+    """Set the backend that encodes native data.
+
+    Without a name the first available backend is used. Raises ImportError
+    if the backend is not available.
+    """
+    global _backend, _native_dumps  # pylint: disable=global-statement
+
+    if name is not None:
+        _native_dumps = BACKENDS[name]()
+        _backend = name
+        return
+
+    for backend in BACKENDS:
+        try:
+            set_backend(backend)
+            break
+        except ImportError:
+            continue
+
+    _LOGGER.debug('Encoding JSON with %s', _backend)
+
+
+def get_backend():
+    """Return the name of the backend that encodes native data."""
+    return _backend
+
+
+def to_native(obj):
+    """Convert an object that JSON does not support.
+
+    Raises TypeError if the object can not be converted.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif hasattr(obj, 'as_dict'):
+        return obj.as_dict()
+    elif isinstance(obj, MappingProxyType):
+        return dict(obj)
+
+    try:
+        return list(obj)
+    except TypeError:
+        raise TypeError('{} is not JSON serializable'.format(repr(obj)))
+
+
+_FALLBACK_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(',', ':'), default=to_native)
+
+
+def _is_native(obj):
+    """Return True if obj only holds native JSON types."""
+    if isinstance(obj, _NATIVE_SCALARS):
+        return True
+    elif isinstance(obj, dict):
+        return all(isinstance(key, str) and _is_native(value)
+                   for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        return all(_is_native(item) for item in obj)
+
+    return False
+
+
+def dumps(obj):
+    """Return the JSON representation of obj."""
+    if hasattr(obj, 'as_json'):
+        return obj.as_json()
+
+    if _is_native(obj):
+        try:
+            return _native_dumps(obj)
+        except (OverflowError, ValueError):
+            # ujson can not encode NaN, infinity and integers over 64 bits
+            return _FALLBACK_ENCODER.encode(obj)
+
+    if isinstance(obj, (list, tuple)):
+        return '[{}]'.format(','.join(dumps(item) for item in obj))
+
+    if isinstance(obj, (dict, MappingProxyType)) and \
+            all(isinstance(key, str) for key in obj):
+        return '{{{}}}'.format(','.join(
+            '{}:{}'.format(_native_dumps(key), dumps(obj[key]))
+            for key in sorted(obj)))
+
+    return _FALLBACK_ENCODER.encode(obj)
+
+
+set_backend()
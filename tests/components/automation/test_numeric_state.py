@@ -527,3 +527,56 @@ class TestAutomationNumericState(unittest.TestCase):
         self.hass.block_till_done()
 
         self.assertEqual(2, len(self.calls))
+
+    def test_if_fires_only_crossed_thresholds(self):
+        """"Test only the thresholds that are crossed fire."""
+        self.hass.states.set('test.entity', 0)
+        self.hass.block_till_done()
+
+        assert setup_component(self.hass, automation.DOMAIN, {
+            automation.DOMAIN: [{
+                'trigger': {
+                    'platform': 'numeric_state',
+                    'entity_id': 'test.entity',
+                    'above': low,
+                    'below': low + 10,
+                },
+                'action': {
+                    'service': 'test.automation',
+                    'data_template': {
+                        'above': '{{ trigger.above }}',
+                    },
+                }
+            } for low in (10, 20, 30, 40)]
+        })
+
+        # Going up enters 20 - 30 and leaves everything below it
+        self.hass.states.set('test.entity', 25)
+        self.hass.block_till_done()
+        self.assertEqual(['20.0'],
+                         [call.data['above'] for call in self.calls])
+
+        # Going down enters 10 - 20
+        self.hass.states.set('test.entity', 15)
+        self.hass.block_till_done()
+        self.assertEqual(['20.0', '10.0'],
+                         [call.data['above'] for call in self.calls])
+
+        # Staying within 10 - 20 does not fire again
+        self.hass.states.set('test.entity', 12)
+        self.hass.block_till_done()
+        self.assertEqual(2, len(self.calls))
+
+        # 40 is on the boundary of 30 - 40 and 40 - 50
+        self.hass.states.set('test.entity', 40)
+        self.hass.block_till_done()
+        self.assertEqual(['30.0', '40.0'],
+                         sorted(call.data['above'] for call
+                                in self.calls[2:]))
+
+        # Entity becomes unavailable and comes back within 40 - 50
+        self.hass.states.set('test.entity', 'unavailable')
+        self.hass.states.set('test.entity', 45)
+        self.hass.block_till_done()
+        self.assertEqual(['40.0'],
+                         [call.data['above'] for call in self.calls[4:]])
@@ -32,8 +32,16 @@ def test_fetching_url(aioclient_mock, hass, test_client):
     body = yield from resp.text()
     assert body == 'hello world'
 
+    # Served from the image cache
     resp = yield from client.get('/api/camera_proxy/camera.config_test')
-    assert aioclient_mock.call_count == 2
+    assert aioclient_mock.call_count == 1
+    assert resp.status == 200
+    etag = resp.headers['ETag']
+
+    resp = yield from client.get('/api/camera_proxy/camera.config_test',
+                                 headers={'If-None-Match': etag})
+    assert aioclient_mock.call_count == 1
+    assert resp.status == 304
 
 
 @asyncio.coroutine
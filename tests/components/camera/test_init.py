@@ -0,0 +1,99 @@
+"""The tests for the camera component."""
+import asyncio
+
+from homeassistant.components import camera
+
+
+def test_split_mjpeg_frames():
+    """Test splitting MJPEG data into frames."""
+    frames, rest = camera.split_mjpeg_frames(
+        b'--boundary\r\nContent-Type: image/jpeg\r\n\r\none\r\n'
+        b'--boundary\r\nContent-Type: image/jpeg\r\n\r\ntwo\r\n'
+        b'--boundary\r\nContent-Type: image/jpeg\r\n\r\nthr',
+        b'--boundary')
+    assert frames == [b'one', b'two']
+    assert rest == b'--boundary\r\nContent-Type: image/jpeg\r\n\r\nthr'
+
+    frames, rest = camera.split_mjpeg_frames(b'\r\n--bou', b'--boundary')
+    assert frames == []
+    assert rest == b'\r\n--bou'
+
+
+def test_split_mjpeg_frames_content_length():
+    """Test a frame with an embedded thumbnail is split by its length."""
+    image = b'\xff\xd8\xff\xe1\xff\xd8thumb\xff\xd9image\xff\xd9'
+    frames, rest = camera.split_mjpeg_frames(
+        b'--boundary\r\nContent-Type: image/jpeg\r\n'
+        b'Content-Length: ' + str(len(image)).encode() + b'\r\n\r\n' +
+        image + b'\r\n--boundary\r\nContent-Length: 10\r\n\r\n\xff\xd8',
+        b'--boundary')
+    assert frames == [image]
+    assert rest == b'--boundary\r\nContent-Length: 10\r\n\r\n\xff\xd8'
+
+
+@asyncio.coroutine
+def test_read_mjpeg_frames(hass):
+    """Test frames split over multiple chunks are published once."""
+    chunks = [b'\r\n--myboun', b'dary\r\nContent-Length: 3\r\n\r\non',
+              b'e\r\n--myboundary\r\n', b'\r\ntwo\r\n--myboundary', b'']
+    published = []
+
+    @asyncio.coroutine
+    def read(size):
+        """Return the next chunk."""
+        return chunks.pop(0)
+
+    yield from camera.async_read_mjpeg_frames(read, published.append)
+
+    assert published == [b'one', b'two']
+
+
+@asyncio.coroutine
+def test_stream_hub(hass):
+    """Test viewers share one upstream stream from a ring buffer."""
+    publishers = []
+    closed = []
+
+    @asyncio.coroutine
+    def stream_frames(publish):
+        """Publish frames until cancelled."""
+        publishers.append(publish)
+        try:
+            yield from asyncio.Future(loop=hass.loop)
+        finally:
+            closed.append(publish)
+
+    hub = camera.CameraStreamHub(hass, stream_frames, buffer_size=2)
+    hub.async_add_viewer()
+    hub.async_add_viewer()
+    yield from asyncio.sleep(0, loop=hass.loop)
+    assert len(publishers) == 1
+
+    publish = publishers[0]
+    publish(b'1')
+    assert (yield from hub.async_next_frame()) == (1, b'1')
+
+    for image in (b'2', b'3', b'4'):
+        publish(image)
+
+    # A viewer within the buffer gets the next frame
+    assert (yield from hub.async_next_frame(2)) == (3, b'3')
+    # A slow viewer skips to the newest frame
+    assert (yield from hub.async_next_frame(1)) == (4, b'4')
+
+    waiting = hass.loop.create_task(hub.async_next_frame(4))
+    yield from asyncio.sleep(0, loop=hass.loop)
+    assert not waiting.done()
+
+    publish(b'5')
+    assert (yield from waiting) == (5, b'5')
+
+    hub.async_remove_viewer()
+    yield from asyncio.sleep(0, loop=hass.loop)
+    assert not closed
+
+    hub.async_remove_viewer()
+    for _ in range(3):
+        yield from asyncio.sleep(0, loop=hass.loop)
+    assert closed == [publish]
+    assert (yield from hub.async_next_frame(5)) is None
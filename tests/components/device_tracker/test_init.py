@@ -1,13 +1,16 @@
 """The tests for the device tracker component."""
 # pylint: disable=protected-access,too-many-public-methods
+import asyncio
 import logging
+import threading
 import unittest
-from unittest.mock import call, patch
+from unittest.mock import MagicMock, call, patch
 from datetime import datetime, timedelta
 import os
 
 from homeassistant.bootstrap import setup_component
 from homeassistant.loader import get_component
+from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 from homeassistant.const import (
     ATTR_ENTITY_ID, ATTR_ENTITY_PICTURE, ATTR_FRIENDLY_NAME, ATTR_HIDDEN,
@@ -17,7 +20,7 @@ from homeassistant.exceptions import HomeAssistantError
 
 from tests.common import (
     get_test_home_assistant, fire_time_changed, fire_service_discovered,
-    patch_yaml_files, assert_setup_component)
+    patch_yaml_files, assert_setup_component, mock_coro)
 
 TEST_PLATFORM = {device_tracker.DOMAIN: {CONF_PLATFORM: 'test'}}
 
@@ -147,6 +150,7 @@ class TestComponentsDeviceTracker(unittest.TestCase):
 
         self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN, {
             device_tracker.DOMAIN: {CONF_PLATFORM: 'test'}}))
+        self.hass.block_till_done()
         config = device_tracker.load_config(self.yaml_devices, self.hass,
                                             timedelta(seconds=0))
         assert len(config) == 1
@@ -183,8 +187,77 @@ class TestComponentsDeviceTracker(unittest.TestCase):
                 self.assertTrue(setup_component(
                     self.hass, device_tracker.DOMAIN, TEST_PLATFORM))
                 fire_service_discovered(self.hass, 'test', {})
+                self.hass.block_till_done()
                 self.assertTrue(mock_scan.called)
 
+    def test_scan_metrics(self):
+        """Test the scans of a scanner platform are recorded."""
+        scanner = get_component('device_tracker.test').SCANNER
+        scanner.reset()
+
+        self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN,
+                                        TEST_PLATFORM))
+        self.hass.block_till_done()
+
+        metrics = self.hass.data[device_tracker.DATA_SCAN_METRICS]['test']
+        assert metrics.scans == 1
+        assert metrics.skipped == 0
+        assert metrics.mean_duration == metrics.last_duration
+
+    def test_scan_skipped_while_resolving_names(self):
+        """Test a scan is skipped while the previous one resolves names."""
+        resolving = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def get_device_name(mac):
+            """Block until released."""
+            resolving.set()
+            release.wait(5)
+            return 'name'
+
+        @asyncio.coroutine
+        def async_see(**kwargs):
+            """Record a seen device."""
+            seen.append(kwargs)
+
+        scanner = MagicMock()
+        scanner.scan_devices.return_value = ['AB:CD:EF:GH:IJ']
+        scanner.get_device_name.side_effect = get_device_name
+
+        with patch('homeassistant.components.device_tracker.'
+                   'track_utc_time_change') as mock_track:
+            device_tracker.setup_scanner_platform(
+                self.hass, {}, scanner, async_see, 'slow')
+        scan = mock_track.call_args[0][1]
+
+        assert resolving.wait(5)
+        run_coroutine_threadsafe(scan(None), self.hass.loop).result()
+        release.set()
+        self.hass.block_till_done()
+
+        metrics = self.hass.data[device_tracker.DATA_SCAN_METRICS]['slow']
+        assert metrics.scans == 1
+        assert metrics.skipped == 1
+        assert seen == [{'mac': 'AB:CD:EF:GH:IJ', 'host_name': 'name'}]
+
+    def test_parse_arp_table(self):
+        """Test parsing the ARP cache of the host."""
+        proc_net_arp = (
+            'IP address       HW type     Flags       HW address            '
+            'Mask     Device\n'
+            '192.168.1.1      0x1         0x2         aa:bb:cc:dd:ee:ff     '
+            '*        eth0\n'
+            '192.168.1.2      0x1         0x0         00:00:00:00:00:00     '
+            '*        eth0\n')
+        arp_output = (
+            '? (192.168.1.1) at aa:bb:cc:dd:ee:ff [ether] on eth0\n'
+            '? (192.168.1.2) at <incomplete> on eth0\n')
+
+        expected = {'192.168.1.1': 'AA:BB:CC:DD:EE:FF'}
+        assert device_tracker._parse_proc_net_arp(proc_net_arp) == expected
+        assert device_tracker._parse_arp_output(arp_output) == expected
+
     def test_update_stale(self):
         """Test stalled update."""
         scanner = get_component('device_tracker.test').SCANNER
@@ -201,6 +274,7 @@ class TestComponentsDeviceTracker(unittest.TestCase):
                     CONF_PLATFORM: 'test',
                     device_tracker.CONF_CONSIDER_HOME: 59,
                 }}))
+            self.hass.block_till_done()
 
         self.assertEqual(STATE_HOME,
                          self.hass.states.get('device_tracker.dev1').state)
@@ -215,6 +289,39 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         self.assertEqual(STATE_NOT_HOME,
                          self.hass.states.get('device_tracker.dev1').state)
 
+    def test_update_stale_seen_again(self):
+        """Test a device seen again is only stale after its new deadline."""
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), True, [])
+        start = datetime(2015, 9, 15, 23, tzinfo=dt_util.UTC)
+        entity_id = device_tracker.ENTITY_ID_FORMAT.format('dev1')
+
+        def see_at(seconds):
+            """See the device at seconds after start."""
+            with patch('homeassistant.components.device_tracker.dt_util.'
+                       'utcnow',
+                       return_value=start + timedelta(seconds=seconds)):
+                tracker.see(mac='DEV1')
+                self.hass.block_till_done()
+
+        def time_changed(seconds):
+            """Move time to seconds after start."""
+            now = start + timedelta(seconds=seconds)
+            with patch('homeassistant.components.device_tracker.dt_util.'
+                       'utcnow', return_value=now):
+                fire_time_changed(self.hass, now)
+                self.hass.block_till_done()
+
+        see_at(0)
+        see_at(30)
+
+        time_changed(61)
+        self.assertEqual(STATE_HOME, self.hass.states.get(entity_id).state)
+
+        time_changed(91)
+        self.assertEqual(STATE_NOT_HOME,
+                         self.hass.states.get(entity_id).state)
+
     def test_entity_attributes(self):
         """Test the entity attributes."""
         dev_id = 'test_entity'
@@ -274,9 +381,10 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         self.assertSequenceEqual((entity_id,),
                                  state.attributes.get(ATTR_ENTITY_ID))
 
-    @patch('homeassistant.components.device_tracker.DeviceTracker.see')
+    @patch('homeassistant.components.device_tracker.DeviceTracker.async_see')
     def test_see_service(self, mock_see):
         """Test the see service with a unicode dev_id and NO MAC."""
+        mock_see.side_effect = lambda **kwargs: mock_coro()()
         self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN,
                                         TEST_PLATFORM))
         params = {
@@ -347,12 +455,35 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         tracker.see(mac='mac_1_bad_gps', gps=1)
         tracker.see(mac='mac_2_bad_gps', gps=[1])
         tracker.see(mac='mac_3_bad_gps', gps='gps')
+        self.hass.block_till_done()
         config = device_tracker.load_config(self.yaml_devices, self.hass,
                                             timedelta(seconds=0))
         assert mock_warning.call_count == 3
 
         assert len(config) == 4
 
+    def test_new_devices_written_in_batch(self):
+        """Test devices created at once are written in a single batch."""
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), True, [])
+
+        @asyncio.coroutine
+        def see_devices():
+            """See new devices from within the event loop."""
+            for mac in ('mac_1', 'mac_2', 'mac_3'):
+                yield from tracker.async_see(mac=mac)
+
+        with patch('homeassistant.components.device_tracker.'
+                   'update_config_many',
+                   wraps=device_tracker.update_config_many) as mock_write:
+            run_coroutine_threadsafe(see_devices(), self.hass.loop).result()
+            self.hass.block_till_done()
+
+        assert mock_write.call_count == 1
+        config = device_tracker.load_config(self.yaml_devices, self.hass,
+                                            timedelta(seconds=0))
+        assert len(config) == 3
+
     @patch('homeassistant.components.device_tracker.log_exception')
     def test_config_failure(self, mock_ex):
         """Test that the device tracker see failures."""
@@ -54,7 +54,7 @@ def tearDownModule():   # pylint: disable=invalid-name
 
 
 # Stub out update_config or else Travis CI raises an exception
-@patch('homeassistant.components.device_tracker.update_config')
+@patch('homeassistant.components.device_tracker.update_config_many')
 class TestLocative(unittest.TestCase):
     """Test Locative platform."""
 
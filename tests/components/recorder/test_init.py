@@ -3,13 +3,44 @@
 import json
 from datetime import datetime, timedelta
 import unittest
+from unittest.mock import patch
 
-from homeassistant.const import MATCH_ALL
+import pytest
+
+from homeassistant.const import ATTR_NOW, EVENT_TIME_CHANGED, MATCH_ALL
 from homeassistant.components import recorder
 from homeassistant.bootstrap import setup_component
+import homeassistant.util.dt as dt_util
 from tests.common import get_test_home_assistant
 
 
+def test_cursor():
+    """Test a cursor points after the time and id of a row."""
+    point_in_time = datetime(2016, 11, 5, 12, 30, 15, 123456,
+                             tzinfo=dt_util.UTC)
+    cursor = recorder.encode_cursor(point_in_time, 42)
+
+    assert recorder.decode_cursor(cursor) == (point_in_time, 42)
+    # Naive times from the database are in UTC
+    assert recorder.encode_cursor(
+        point_in_time.replace(tzinfo=None), 42) == cursor
+
+
+def test_get_page():
+    """Test reading the page size and cursor of request parameters."""
+    assert recorder.get_page({}, 100) == (None, None)
+    assert recorder.get_page({'limit': '10'}, 100) == (10, None)
+
+    cursor = recorder.encode_cursor(dt_util.utcnow(), 1)
+    assert recorder.get_page({'cursor': cursor}, 100) == (
+        100, recorder.decode_cursor(cursor))
+
+    for params in ({'limit': '0'}, {'limit': 'a'}, {'cursor': 'a'},
+                   {'cursor': '1-2-3'}):
+        with pytest.raises(ValueError):
+            recorder.get_page(params, 100)
+
+
 class TestRecorder(unittest.TestCase):
     """Test the recorder module."""
 
@@ -103,6 +134,39 @@ class TestRecorder(unittest.TestCase):
         self.assertEqual(1, len(states))
         self.assertEqual(self.hass.states.get(entity_id), states[0])
 
+    def test_saving_statistics(self):
+        """Test numeric states are rolled up once their period passed."""
+        point_in_time = datetime(2016, 11, 5, 12, 1, tzinfo=dt_util.UTC)
+
+        with patch('homeassistant.core.dt_util.utcnow',
+                   return_value=point_in_time):
+            for state in ('10', '30', 'unknown', '20'):
+                self.hass.states.set('sensor.temperature', state)
+
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        statistics = recorder.get_model('Statistics')
+        self.assertEqual(0, recorder.query('Statistics').count())
+
+        self.hass.bus.fire(EVENT_TIME_CHANGED, {
+            ATTR_NOW: point_in_time + timedelta(hours=1)})
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        rows = recorder.execute(
+            recorder.query('Statistics').order_by(statistics.period))
+        self.assertEqual([300, 3600], [row.period for row in rows])
+
+        for row in rows:
+            self.assertEqual('sensor.temperature', row.entity_id)
+            self.assertEqual(
+                (10, 30, 20, 20, 3),
+                (row.min, row.max, row.mean, row.last, row.count))
+
+        self.assertEqual(datetime(2016, 11, 5, 12, 0),
+                         rows[0].start.replace(tzinfo=None))
+
     def test_saving_event(self):
         """Test saving and restoring an event."""
         event_type = 'EVENT_TEST'
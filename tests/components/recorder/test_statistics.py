@@ -0,0 +1,80 @@
+"""The tests for the statistics of the recorder."""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.components.recorder import statistics
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+START = datetime(2016, 11, 5, 12, 0, tzinfo=dt_util.UTC)
+
+
+def _state(value, minutes):
+    """Return a state of a sensor."""
+    point_in_time = START + timedelta(minutes=minutes)
+    return State('sensor.temperature', value, last_updated=point_in_time)
+
+
+def test_period_start():
+    """Test finding the start of a period."""
+    point_in_time = datetime(2016, 11, 5, 12, 34, 56, tzinfo=dt_util.UTC)
+
+    assert statistics.period_start(point_in_time, 300) == \
+        datetime(2016, 11, 5, 12, 30, tzinfo=dt_util.UTC)
+    assert statistics.period_start(point_in_time, 3600) == START
+
+
+def test_numeric_value():
+    """Test only finite numbers are rolled up."""
+    assert statistics.numeric_value(_state('21.5', 0)) == 21.5
+    assert statistics.numeric_value(_state('on', 0)) is None
+    assert statistics.numeric_value(_state('nan', 0)) is None
+    assert statistics.numeric_value(None) is None
+
+
+def test_compiler():
+    """Test states are rolled up per period."""
+    compiler = statistics.StatisticsCompiler()
+
+    assert compiler.add_state(_state('on', 1)) == []
+
+    for value, minutes in (('10', 1), ('30', 2), ('20', 4)):
+        assert compiler.add_state(_state(value, minutes)) == []
+
+    completed = compiler.add_state(_state('40', 6))
+    assert len(completed) == 1
+
+    rollup = completed[0]
+    assert (rollup.period, rollup.start, rollup.end) == \
+        (300, START, START + timedelta(minutes=5))
+    assert (rollup.min, rollup.max, rollup.mean, rollup.last, rollup.count) \
+        == (10, 30, 20, 20, 3)
+
+    assert compiler.compile(START + timedelta(minutes=9)) == []
+
+    completed = compiler.compile(START + timedelta(minutes=10))
+    assert [(rollup.period, rollup.mean) for rollup in completed] == \
+        [(300, 40)]
+
+    completed = compiler.flush()
+    assert [(rollup.period, rollup.mean) for rollup in completed] == \
+        [(3600, 25)]
+    assert compiler.compile(START + timedelta(hours=2)) == []
+
+
+def test_save_merges_previous_rollup():
+    """Test a rollup that started before the compiler is merged."""
+    compiler = statistics.StatisticsCompiler()
+    compiler.started = START + timedelta(minutes=3)
+    rollup = statistics.Rollup('sensor.temperature', 300, START)
+    rollup.add(40)
+
+    row = MagicMock(min=10, max=30, mean=20, last=20, count=3)
+    session = MagicMock()
+    session.query.return_value.filter_by.return_value.first.return_value = row
+
+    compiler.save(session, [rollup])
+
+    assert (row.min, row.max, row.mean, row.last, row.count) == \
+        (10, 40, 25, 40, 4)
+    assert not session.add.called
@@ -1,5 +1,7 @@
 """The tests for the Graphite component."""
+import pickle
 import socket
+import struct
 import unittest
 from unittest import mock
 from unittest.mock import patch
@@ -50,7 +52,8 @@ class TestGraphite(unittest.TestCase):
         self.assertTrue(setup_component(self.hass, graphite.DOMAIN, config))
         self.assertEqual(mock_gf.call_count, 1)
         self.assertEqual(
-            mock_gf.call_args, mock.call(self.hass, 'foo', 123, 'me')
+            mock_gf.call_args,
+            mock.call(self.hass, 'foo', 123, 'me', 'plaintext', 1)
         )
         self.assertEqual(mock_socket.call_count, 1)
         self.assertEqual(
@@ -134,7 +137,9 @@ class TestGraphite(unittest.TestCase):
         state = mock.MagicMock(state=0, attributes=attrs)
         with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
             self.gf._report_attributes('entity', state)
-            actual = mock_send.call_args_list[0][0][0].split('\n')
+            self.gf._flush()
+            actual = mock_send.call_args_list[0][0][0].decode(
+                'ascii').splitlines()
             self.assertEqual(sorted(expected), sorted(actual))
 
     @patch('time.time')
@@ -149,7 +154,9 @@ class TestGraphite(unittest.TestCase):
         state = mock.MagicMock(state='above_horizon', attributes={'foo': 1.0})
         with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
             self.gf._report_attributes('entity', state)
-            actual = mock_send.call_args_list[0][0][0].split('\n')
+            self.gf._flush()
+            actual = mock_send.call_args_list[0][0][0].decode(
+                'ascii').splitlines()
             self.assertEqual(sorted(expected), sorted(actual))
 
     @patch('time.time')
@@ -159,19 +166,36 @@ class TestGraphite(unittest.TestCase):
         state = ha.State('domain.entity', STATE_ON, {'foo': 1.0})
         with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
             self.gf._report_attributes('entity', state)
+            self.gf._flush()
             expected = ['ha.entity.foo 1.000000 12345',
                         'ha.entity.state 1.000000 12345']
-            actual = mock_send.call_args_list[0][0][0].split('\n')
+            actual = mock_send.call_args_list[0][0][0].decode(
+                'ascii').splitlines()
             self.assertEqual(sorted(expected), sorted(actual))
 
         state.state = STATE_OFF
         with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
             self.gf._report_attributes('entity', state)
+            self.gf._flush()
             expected = ['ha.entity.foo 1.000000 12345',
                         'ha.entity.state 0.000000 12345']
-            actual = mock_send.call_args_list[0][0][0].split('\n')
+            actual = mock_send.call_args_list[0][0][0].decode(
+                'ascii').splitlines()
             self.assertEqual(sorted(expected), sorted(actual))
 
+    @patch('time.time')
+    def test_report_non_ascii_attribute(self, mock_time):
+        """Test a metric with a non-ASCII path is dropped."""
+        mock_time.return_value = 12345
+        state = ha.State('domain.entity', STATE_ON, {'t\xe9mp': 1.0})
+        with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
+            self.gf._report_attributes('entity', state)
+            self.gf._flush()
+            self.assertEqual(
+                mock_send.call_args[0][0], b'ha.entity.state 1.000000 12345\n')
+        self.assertEqual(1, self.gf.dropped)
+        self.assertEqual(1, self.gf.last_flush_size)
+
     @patch('time.time')
     def test_send_to_graphite_errors(self, mock_time):
         """Test the sending with errors."""
@@ -180,13 +204,27 @@ class TestGraphite(unittest.TestCase):
         with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
             mock_send.side_effect = socket.error
             self.gf._report_attributes('entity', state)
+            self.gf._flush()
+            self.assertEqual(2, self.gf.dropped)
+
+            # Nothing is sent until the backoff passed
+            mock_send.side_effect = None
+            self.gf._report_attributes('entity', state)
+            self.gf._flush()
+            self.assertEqual(4, self.gf.dropped)
+            self.assertEqual(1, mock_send.call_count)
+
+            mock_time.return_value = 12345 + graphite.MIN_BACKOFF
             mock_send.side_effect = socket.gaierror
             self.gf._report_attributes('entity', state)
+            self.gf._flush()
+            self.assertEqual(6, self.gf.dropped)
 
     @patch('socket.socket')
     def test_send_to_graphite(self, mock_socket):
-        """Test the sending of data."""
-        self.gf._send_to_graphite('foo')
+        """Test the sending of data over a persistent connection."""
+        self.gf._send_to_graphite(b'foo')
+        self.gf._send_to_graphite(b'bar')
         self.assertEqual(mock_socket.call_count, 1)
         self.assertEqual(
             mock_socket.call_args,
@@ -195,14 +233,41 @@ class TestGraphite(unittest.TestCase):
         sock = mock_socket.return_value
         self.assertEqual(sock.connect.call_count, 1)
         self.assertEqual(sock.connect.call_args, mock.call(('foo', 123)))
-        self.assertEqual(sock.sendall.call_count, 1)
         self.assertEqual(
-            sock.sendall.call_args, mock.call('foo'.encode('ascii'))
+            sock.sendall.call_args_list, [mock.call(b'foo'), mock.call(b'bar')]
         )
-        self.assertEqual(sock.send.call_count, 1)
-        self.assertEqual(sock.send.call_args, mock.call('\n'.encode('ascii')))
-        self.assertEqual(sock.close.call_count, 1)
-        self.assertEqual(sock.close.call_args, mock.call())
+        self.assertFalse(sock.close.called)
+
+    @patch('socket.socket')
+    def test_send_to_graphite_reconnects(self, mock_socket):
+        """Test a closed connection is reopened."""
+        self.gf._send_to_graphite(b'foo')
+        sock = mock_socket.return_value
+        sock.sendall.side_effect = [socket.error, None]
+
+        self.gf._send_to_graphite(b'bar')
+        self.assertEqual(sock.connect.call_count, 2)
+        self.assertEqual(sock.sendall.call_count, 3)
+        self.assertEqual(1, self.gf.reconnects)
+
+    @patch('time.time')
+    def test_pickle_protocol(self, mock_time):
+        """Test metrics are sent in a single pickle."""
+        mock_time.return_value = 12345
+        gf = graphite.GraphiteFeeder(self.hass, 'foo', 2004, 'ha', 'pickle')
+        gf._report_attributes(
+            'entity', ha.State('domain.entity', STATE_ON, {'foo': 2}))
+
+        with mock.patch.object(gf, '_send_to_graphite') as mock_send:
+            gf._flush()
+
+        data = mock_send.call_args[0][0]
+        self.assertEqual(struct.unpack('!L', data[:4])[0], len(data) - 4)
+        self.assertEqual(sorted(pickle.loads(data[4:])), [
+            ('ha.entity.foo', (12345, 2.0)),
+            ('ha.entity.state', (12345, 1.0)),
+        ])
+        self.assertEqual(2, gf.last_flush_size)
 
     def test_run_stops(self):
         """Test the stops."""
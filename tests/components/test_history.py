@@ -1,5 +1,6 @@
 """The tests the History component."""
 # pylint: disable=protected-access,too-many-public-methods
+from collections import defaultdict
 from datetime import timedelta
 import unittest
 from unittest.mock import patch, sentinel
@@ -162,6 +163,120 @@ class TestComponentHistory(unittest.TestCase):
             zero, four, filters=history.Filters())
         assert states == hist
 
+    def test_stream_significant_states(self):
+        """Test streamed significant states match the returned ones."""
+        zero, four, states = self.record_states()
+        hist = {
+            entity_states[0].entity_id: entity_states
+            for entity_states in history.stream_significant_states(
+                zero, four, filters=history.Filters())}
+        assert states == hist
+        assert list(hist) == sorted(hist)
+
+    def test_get_significant_states_pages(self):
+        """Test significant states can be read in pages."""
+        zero, four, states = self.record_states()
+        hist = defaultdict(list)
+        cursor = None
+        pages = 0
+
+        while True:
+            page, next_cursor = history.get_significant_states_page(
+                zero, four, filters=history.Filters(), limit=2,
+                cursor=cursor)
+            pages += 1
+
+            for entity_states in page:
+                hist[entity_states[0].entity_id].extend(entity_states)
+
+            if next_cursor is None:
+                break
+
+            cursor = recorder.decode_cursor(next_cursor)
+
+        assert states == hist
+        assert pages > 2
+
+    def test_statistics_period(self):
+        """Test long periods are drawn from coarser statistics."""
+        zero = dt_util.utcnow()
+
+        for days, period in ((1, None), (2, None), (3, 300), (7, 3600),
+                             (365, 3600)):
+            self.assertEqual(period, history.statistics_period(
+                zero, zero + timedelta(days=days)))
+
+    def test_stream_statistics_history(self):
+        """Test numeric entities are drawn from their statistics."""
+        self.init_recorder()
+        sensor = 'sensor.temperature'
+        self.hass.states.set(sensor, '21')
+        self.hass.states.set('switch.test', 'on')
+        self.wait_recording_done()
+
+        zero = history.period_start(dt_util.utcnow(), 300)
+        statistics = recorder.get_model('Statistics')
+        session = recorder.Session()
+
+        for entity_id in (sensor, 'sensor.hidden'):
+            for minutes, mean in ((-5, 20), (0, 21)):
+                session.add(statistics(
+                    domain='sensor', entity_id=entity_id, period=300,
+                    start=zero + timedelta(minutes=minutes), min=mean - 1,
+                    max=mean + 1, mean=mean, last=mean, count=2))
+        session.commit()
+
+        hist = {
+            entity_states[0].entity_id: entity_states
+            for entity_states in history.stream_statistics_history(
+                zero - timedelta(minutes=5), zero + timedelta(minutes=5),
+                300, filters=history.Filters(),
+                attributes={sensor: {'unit_of_measurement': 'C'},
+                            'sensor.hidden': {'hidden': True}})}
+
+        self.assertNotIn('sensor.hidden', hist)
+        self.assertEqual(['switch.test'],
+                         [state.entity_id for state in hist['switch.test']])
+        self.assertEqual(['20.0', '21.0'],
+                         [state.state for state in hist[sensor]])
+        self.assertEqual({'unit_of_measurement': 'C', 'min': 20.0,
+                          'max': 22.0, 'last': 21.0},
+                         hist[sensor][1].attributes)
+        self.assertEqual(zero, hist[sensor][1].last_changed)
+
+    def test_stream_statistics_history_fills_states(self):
+        """Test states fill in the time before and after the statistics."""
+        self.init_recorder()
+        sensor = 'sensor.power'
+        zero = history.period_start(dt_util.utcnow(), 300)
+
+        for minutes, value in ((-25, '10'), (-12, '11'), (-7, '99'),
+                               (6, '13')):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=zero + timedelta(minutes=minutes)):
+                self.hass.states.set(sensor, value)
+                self.wait_recording_done()
+
+        statistics = recorder.get_model('Statistics')
+        session = recorder.Session()
+        # Leave only the statistics of the ten minutes before zero
+        session.query(statistics).delete()
+
+        for minutes, mean in ((-10, 12), (-5, 12.5)):
+            session.add(statistics(
+                domain='sensor', entity_id=sensor, period=300,
+                start=zero + timedelta(minutes=minutes), min=mean,
+                max=mean, mean=mean, last=mean, count=1))
+        session.commit()
+
+        hist = list(history.stream_statistics_history(
+            zero - timedelta(minutes=30), zero + timedelta(minutes=10),
+            300, filters=history.Filters()))
+
+        self.assertEqual(1, len(hist))
+        self.assertEqual(['10', '11', '12.0', '12.5', '13'],
+                         [state.state for state in hist[0]])
+
     def test_get_significant_states_entity_id(self):
         """Test that only significant states are returned for one entity."""
         zero, four, states = self.record_states()
@@ -1,10 +1,12 @@
 """The tests for the Home Assistant HTTP component."""
 # pylint: disable=protected-access,too-many-public-methods
+import asyncio
 import logging
 import time
 from ipaddress import ip_network
 from unittest.mock import patch
 
+import pytest
 import requests
 
 from homeassistant import bootstrap, const
@@ -29,6 +31,25 @@ CORS_ORIGINS = [HTTP_BASE_URL, HTTP_BASE]
 hass = None
 
 
+class BrokenStreamView(http.HomeAssistantView):
+    """View that fails while streaming its response."""
+
+    url = '/api/test/broken_stream'
+    name = 'api:test:broken_stream'
+    requires_auth = False
+
+    @asyncio.coroutine
+    def get(self, request):
+        """Stream items until encoding fails."""
+        def items():
+            """Return one item and fail."""
+            yield {'a': 1}
+            raise ValueError('Broken item')
+
+        response = yield from self.json_stream(request, items())
+        return response
+
+
 def _url(path=''):
     """Helper method to generate URLs."""
     return HTTP_BASE_URL + path
@@ -55,6 +76,7 @@ def setUpModule():
     )
 
     bootstrap.setup_component(hass, 'api')
+    hass.http.register_view(BrokenStreamView)
 
     hass.http.trusted_networks = [
         ip_network(trusted_network)
@@ -206,3 +228,24 @@ class TestHttp:
         assert req.headers.get(allow_origin) == HTTP_BASE_URL
         assert req.headers.get(allow_headers) == \
             const.HTTP_HEADER_HA_AUTH.upper()
+
+    def test_json_stream_error(self):
+        """Test the connection is closed if encoding a stream fails."""
+        req = requests.get(_url(BrokenStreamView.url), stream=True)
+
+        assert req.status_code == 200
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            req.content  # pylint: disable=pointless-statement
+
+
+def test_json_array_chunks():
+    """Test items are encoded as a JSON array in chunks."""
+    chunks = list(http._json_array_chunks(
+        ({'b': i, 'a': None} for i in range(5)), chunk_size=2))
+
+    assert len(chunks) == 3
+    assert b''.join(chunks) == (
+        b'[{"a": null, "b": 0},{"a": null, "b": 1},{"a": null, "b": 2},'
+        b'{"a": null, "b": 3},{"a": null, "b": 4}]')
+    assert list(http._json_array_chunks(iter([]))) == [b'[]']
@@ -1,12 +1,17 @@
 """The tests for the InfluxDB component."""
+import os
 import unittest
 from unittest import mock
 
 import influxdb as influx_client
+from influxdb.line_protocol import make_lines
 
 from homeassistant.bootstrap import setup_component
 import homeassistant.components.influxdb as influxdb
-from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED, STATE_OFF, STATE_ON)
+from homeassistant.helpers.export import DATA_EXPORTERS
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant
 
@@ -25,6 +30,10 @@ class TestInfluxDB(unittest.TestCase):
         """Clear data."""
         self.hass.stop()
 
+        spool_path = self.hass.config.path(influxdb.SPOOL_FILE)
+        if os.path.isfile(spool_path):
+            os.remove(spool_path)
+
     def test_setup_config_full(self, mock_client):
         """Test the setup with full configuration."""
         config = {
@@ -89,19 +98,34 @@ class TestInfluxDB(unittest.TestCase):
             influx_client.exceptions.InfluxDBClientError('fake')
         assert not setup_component(self.hass, influxdb.DOMAIN, config)
 
-    def _setup(self):
+    def _setup(self, batch_size=1):
         """Setup the client."""
         config = {
             'influxdb': {
                 'host': 'host',
                 'username': 'user',
                 'password': 'pass',
-                'blacklist': ['fake.blacklisted']
+                'blacklist': ['fake.blacklisted'],
+                'batch_size': batch_size,
+                'flush_interval': 60,
             }
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
         self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
 
+    def _handle(self, event):
+        """Pass an event to the listener and wait for the writes."""
+        run_callback_threadsafe(
+            self.hass.loop, self.handler_method, event).result()
+        self.hass.block_till_done()
+
+    def _assert_written(self, mock_client, body):
+        """Assert body has been written in line protocol."""
+        self.assertEqual(mock_client.return_value.request.call_count, 1)
+        self.assertEqual(
+            mock_client.return_value.request.call_args[1]['data'],
+            make_lines({'points': body}).encode('utf-8'))
+
     def test_event_listener(self, mock_client):
         """Test the event listener."""
         self._setup()
@@ -135,15 +159,9 @@ class TestInfluxDB(unittest.TestCase):
                     'latitude': '2.2'
                 },
             }]
-            self.handler_method(event)
-            self.assertEqual(
-                mock_client.return_value.write_points.call_count, 1
-            )
-            self.assertEqual(
-                mock_client.return_value.write_points.call_args,
-                mock.call(body)
-            )
-            mock_client.return_value.write_points.reset_mock()
+            self._handle(event)
+            self._assert_written(mock_client, body)
+            mock_client.return_value.request.reset_mock()
 
     def test_event_listener_no_units(self, mock_client):
         """Test the event listener for missing units."""
@@ -169,15 +187,9 @@ class TestInfluxDB(unittest.TestCase):
                     'value': 1,
                 },
             }]
-            self.handler_method(event)
-            self.assertEqual(
-                mock_client.return_value.write_points.call_count, 1
-            )
-            self.assertEqual(
-                mock_client.return_value.write_points.call_args,
-                mock.call(body)
-            )
-            mock_client.return_value.write_points.reset_mock()
+            self._handle(event)
+            self._assert_written(mock_client, body)
+            mock_client.return_value.request.reset_mock()
 
     def test_event_listener_fail_write(self, mock_client):
         """Test the event listener for write failures."""
@@ -187,9 +199,105 @@ class TestInfluxDB(unittest.TestCase):
             state=1, domain='fake', entity_id='entity-id', object_id='entity',
             attributes={})
         event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
-        mock_client.return_value.write_points.side_effect = \
-            influx_client.exceptions.InfluxDBClientError('foo')
-        self.handler_method(event)
+        mock_client.return_value.request.side_effect = \
+            influx_client.exceptions.InfluxDBServerError('foo')
+        self._handle(event)
+
+        writer = self.hass.data[DATA_EXPORTERS][influxdb.DOMAIN]
+        self.assertEqual(1, writer.spooled)
+
+        # The spooled point is replayed after the next successful write
+        mock_client.return_value.request.side_effect = None
+        self._handle(event)
+
+        self.assertEqual(3, mock_client.return_value.request.call_count)
+        self.assertEqual(
+            mock_client.return_value.request.call_args[1]['data'],
+            mock_client.return_value.request.call_args_list[0][1]['data'])
+        self.assertEqual(0, writer.spooled)
+        self.assertEqual(2, writer.exported)
+        self.assertFalse(os.path.isfile(writer.spool_path))
+
+    def test_event_listener_rejected_write(self, mock_client):
+        """Test points that the database rejects are dropped."""
+        self._setup()
+
+        state = mock.MagicMock(
+            state=1, domain='fake', entity_id='entity-id', object_id='entity',
+            attributes={})
+        event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
+        mock_client.return_value.request.side_effect = \
+            influx_client.exceptions.InfluxDBClientError('field type', 400)
+        self._handle(event)
+
+        writer = self.hass.data[DATA_EXPORTERS][influxdb.DOMAIN]
+        self.assertEqual(1, mock_client.return_value.request.call_count)
+        self.assertEqual(0, writer.spooled)
+        self.assertEqual(1, writer.dropped)
+        self.assertFalse(os.path.isfile(writer.spool_path))
+
+    def test_event_listener_batch(self, mock_client):
+        """Test points are written in batches."""
+        self._setup(batch_size=2)
+
+        bodies = []
+        for value in (1, 2, 3):
+            state = mock.MagicMock(
+                state=value, domain='fake', entity_id='entity-id',
+                object_id='entity', attributes={})
+            event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
+            bodies.append({
+                'measurement': 'entity-id',
+                'tags': {
+                    'domain': 'fake',
+                    'entity_id': 'entity',
+                },
+                'time': 12345,
+                'fields': {
+                    'value': value,
+                },
+            })
+            self._handle(event)
+
+        self._assert_written(mock_client, bodies[:2])
+
+        writer = self.hass.data[DATA_EXPORTERS][influxdb.DOMAIN]
+        self.assertEqual(1, writer.queue_size)
+        self.assertIsNotNone(writer.send_latency)
+
+        run_callback_threadsafe(self.hass.loop, writer.async_flush).result()
+        self.hass.block_till_done()
+        self.assertEqual(2, mock_client.return_value.request.call_count)
+        self.assertEqual(0, writer.queue_size)
+
+    def test_stop_writes_queue(self, mock_client):
+        """Test all queued points are written or spooled on stop."""
+        self._setup(batch_size=10)
+
+        for value in range(5):
+            state = mock.MagicMock(
+                state=value, domain='fake', entity_id='entity-id',
+                object_id='entity', attributes={})
+            event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
+            self._handle(event)
+
+        writer = self.hass.data[DATA_EXPORTERS][influxdb.DOMAIN]
+        self.assertEqual(5, writer.queue_size)
+        self.assertFalse(mock_client.return_value.request.called)
+
+        writer.batch_size = 2
+        mock_client.return_value.request.side_effect = [
+            None, influx_client.exceptions.InfluxDBServerError('foo')]
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+        self.hass.block_till_done()
+
+        self.assertEqual(2, mock_client.return_value.request.call_count)
+        self.assertEqual(0, writer.queue_size)
+        self.assertEqual(2, writer.exported)
+        self.assertEqual(3, writer.spooled)
+
+        with open(writer.spool_path) as spool:
+            self.assertEqual(3, len(spool.readlines()))
 
     def test_event_listener_states(self, mock_client):
         """Test the event listener against ignored states."""
@@ -211,18 +319,12 @@ class TestInfluxDB(unittest.TestCase):
                     'value': 1,
                 },
             }]
-            self.handler_method(event)
+            self._handle(event)
             if state_state == 1:
-                self.assertEqual(
-                    mock_client.return_value.write_points.call_count, 1
-                )
-                self.assertEqual(
-                    mock_client.return_value.write_points.call_args,
-                    mock.call(body)
-                )
+                self._assert_written(mock_client, body)
             else:
-                self.assertFalse(mock_client.return_value.write_points.called)
-            mock_client.return_value.write_points.reset_mock()
+                self.assertFalse(mock_client.return_value.request.called)
+            mock_client.return_value.request.reset_mock()
 
     def test_event_listener_blacklist(self, mock_client):
         """Test the event listener against a blacklist."""
@@ -244,15 +346,9 @@ class TestInfluxDB(unittest.TestCase):
                     'value': 1,
                 },
             }]
-            self.handler_method(event)
+            self._handle(event)
             if entity_id == 'ok':
-                self.assertEqual(
-                    mock_client.return_value.write_points.call_count, 1
-                )
-                self.assertEqual(
-                    mock_client.return_value.write_points.call_args,
-                    mock.call(body)
-                )
+                self._assert_written(mock_client, body)
             else:
-                self.assertFalse(mock_client.return_value.write_points.called)
-            mock_client.return_value.write_points.reset_mock()
+                self.assertFalse(mock_client.return_value.request.called)
+            mock_client.return_value.request.reset_mock()
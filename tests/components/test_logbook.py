@@ -4,7 +4,7 @@ from datetime import timedelta
 import unittest
 from unittest.mock import patch
 
-from homeassistant.components import sun
+from homeassistant.components import recorder, sun
 import homeassistant.core as ha
 from homeassistant.const import (
     EVENT_STATE_CHANGED, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
@@ -498,3 +498,100 @@ class TestComponentLogbook(unittest.TestCase):
             'old_state': state,
             'new_state': state,
         }, time_fired=event_time_fired)
+
+
+class TestLogbookDatabase(unittest.TestCase):
+    """Test reading logbook events from the database."""
+
+    def setUp(self):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        db_uri = 'sqlite://'
+        with patch('homeassistant.core.Config.path', return_value=db_uri):
+            setup_component(self.hass, recorder.DOMAIN, {
+                "recorder": {
+                    "db_url": db_uri}})
+        self.hass.start()
+        recorder._INSTANCE.block_till_db_ready()
+
+    def tearDown(self):
+        """Stop everything that was started."""
+        self.hass.stop()
+
+    def _get_events(self, config):
+        """Return the recorded events of today that pass the config."""
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+        start = dt_util.utcnow() - timedelta(hours=1)
+        return [event for _, event in logbook._get_events(
+            start, start + timedelta(days=1), logbook.CONFIG_SCHEMA(config))]
+
+    def test_get_events(self):
+        """Test only events that can show up in the logbook are read."""
+        self.hass.states.set('switch.kitchen', STATE_ON)
+        self.hass.states.set('switch.kitchen', STATE_ON, {'brightness': 5})
+        self.hass.states.set('light.hidden', STATE_ON)
+        self.hass.bus.fire('mqtt_message_received', {'topic': 'a'})
+        logbook.log_entry(self.hass, 'Alarm', 'is triggered')
+
+        events = self._get_events({logbook.DOMAIN: {
+            logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ['light']}}})
+
+        self.assertEqual(
+            [EVENT_HOMEASSISTANT_START, EVENT_STATE_CHANGED,
+             logbook.EVENT_LOGBOOK_ENTRY],
+            [event.event_type for event in events])
+
+        new_state = events[1].data['new_state']
+        self.assertIsInstance(new_state, ha.State)
+        self.assertEqual('switch.kitchen', new_state.entity_id)
+        self.assertEqual(STATE_ON, new_state.state)
+        self.assertEqual('Alarm', events[2].data[logbook.ATTR_NAME])
+
+    def test_get_events_include_entity(self):
+        """Test included entities are read from excluded domains."""
+        self.hass.states.set('light.kitchen', STATE_ON)
+        self.hass.states.set('light.bedroom', STATE_OFF)
+        self.hass.states.set('switch.kitchen', STATE_OFF)
+
+        events = self._get_events({logbook.DOMAIN: {
+            logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ['light']},
+            logbook.CONF_INCLUDE: {
+                logbook.CONF_ENTITIES: ['light.kitchen']}}})
+
+        self.assertEqual(
+            ['light.kitchen', 'switch.kitchen'],
+            [event.data['entity_id'] for event in events
+             if event.event_type == EVENT_STATE_CHANGED])
+
+    def test_get_events_page(self):
+        """Test a page is extended to the end of its grouping window."""
+        now = dt_util.utcnow().replace(minute=0)
+        start = now - timedelta(hours=1)
+        config = logbook.CONFIG_SCHEMA({logbook.DOMAIN: {}})
+
+        for minute in (1, 2, 3, 20):
+            with patch('homeassistant.core.dt_util.utcnow',
+                       return_value=now.replace(minute=minute)):
+                logbook.log_entry(self.hass, 'Alarm', str(minute))
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        events, cursor = logbook._get_events_page(
+            start, start + timedelta(days=1), config, 2)
+
+        self.assertEqual(['1', '2', '3'], self._messages(events))
+        self.assertIsNotNone(cursor)
+
+        events, cursor = logbook._get_events_page(
+            start, start + timedelta(days=1), config, 2,
+            recorder.decode_cursor(cursor))
+
+        self.assertEqual(['20'], self._messages(events))
+        self.assertIsNone(cursor)
+
+    @staticmethod
+    def _messages(events):
+        """Return the messages of the logbook entry events."""
+        return [event.data[logbook.ATTR_MESSAGE] for event in events
+                if event.event_type == logbook.EVENT_LOGBOOK_ENTRY]
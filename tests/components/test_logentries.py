@@ -1,13 +1,18 @@
 """The tests for the Logentries component."""
 
+# pylint: disable=protected-access
+import json
 import unittest
 from unittest import mock
 
 from homeassistant.bootstrap import setup_component
 import homeassistant.components.logentries as logentries
 from homeassistant.const import STATE_ON, STATE_OFF, EVENT_STATE_CHANGED
+from homeassistant.helpers.export import DATA_EXPORTERS
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant
+from tests.test_util.aiohttp import mock_aiohttp_client
 
 
 class TestLogentries(unittest.TestCase):
@@ -47,53 +52,55 @@ class TestLogentries(unittest.TestCase):
         self.assertEqual(EVENT_STATE_CHANGED,
                          self.hass.bus.listen.call_args_list[0][0][0])
 
-    def _setup(self, mock_requests):
+    def _setup(self):
         """Test the setup."""
-        self.mock_post = mock_requests.post
-        self.mock_request_exception = Exception
-        mock_requests.exceptions.RequestException = self.mock_request_exception
         config = {
             'logentries': {
                 'token': 'token'
             }
         }
-        self.hass.bus.listen = mock.MagicMock()
         setup_component(self.hass, logentries.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.exporter = self.hass.data[DATA_EXPORTERS][logentries.DOMAIN]
 
-    @mock.patch.object(logentries, 'requests')
-    @mock.patch('json.dumps')
-    def test_event_listener(self, mock_dump, mock_requests):
-        """Test event listener."""
-        mock_dump.side_effect = lambda x: x
-        self._setup(mock_requests)
+    def _handle(self, event):
+        """Pass an event to the exporter and send the queued entries."""
+        run_callback_threadsafe(
+            self.hass.loop, self.exporter._async_state_changed, event
+        ).result()
+        run_callback_threadsafe(
+            self.hass.loop, self.exporter.async_flush).result()
+        self.hass.block_till_done()
 
+    def test_event_listener(self):
+        """Test event listener."""
+        url = 'https://webhook.logentries.com/noformat/logs/token'
         valid = {'1': 1,
                  '1.0': 1.0,
                  STATE_ON: 1,
                  STATE_OFF: 0,
                  'foo': 'foo'}
-        for in_, out in valid.items():
-            state = mock.MagicMock(state=in_,
-                                   domain='fake',
-                                   object_id='entity',
-                                   attributes={})
-            event = mock.MagicMock(data={'new_state': state},
-                                   time_fired=12345)
-            body = [{
-                'domain': 'fake',
-                'entity_id': 'entity',
-                'attributes': {},
-                'time': '12345',
-                'value': out,
-            }]
-            payload = {'host': 'https://webhook.logentries.com/noformat/'
-                       'logs/token',
-                       'event': body}
-            self.handler_method(event)
-            self.assertEqual(self.mock_post.call_count, 1)
-            self.assertEqual(
-                self.mock_post.call_args,
-                mock.call(payload['host'], data=payload, timeout=10)
-            )
-            self.mock_post.reset_mock()
+
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(url)
+            self._setup()
+
+            for in_, out in valid.items():
+                state = mock.MagicMock(state=in_,
+                                       domain='fake',
+                                       object_id='entity',
+                                       attributes={})
+                event = mock.MagicMock(data={'new_state': state},
+                                       time_fired=12345)
+                body = [{
+                    'domain': 'fake',
+                    'entity_id': 'entity',
+                    'attributes': {},
+                    'time': '12345',
+                    'value': out,
+                }]
+                payload = {'host': url, 'event': body}
+                self._handle(event)
+                self.assertEqual(aioclient_mock.call_count, 1)
+                self.assertEqual(json.loads(aioclient_mock.mock_calls[0][2]),
+                                 payload)
+                aioclient_mock.mock_calls.clear()
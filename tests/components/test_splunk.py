@@ -1,12 +1,17 @@
 """The tests for the Splunk component."""
+# pylint: disable=protected-access
+import json
 import unittest
 from unittest import mock
 
 from homeassistant.bootstrap import setup_component
 import homeassistant.components.splunk as splunk
 from homeassistant.const import STATE_ON, STATE_OFF, EVENT_STATE_CHANGED
+from homeassistant.helpers.export import DATA_EXPORTERS
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant
+from tests.test_util.aiohttp import mock_aiohttp_client
 
 
 class TestSplunk(unittest.TestCase):
@@ -52,11 +57,8 @@ class TestSplunk(unittest.TestCase):
         self.assertEqual(EVENT_STATE_CHANGED,
                          self.hass.bus.listen.call_args_list[0][0][0])
 
-    def _setup(self, mock_requests):
+    def _setup(self):
         """Test the setup."""
-        self.mock_post = mock_requests.post
-        self.mock_request_exception = Exception
-        mock_requests.exceptions.RequestException = self.mock_request_exception
         config = {
             'splunk': {
                 'host': 'host',
@@ -65,17 +67,20 @@ class TestSplunk(unittest.TestCase):
             }
         }
 
-        self.hass.bus.listen = mock.MagicMock()
         setup_component(self.hass, splunk.DOMAIN, config)
-        self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
-
-    @mock.patch.object(splunk, 'requests')
-    @mock.patch('json.dumps')
-    def test_event_listener(self, mock_dump, mock_requests):
+        self.exporter = self.hass.data[DATA_EXPORTERS][splunk.DOMAIN]
+
+    def _handle(self, event):
+        """Pass an event to the exporter and send the queued events."""
+        run_callback_threadsafe(
+            self.hass.loop, self.exporter._async_state_changed, event
+        ).result()
+        run_callback_threadsafe(
+            self.hass.loop, self.exporter.async_flush).result()
+        self.hass.block_till_done()
+
+    def test_event_listener(self):
         """Test event listener."""
-        mock_dump.side_effect = lambda x: x
-        self._setup(mock_requests)
-
         valid = {'1': 1,
                  '1.0': 1.0,
                  STATE_ON: 1,
@@ -83,30 +88,56 @@ class TestSplunk(unittest.TestCase):
                  'foo': 'foo',
                  }
 
-        for in_, out in valid.items():
-            state = mock.MagicMock(state=in_,
-                                   domain='fake',
-                                   object_id='entity',
-                                   attributes={})
-            event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
-
-            body = [{
-                'domain': 'fake',
-                'entity_id': 'entity',
-                'attributes': {},
-                'time': '12345',
-                'value': out,
-            }]
-
-            payload = {'host': 'http://host:8088/services/collector/event',
-                       'event': body}
-            self.handler_method(event)
-            self.assertEqual(self.mock_post.call_count, 1)
-            self.assertEqual(
-                self.mock_post.call_args,
-                mock.call(
-                    payload['host'], data=payload,
-                    headers={'Authorization': 'Splunk secret'}
-                )
-            )
-            self.mock_post.reset_mock()
+        url = 'http://host:8088/services/collector/event'
+
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(url)
+            self._setup()
+
+            for in_, out in valid.items():
+                state = mock.MagicMock(state=in_,
+                                       domain='fake',
+                                       object_id='entity',
+                                       attributes={})
+                event = mock.MagicMock(data={'new_state': state},
+                                       time_fired=12345)
+
+                body = [{
+                    'domain': 'fake',
+                    'entity_id': 'entity',
+                    'attributes': {},
+                    'time': '12345',
+                    'value': out,
+                }]
+
+                payload = {'host': url, 'event': body}
+                self._handle(event)
+                self.assertEqual(aioclient_mock.call_count, 1)
+                self.assertEqual(json.loads(aioclient_mock.mock_calls[0][2]),
+                                 payload)
+                aioclient_mock.mock_calls.clear()
+
+        self.assertEqual(self.exporter.exported, len(valid))
+        self.assertEqual(self.exporter.batches, len(valid))
+
+    def test_events_batched(self):
+        """Test queued events are posted in one request."""
+        url = 'http://host:8088/services/collector/event'
+
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(url)
+            self._setup()
+
+            for entity_id in ('fake.one', 'fake.two'):
+                self.hass.states.set(entity_id, 'on')
+            self.hass.block_till_done()
+            self.assertEqual(aioclient_mock.call_count, 0)
+
+            run_callback_threadsafe(
+                self.hass.loop, self.exporter.async_flush).result()
+            self.hass.block_till_done()
+
+        self.assertEqual(aioclient_mock.call_count, 1)
+        data = aioclient_mock.mock_calls[0][2]
+        self.assertEqual(data.count('"host"'), 2)
+        self.assertEqual(self.exporter.exported, 2)
@@ -8,6 +8,8 @@ from homeassistant.bootstrap import setup_component
 import homeassistant.core as ha
 import homeassistant.components.statsd as statsd
 from homeassistant.const import (STATE_ON, STATE_OFF, EVENT_STATE_CHANGED)
+from homeassistant.helpers.export import DATA_EXPORTERS
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant
 
@@ -94,7 +96,14 @@ class TestStatsd(unittest.TestCase):
         self.hass.bus.listen = mock.MagicMock()
         setup_component(self.hass, statsd.DOMAIN, config)
         self.assertTrue(self.hass.bus.listen.called)
-        handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        exporter = self.hass.data[DATA_EXPORTERS][statsd.DOMAIN]
+        pipe = mock_client.return_value.pipeline.return_value
+
+        def handler_method(event):
+            """Send the stats of the new state of an event."""
+            exporter.send([exporter.convert(
+                event, event.data['new_state'])])
+            self.assertTrue(pipe.send.called)
 
         valid = {'1': 1,
                  '1.0': 1.0,
@@ -104,24 +113,24 @@ class TestStatsd(unittest.TestCase):
             state = mock.MagicMock(state=in_,
                                    attributes={"attribute key": 3.2})
             handler_method(mock.MagicMock(data={'new_state': state}))
-            mock_client.return_value.gauge.assert_has_calls([
+            pipe.gauge.assert_has_calls([
                 mock.call(state.entity_id, out, statsd.DEFAULT_RATE),
             ])
 
-            mock_client.return_value.gauge.reset_mock()
+            pipe.gauge.reset_mock()
 
-            self.assertEqual(mock_client.return_value.incr.call_count, 1)
+            self.assertEqual(pipe.incr.call_count, 1)
             self.assertEqual(
-                mock_client.return_value.incr.call_args,
-                mock.call(state.entity_id, rate=statsd.DEFAULT_RATE)
+                pipe.incr.call_args,
+                mock.call(state.entity_id, 1, rate=statsd.DEFAULT_RATE)
             )
-            mock_client.return_value.incr.reset_mock()
+            pipe.incr.reset_mock()
 
         for invalid in ('foo', '', object):
             handler_method(mock.MagicMock(data={
                 'new_state': ha.State('domain.test', invalid, {})}))
-            self.assertFalse(mock_client.return_value.gauge.called)
-            self.assertTrue(mock_client.return_value.incr.called)
+            self.assertFalse(pipe.gauge.called)
+            self.assertTrue(pipe.incr.called)
 
     @mock.patch('statsd.StatsClient')
     def test_event_listener_attr_details(self, mock_client):
@@ -138,7 +147,14 @@ class TestStatsd(unittest.TestCase):
         self.hass.bus.listen = mock.MagicMock()
         setup_component(self.hass, statsd.DOMAIN, config)
         self.assertTrue(self.hass.bus.listen.called)
-        handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        exporter = self.hass.data[DATA_EXPORTERS][statsd.DOMAIN]
+        pipe = mock_client.return_value.pipeline.return_value
+
+        def handler_method(event):
+            """Send the stats of the new state of an event."""
+            exporter.send([exporter.convert(
+                event, event.data['new_state'])])
+            self.assertTrue(pipe.send.called)
 
         valid = {'1': 1,
                  '1.0': 1.0,
@@ -148,24 +164,54 @@ class TestStatsd(unittest.TestCase):
             state = mock.MagicMock(state=in_,
                                    attributes={"attribute key": 3.2})
             handler_method(mock.MagicMock(data={'new_state': state}))
-            mock_client.return_value.gauge.assert_has_calls([
+            pipe.gauge.assert_has_calls([
                 mock.call("%s.state" % state.entity_id,
                           out, statsd.DEFAULT_RATE),
                 mock.call("%s.attribute_key" % state.entity_id,
                           3.2, statsd.DEFAULT_RATE),
             ])
 
-            mock_client.return_value.gauge.reset_mock()
+            pipe.gauge.reset_mock()
 
-            self.assertEqual(mock_client.return_value.incr.call_count, 1)
+            self.assertEqual(pipe.incr.call_count, 1)
             self.assertEqual(
-                mock_client.return_value.incr.call_args,
-                mock.call(state.entity_id, rate=statsd.DEFAULT_RATE)
+                pipe.incr.call_args,
+                mock.call(state.entity_id, 1, rate=statsd.DEFAULT_RATE)
             )
-            mock_client.return_value.incr.reset_mock()
+            pipe.incr.reset_mock()
 
         for invalid in ('foo', '', object):
             handler_method(mock.MagicMock(data={
                 'new_state': ha.State('domain.test', invalid, {})}))
-            self.assertFalse(mock_client.return_value.gauge.called)
-            self.assertTrue(mock_client.return_value.incr.called)
+            self.assertFalse(pipe.gauge.called)
+            self.assertTrue(pipe.incr.called)
+
+    @mock.patch('statsd.StatsClient')
+    def test_states_sent_in_one_pipeline(self, mock_client):
+        """Test the stats of queued states are sent in one pipeline."""
+        config = {
+            'statsd': {
+                'host': 'host',
+                'exclude': {'domains': 'hidden'},
+            }
+        }
+
+        setup_component(self.hass, statsd.DOMAIN, config)
+        exporter = self.hass.data[DATA_EXPORTERS][statsd.DOMAIN]
+        pipe = mock_client.return_value.pipeline.return_value
+
+        self.hass.states.set('sensor.one', 1)
+        self.hass.states.set('sensor.two', 2)
+        self.hass.states.set('hidden.three', 3)
+        self.hass.block_till_done()
+        self.assertEqual(exporter.queue_size, 2)
+
+        run_callback_threadsafe(self.hass.loop, exporter.async_flush).result()
+        self.hass.block_till_done()
+
+        self.assertEqual(pipe.send.call_count, 1)
+        pipe.gauge.assert_has_calls([
+            mock.call('sensor.one', 1, statsd.DEFAULT_RATE),
+            mock.call('sensor.two', 2, statsd.DEFAULT_RATE),
+        ])
+        self.assertEqual(exporter.exported, 2)
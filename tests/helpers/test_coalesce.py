@@ -0,0 +1,112 @@
+"""Test the state write coalescing helper."""
+# pylint: disable=protected-access
+from datetime import timedelta
+from unittest.mock import patch
+
+import homeassistant.helpers.entity as entity
+from homeassistant.helpers.coalesce import COALESCE_SCHEMA, StateCoalescer
+from homeassistant.util.async import run_callback_threadsafe
+import homeassistant.util.dt as dt_util
+
+from tests.common import get_test_home_assistant, fire_time_changed
+
+
+class TestStateCoalescer(object):
+    """Test the StateCoalescer."""
+
+    def setup_method(self, method):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        self.now = dt_util.utcnow()
+
+    def teardown_method(self, method):
+        """Stop everything that was started."""
+        entity.set_customize({})
+        self.hass.stop()
+
+    def _coalescer(self, **config):
+        """Return a coalescer for sensor.test."""
+        return StateCoalescer(
+            self.hass, 'sensor.test', COALESCE_SCHEMA(config))
+
+    def _set(self, coalescer, state, attributes=None, offset=0):
+        """Set a state at offset seconds from now."""
+        with patch('homeassistant.helpers.coalesce.dt_util.utcnow',
+                   return_value=self.now + timedelta(seconds=offset)):
+            run_callback_threadsafe(
+                self.hass.loop, coalescer.async_set, state,
+                attributes or {}).result()
+        self.hass.block_till_done()
+
+    def _flush(self, offset):
+        """Move time forward offset seconds."""
+        fire_time_changed(self.hass, self.now + timedelta(seconds=offset))
+        self.hass.block_till_done()
+
+    def test_latest_value(self):
+        """Test only the latest value of a window is written."""
+        coalescer = self._coalescer(window=5)
+
+        self._set(coalescer, 1)
+        assert self.hass.states.get('sensor.test').state == '1'
+
+        self._set(coalescer, 2, offset=1)
+        self._set(coalescer, 3, offset=2)
+        assert self.hass.states.get('sensor.test').state == '1'
+
+        self._flush(5)
+        assert self.hass.states.get('sensor.test').state == '3'
+        assert coalescer.writes == 2
+        assert coalescer.skipped == 1
+
+    def test_aggregates(self):
+        """Test min, max and mean aggregation of a window."""
+        for aggregate, result in (('min', '2'), ('max', '6'),
+                                  ('mean', '4.0')):
+            coalescer = self._coalescer(window=5, aggregate=aggregate)
+            self.hass.states.set('sensor.test', 0)
+
+            self._set(coalescer, 0)
+            for value in (2, 6, 4):
+                self._set(coalescer, value, offset=1)
+
+            self._flush(5)
+            assert self.hass.states.get('sensor.test').state == result
+
+    def test_deadband(self):
+        """Test values within the deadband are dropped."""
+        coalescer = self._coalescer(window=0, deadband=1)
+
+        self._set(coalescer, 10)
+        self._set(coalescer, 10.5, offset=1)
+        assert self.hass.states.get('sensor.test').state == '10'
+
+        self._set(coalescer, 10.5, {'unit_of_measurement': 'W'}, offset=2)
+        assert self.hass.states.get('sensor.test').state == '10.5'
+
+        self._set(coalescer, 12, {'unit_of_measurement': 'W'}, offset=3)
+        assert self.hass.states.get('sensor.test').state == '12'
+
+    def test_non_numeric_not_delayed(self):
+        """Test a non-numeric state flushes the window and is written."""
+        coalescer = self._coalescer(window=5)
+
+        self._set(coalescer, 1)
+        self._set(coalescer, 2, offset=1)
+        self._set(coalescer, 'unavailable', offset=2)
+        assert self.hass.states.get('sensor.test').state == 'unavailable'
+        assert coalescer.writes == 3
+
+    def test_entity_coalesced_via_customize(self):
+        """Test the entity coalesces writes configured via customize."""
+        entity.set_customize({
+            'sensor': {'coalesce': COALESCE_SCHEMA({'window': 5})},
+        })
+
+        ent = entity.Entity()
+        ent.entity_id = 'sensor.test'
+        ent.hass = self.hass
+        ent.update_ha_state()
+
+        assert ent._coalescer is not None
+        assert self.hass.states.get('sensor.test') is not None
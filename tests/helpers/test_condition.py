@@ -146,3 +146,74 @@ class TestConditionHelper:
                    return_value=dt.now().replace(hour=21)):
             assert not condition.time(after=sixam, before=sixpm)
             assert condition.time(after=sixpm, before=sixam)
+
+    def test_time_weekday(self):
+        """Test time condition weekday matching."""
+        monday = dt.now().replace(year=2016, month=10, day=17)
+
+        with patch('homeassistant.helpers.condition.dt_util.now',
+                   return_value=monday):
+            assert condition.time(weekday='mon')
+            assert condition.time(weekday=['sat', 'mon'])
+            assert not condition.time(weekday='tue')
+            assert not condition.time(weekday=['sat', 'sun'])
+
+    def test_sort_by_cost(self):
+        """Test conditions are ordered cheapest first."""
+        configs = [
+            {'condition': 'template'},
+            {'condition': 'or'},
+            {'condition': 'numeric_state'},
+            {'condition': 'state'},
+        ]
+
+        assert [conf['condition'] for conf
+                in condition.sort_by_cost(configs)] == \
+            ['state', 'numeric_state', 'template', 'or']
+
+    def test_nested_and_condition(self):
+        """Test nested 'and' conditions are evaluated."""
+        test = condition.from_config({
+            'condition': 'and',
+            'conditions': [
+                {
+                    'condition': 'and',
+                    'conditions': [{
+                        'condition': 'state',
+                        'entity_id': 'sensor.temperature',
+                        'state': '100',
+                    }],
+                }, {
+                    'condition': 'numeric_state',
+                    'entity_id': 'sensor.temperature',
+                    'below': 110,
+                }
+            ]
+        })
+
+        self.hass.states.set('sensor.temperature', 105)
+        assert not test(self.hass)
+
+        self.hass.states.set('sensor.temperature', 100)
+        assert test(self.hass)
+
+    def test_condition_uses_current_state(self):
+        """Test conditions check the current state, not the trigger state."""
+        test = condition.from_config({
+            'condition': 'numeric_state',
+            'entity_id': 'sensor.temperature',
+            'below': 110,
+        })
+
+        self.hass.states.set('sensor.temperature', 120)
+        self.hass.states.set('sensor.other', 100)
+        to_state = self.hass.states.get('sensor.temperature')
+        self.hass.states.set('sensor.temperature', 100)
+
+        assert test(self.hass, {'trigger': {'to_state': to_state}})
+        assert test(self.hass, {'trigger': {
+            'to_state': self.hass.states.get('sensor.other')}})
+        assert test(self.hass)
+
+        self.hass.states.set('sensor.temperature', 120)
+        assert not test(self.hass, {'trigger': {'to_state': to_state}})
@@ -1,7 +1,7 @@
 """Test the entity helper."""
 # pylint: disable=protected-access,too-many-public-methods
 import asyncio
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -116,3 +116,75 @@ class TestHelpersEntity(object):
         ent = AsyncEntity()
         ent.update()
         assert len(async_update) == 1
+
+    def test_unchanged_state_not_written(self):
+        """Test writes are skipped only while nothing changed."""
+        assert self.entity._state_writes == 1
+
+        self.entity.update_ha_state()
+        assert self.entity._state_writes == 1
+        assert self.entity._state_writes_skipped == 1
+
+        # Another writer changed the state in between
+        self.hass.states.set(self.entity.entity_id, 'on')
+        self.entity.update_ha_state()
+        assert self.entity._state_writes == 2
+        assert self.hass.states.get(self.entity.entity_id).state == 'unknown'
+
+        with patch.object(entity.Entity, 'force_update', True):
+            self.entity.update_ha_state()
+        assert self.entity._state_writes == 3
+
+    def test_attributes_changed_in_place(self):
+        """Test attributes changed in the dict of the entity are written."""
+        class AttributesEntity(entity.Entity):
+            hass = self.hass
+            entity_id = 'sensor.test'
+            state = 1
+
+            def __init__(self):
+                """Initialize the attributes."""
+                self._attributes = {'level': 1}
+
+            @property
+            def state_attributes(self):
+                """Return the same dict on every call."""
+                return self._attributes
+
+        ent = AttributesEntity()
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.test').attributes['level'] == 1
+
+        ent._attributes['level'] = 2
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.test').attributes['level'] == 2
+
+    def test_static_attributes_read_on_write(self):
+        """Test static attributes are only read when the state is written."""
+        names = []
+
+        class NamedEntity(entity.Entity):
+            hass = self.hass
+            entity_id = 'sensor.test'
+            state = 1
+            current_name = 'Before'
+
+            @property
+            def name(self):
+                """Return the name and count how often it is read."""
+                names.append(self.current_name)
+                return self.current_name
+
+        ent = NamedEntity()
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.test').name == 'Before'
+
+        ent.current_name = 'After'
+        ent.update_ha_state()
+        assert names == ['Before']
+        assert self.hass.states.get('sensor.test').name == 'Before'
+
+        ent.state = 2
+        ent.update_ha_state()
+        assert names == ['Before', 'After']
+        assert self.hass.states.get('sensor.test').name == 'After'
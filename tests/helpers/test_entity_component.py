@@ -2,6 +2,8 @@
 # pylint: disable=protected-access,too-many-public-methods
 from collections import OrderedDict
 import logging
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
 
@@ -10,6 +12,7 @@ import homeassistant.loader as loader
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers import discovery
+from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -341,3 +344,146 @@ class TestHelpersEntityComponent(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['test_domain.yummy_beer', 'test_domain.yummy_unnamed_device']
+
+    def test_call_entity_service(self):
+        """Test calling a method on entities and updating polled ones."""
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        polled = EntityTest(should_poll=True)
+        polled.update = Mock()
+        polled.turn_on = Mock()
+        pushed = EntityTest(should_poll=False)
+        pushed.update = Mock()
+        pushed.turn_on = Mock()
+
+        component.add_entities([polled, pushed])
+        polled.update.reset_mock()
+
+        run_coroutine_threadsafe(
+            component.async_call_entity_service(
+                [polled, pushed], 'turn_on', brightness=100),
+            self.hass.loop).result()
+
+        polled.turn_on.assert_called_once_with(brightness=100)
+        pushed.turn_on.assert_called_once_with(brightness=100)
+        assert polled.update.called
+        assert not pushed.update.called
+
+    def test_call_entity_service_parallel_updates(self):
+        """Test the platform limit of concurrent entity calls."""
+        lock = threading.Lock()
+        running = []
+        most_running = []
+
+        def turn_on():
+            """Track how many entities are turned on at the same time."""
+            with lock:
+                running.append(1)
+                most_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+        entities = [EntityTest(should_poll=False) for _ in range(4)]
+        for entity in entities:
+            entity.turn_on = turn_on
+
+        def platform_setup(hass, config, add_devices, discovery_info=None):
+            """Test the platform setup."""
+            add_devices(entities)
+
+        platform = MockPlatform(platform_setup)
+        platform.PARALLEL_UPDATES = 1
+
+        loader.set_component('test_domain.platform', platform)
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        component.setup({
+            DOMAIN: {
+                'platform': 'platform',
+            }
+        })
+
+        run_coroutine_threadsafe(
+            component.async_call_entity_service(entities, 'turn_on'),
+            self.hass.loop).result()
+
+        assert len(most_running) == 4
+        assert max(most_running) == 1
+
+    def test_call_entity_service_batch(self):
+        """Test platforms can handle a call for all their entities at once."""
+        entities = [EntityTest(should_poll=False) for _ in range(3)]
+        batches = []
+
+        def platform_setup(hass, config, add_devices, discovery_info=None):
+            """Test the platform setup."""
+            add_devices(entities[:2])
+
+        platform = MockPlatform(platform_setup)
+        platform.turn_on_many = \
+            lambda ents, **kwargs: batches.append((ents, kwargs))
+
+        loader.set_component('test_domain.platform', platform)
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        component.setup({
+            DOMAIN: {
+                'platform': 'platform',
+            }
+        })
+
+        entities[2].turn_on = Mock()
+        component.add_entities(entities[2:])
+
+        run_coroutine_threadsafe(
+            component.async_call_entity_service(
+                entities, 'turn_on', brightness=100),
+            self.hass.loop).result()
+
+        assert batches == [(entities[:2], {'brightness': 100})]
+        entities[2].turn_on.assert_called_once_with(brightness=100)
+
+    def test_call_entity_service_batch_remaining(self):
+        """Test entities a batch did not handle are called one by one."""
+        entities = [EntityTest(should_poll=False) for _ in range(2)]
+
+        def platform_setup(hass, config, add_devices, discovery_info=None):
+            """Test the platform setup."""
+            add_devices(entities)
+
+        platform = MockPlatform(platform_setup)
+        platform.turn_on_many = lambda ents, **kwargs: ents[1:]
+
+        loader.set_component('test_domain.platform', platform)
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        component.setup({
+            DOMAIN: {
+                'platform': 'platform',
+            }
+        })
+
+        for entity in entities:
+            entity.turn_on = Mock()
+
+        run_coroutine_threadsafe(
+            component.async_call_entity_service(entities, 'turn_on'),
+            self.hass.loop).result()
+
+        assert not entities[0].turn_on.called
+        entities[1].turn_on.assert_called_once_with()
+
+    def test_generate_entity_id_suffixes(self):
+        """Test entities with the same name get consecutive suffixes."""
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        component.add_entities([EntityTest(name='beer') for _ in range(3)])
+        component.add_entities([EntityTest(name='beer')])
+
+        assert sorted(component.entities) == [
+            'test_domain.beer', 'test_domain.beer_2', 'test_domain.beer_3',
+            'test_domain.beer_4']
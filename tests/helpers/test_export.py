@@ -0,0 +1,166 @@
+"""Test the state export helper."""
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers.export import (
+    DATA_EXPORTERS, EntityFilter, ExportRejected, StateExporter)
+from homeassistant.util.async import run_callback_threadsafe
+
+from tests.common import get_test_home_assistant
+
+
+class MockExporter(StateExporter):
+    """Exporter that records the batches it sends."""
+
+    min_backoff = 0
+
+    def __init__(self, hass, entity_filter=None, fail=0, error=OSError):
+        """Initialize the exporter."""
+        super().__init__(hass, 'mock', entity_filter)
+        self.sent = []
+        self.fail = fail
+        self.error = error
+
+    def convert(self, event, state):
+        """Return the state value."""
+        return state.state
+
+    def send(self, items):
+        """Record the batch or fail."""
+        if self.fail:
+            self.fail -= 1
+            raise self.error('Send failed')
+        self.sent.append(items)
+
+
+def test_entity_filter():
+    """Test include and exclude of entities and domains."""
+    assert EntityFilter()('sensor.test')
+
+    entity_filter = EntityFilter.from_config({
+        'include': {'domains': ['sensor'], 'entities': ['light.kitchen']},
+        'exclude': {'entities': ['sensor.secret']},
+    })
+    assert entity_filter('sensor.test')
+    assert entity_filter('light.kitchen')
+    assert not entity_filter('light.bedroom')
+    assert not entity_filter('sensor.secret')
+
+    entity_filter = EntityFilter.from_config(
+        {'exclude': {'domains': ['sensor'], 'entities': []}},
+        include_entities=['sensor.power'])
+    assert entity_filter('sensor.power')
+    assert not entity_filter('sensor.test')
+    assert entity_filter('light.kitchen')
+
+
+class TestStateExporter(object):
+    """Test the StateExporter."""
+
+    def setup_method(self, method):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+
+    def teardown_method(self, method):
+        """Stop everything that was started."""
+        self.hass.stop()
+
+    def _flush(self, exporter):
+        """Send the queued items."""
+        run_callback_threadsafe(self.hass.loop, exporter.async_flush).result()
+        self.hass.block_till_done()
+
+    def test_batches(self):
+        """Test filtered state changes are sent in batches."""
+        exporter = MockExporter(self.hass, EntityFilter(
+            exclude_domains=['hidden']))
+        exporter.batch_size = 2
+        exporter.start()
+        assert self.hass.data[DATA_EXPORTERS]['mock'] is exporter
+
+        for entity_id in ('sensor.one', 'hidden.two', 'sensor.three',
+                          'sensor.four'):
+            self.hass.states.set(entity_id, 'on')
+        self.hass.block_till_done()
+
+        assert exporter.sent == [['on', 'on']]
+        assert exporter.queue_size == 1
+
+        self._flush(exporter)
+        assert exporter.sent == [['on', 'on'], ['on']]
+        assert exporter.metrics['exported'] == 3
+        assert exporter.metrics['batches'] == 2
+
+    def test_retry(self):
+        """Test a failed batch is retried."""
+        exporter = MockExporter(self.hass, fail=2)
+        run_callback_threadsafe(self.hass.loop, exporter.async_add, 1).result()
+
+        exporter.max_retries = 2
+        self._flush(exporter)
+
+        assert exporter.sent == [[1]]
+        assert exporter.errors == 2
+        assert exporter.dropped == 0
+
+    def test_rejected(self):
+        """Test a rejected batch is dropped without a retry."""
+        exporter = MockExporter(self.hass, fail=2, error=ExportRejected)
+        exporter.max_retries = 2
+        run_callback_threadsafe(self.hass.loop, exporter.async_add, 1).result()
+
+        self._flush(exporter)
+
+        assert exporter.sent == []
+        assert exporter.fail == 1
+        assert exporter.errors == 1
+        assert exporter.dropped == 1
+
+    def test_dropped(self):
+        """Test items are dropped when retries run out or queue is full."""
+        exporter = MockExporter(self.hass, fail=1)
+        exporter.max_retries = 0
+        exporter.max_queue_size = 2
+
+        for item in (1, 2, 3):
+            run_callback_threadsafe(
+                self.hass.loop, exporter.async_add, item).result()
+
+        assert exporter.dropped == 1
+
+        self._flush(exporter)
+        assert exporter.sent == []
+        assert exporter.errors == 1
+        assert exporter.dropped == 3
+
+    def test_stop_sends_queue(self):
+        """Test the whole queue is sent in batches on stop."""
+        exporter = MockExporter(self.hass)
+        exporter.start()
+
+        for item in (1, 2, 3, 4, 5):
+            run_callback_threadsafe(
+                self.hass.loop, exporter.async_add, item).result()
+
+        exporter.batch_size = 2
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+        self.hass.block_till_done()
+
+        assert exporter.sent == [[1, 2], [3, 4], [5]]
+        assert exporter.exported == 5
+        assert exporter.queue_size == 0
+
+    def test_stop_discards_after_failure(self):
+        """Test the rest of the queue is discarded after a failed batch."""
+        exporter = MockExporter(self.hass, fail=1)
+        exporter.start()
+
+        for item in (1, 2, 3):
+            run_callback_threadsafe(
+                self.hass.loop, exporter.async_add, item).result()
+
+        exporter.batch_size = 2
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+        self.hass.block_till_done()
+
+        assert exporter.sent == []
+        assert exporter.errors == 1
+        assert exporter.dropped == 3
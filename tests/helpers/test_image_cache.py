@@ -0,0 +1,79 @@
+"""Test the image cache helper."""
+import asyncio
+
+from homeassistant.helpers.image_cache import ImageCache
+
+
+def mock_fetch(images, fetched):
+    """Return a fetch coroutine function that returns the next image."""
+    @asyncio.coroutine
+    def fetch():
+        """Return the next image."""
+        fetched.append(1)
+        return images.pop(0)
+
+    return fetch
+
+
+@asyncio.coroutine
+def test_concurrent_requests_share_fetch(hass):
+    """Test concurrent requests of an image share one fetch."""
+    cache = ImageCache(hass)
+    fetched = []
+    fetch = mock_fetch([b'image'], fetched)
+
+    entries = yield from asyncio.gather(
+        cache.async_get('camera.test', None, fetch, 10),
+        cache.async_get('camera.test', None, fetch, 10),
+        loop=hass.loop)
+
+    assert len(fetched) == 1
+    assert entries[0] is entries[1]
+    assert entries[0].image == b'image'
+
+    entry = yield from cache.async_get('camera.test', None, fetch, 10)
+    assert entry is entries[0]
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@asyncio.coroutine
+def test_expired_and_uncached_images(hass):
+    """Test images are fetched again after they expire."""
+    cache = ImageCache(hass)
+    fetched = []
+    fetch = mock_fetch([b'one', b'two', b'three', None], fetched)
+
+    yield from cache.async_get('camera.test', None, fetch, 0.01)
+    yield from asyncio.sleep(0.02, loop=hass.loop)
+    entry = yield from cache.async_get('camera.test', None, fetch, 0)
+    assert entry.image == b'two'
+
+    # A time to live of zero is not cached
+    entry = yield from cache.async_get('camera.test', None, fetch, 10)
+    assert entry.image == b'three'
+
+    entry = yield from cache.async_get('camera.other', None, fetch, 10)
+    assert entry is None
+    assert len(fetched) == 4
+
+
+@asyncio.coroutine
+def test_size_bound_and_sources(hass):
+    """Test least recently used images are evicted."""
+    cache = ImageCache(hass, max_size=10)
+    fetched = []
+    fetch = mock_fetch([b'aaaa', b'bbbb', b'cccc', b'dddd'], fetched)
+
+    yield from cache.async_get('media_player.a', 'url1', fetch, 10)
+    yield from cache.async_get('media_player.b', 'url1', fetch, 10)
+    yield from cache.async_get('media_player.a', 'url1', fetch, 10)
+    yield from cache.async_get('media_player.c', 'url1', fetch, 10)
+
+    assert cache.size == 8
+    assert len(fetched) == 3
+
+    # Only the latest source of an entity is kept
+    yield from cache.async_get('media_player.a', 'url2', fetch, 10)
+    assert cache.size == 8
+    assert len(fetched) == 4
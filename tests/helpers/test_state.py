@@ -265,6 +265,24 @@ class TestStateHelpers(unittest.TestCase):
                          last_call.data.get('entity_id'))
         self.assertEqual(95, last_call.data.get('brightness'))
 
+    def test_reproduce_multiple_domains_blocking(self):
+        """Test reproduce_state calls the services of all domains."""
+        light_calls = mock_service(self.hass, 'light', SERVICE_TURN_ON)
+        media_calls = mock_service(self.hass, 'media_player',
+                                   SERVICE_MEDIA_PAUSE)
+
+        self.hass.states.set('light.test', 'off')
+        self.hass.states.set('media_player.test', 'playing')
+
+        state.reproduce_state(self.hass, [
+            ha.State('light.test', 'on'),
+            ha.State('media_player.test', 'paused')], blocking=True)
+
+        self.assertEqual(1, len(light_calls))
+        self.assertEqual(1, len(media_calls))
+        self.assertEqual(['media_player.test'],
+                         media_calls[0].data.get('entity_id'))
+
     def test_as_number_states(self):
         """Test state_as_number with states."""
         zero_states = (STATE_OFF, STATE_CLOSED, STATE_UNLOCKED,
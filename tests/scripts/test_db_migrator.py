@@ -0,0 +1,91 @@
+"""Test the db_migrator script."""
+import sqlite3
+
+from sqlalchemy import create_engine
+
+from homeassistant.components.recorder import models
+from homeassistant.scripts import db_migrator
+import homeassistant.util.dt as dt_util
+
+
+def _old_database(now):
+    """Create an old format database with two state changes."""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE recorder_runs (run_id integer primary key, "
+                 "start integer, end integer, closed_incorrect integer, "
+                 "created integer)")
+    conn.execute("CREATE TABLE events (event_id integer primary key, "
+                 "event_type text, event_data text, origin text, "
+                 "created integer, time_fired integer)")
+    conn.execute("CREATE TABLE states (state_id integer primary key, "
+                 "entity_id text, state text, attributes text, "
+                 "last_changed integer, last_updated integer, "
+                 "event_id integer, domain text)")
+
+    old = now - 10 * 86400
+    conn.execute("INSERT INTO recorder_runs VALUES (1, ?, ?, 0, ?)",
+                 (old, now, old))
+    conn.executemany("INSERT INTO events VALUES (?, 'state_changed', '{}', "
+                     "'LOCAL', ?, ?)", [(1, old, old), (2, old, old),
+                                        (3, now, now)])
+    conn.executemany("INSERT INTO states VALUES (?, ?, ?, '{}', ?, ?, ?, ?)", [
+        (1, 'light.kitchen', 'on', old - 60, old - 60, 1, 'light'),
+        (2, 'light.kitchen', 'on', old - 60, old, 2, 'light'),
+        (3, 'light.kitchen', 'off', now, now, 3, 'light'),
+    ])
+    conn.commit()
+    return conn
+
+
+def _engine():
+    """Create a new format database with one event."""
+    engine = create_engine('sqlite://')
+    models.Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(models.Events.__table__.insert(), {
+            'event_id': 5, 'event_type': 'test', 'event_data': '{}',
+            'origin': 'LOCAL', 'time_fired': dt_util.utcnow()})
+
+    return engine
+
+
+def test_bulk_import():
+    """Test event ids are offset when appending in bulk."""
+    now = dt_util.as_timestamp(dt_util.utcnow())
+    engine = _engine()
+
+    db_migrator.bulk_import(_old_database(now), engine, chunk_size=2)
+
+    with engine.begin() as conn:
+        runs = conn.execute(models.RecorderRuns.__table__.select()).fetchall()
+        event_ids = [row.event_id for row in conn.execute(
+            models.Events.__table__.select().order_by('event_id'))]
+        states = conn.execute(models.States.__table__.select().order_by(
+            'state_id')).fetchall()
+
+    assert len(runs) == 1
+    assert event_ids == [5, 6, 7, 8]
+    assert [(state.state, state.event_id) for state in states] == \
+        [('on', 6), ('on', 7), ('off', 8)]
+    assert states[2].last_changed == \
+        dt_util.utc_from_timestamp(now).replace(tzinfo=None)
+
+
+def test_downsample():
+    """Test only significant old states and their events are kept."""
+    now = dt_util.as_timestamp(dt_util.utcnow())
+    engine = _engine()
+    db_migrator.bulk_import(_old_database(now), engine)
+
+    assert db_migrator.downsample(engine, 5) == 1
+
+    with engine.begin() as conn:
+        event_ids = [row.event_id for row in conn.execute(
+            models.Events.__table__.select().order_by('event_id'))]
+        state_ids = [row.state_id for row in conn.execute(
+            models.States.__table__.select().order_by('state_id'))]
+
+    assert event_ids == [5, 6, 8]
+    assert state_ids == [1, 3]
+    assert db_migrator.downsample(engine, 5) == 0
@@ -15,6 +15,7 @@ from homeassistant.const import (
     CONF_UNIT_SYSTEM_METRIC, CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT)
 from homeassistant.util import location as location_util, dt as dt_util
 from homeassistant.util.async import run_coroutine_threadsafe
+from homeassistant.helpers.coalesce import COALESCE_SCHEMA
 from homeassistant.helpers.entity import Entity
 
 from tests.common import (
@@ -178,11 +179,13 @@ class TestConfig(unittest.TestCase):
             {'customize': 'bla'},
             {'customize': {'invalid_entity_id': {}}},
             {'customize': {'light.sensor': 100}},
+            {'customize': {'light': {'hidden': True}}},
+            {'customize': {'light': {'coalesce': {'aggregate': 'median'}}}},
         ):
             with pytest.raises(MultipleInvalid):
                 config_util.CORE_CONFIG_SCHEMA(value)
 
-        config_util.CORE_CONFIG_SCHEMA({
+        config = config_util.CORE_CONFIG_SCHEMA({
             'name': 'Test name',
             'latitude': '-23.45',
             'longitude': '123.45',
@@ -191,9 +194,22 @@ class TestConfig(unittest.TestCase):
                 'sensor.temperature': {
                     'hidden': True,
                 },
+                'sensor.power': {
+                    'coalesce': {
+                        'window': 5,
+                        'aggregate': 'mean',
+                    },
+                },
+                'binary_sensor': {
+                    'coalesce': None,
+                },
             },
         })
 
+        # Coalescing of a domain without settings uses the defaults
+        assert config['customize']['binary_sensor']['coalesce'] == \
+            COALESCE_SCHEMA({})
+
     def test_entity_customization(self):
         """Test entity customization through configuration."""
         config = {CONF_LATITUDE: 50,
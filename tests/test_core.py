@@ -2,18 +2,21 @@
 # pylint: disable=protected-access,too-many-public-methods
 # pylint: disable=too-few-public-methods
 import asyncio
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
 import pytz
+import voluptuous as vol
 
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import (METRIC_SYSTEM)
 from homeassistant.const import (
-    __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM)
+    __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM,
+    EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED)
 
 from tests.common import get_test_home_assistant
 
@@ -159,6 +162,26 @@ class TestEvent(unittest.TestCase):
         }
         self.assertEqual(expected, event.as_dict())
 
+    def test_as_json(self):
+        """Test the cached JSON of an event."""
+        now = dt_util.utcnow()
+        state = ha.State('light.kitchen', 'on')
+        event = ha.Event('some_type', {'new_state': state},
+                         ha.EventOrigin.remote, now)
+
+        self.assertEqual({
+            'event_type': 'some_type',
+            'data': {'new_state': json.loads(state.as_json())},
+            'origin': 'REMOTE',
+            'time_fired': now.isoformat(),
+        }, json.loads(event.as_json()))
+        self.assertIs(event.as_json(), event.as_json())
+        self.assertEqual({'new_state': json.loads(state.as_json())},
+                         json.loads(event.data_json()))
+
+        event.data = {'some': 'attr'}
+        self.assertEqual({'some': 'attr'}, json.loads(event.data_json()))
+
 
 class TestEventBus(unittest.TestCase):
     """Test EventBus methods."""
@@ -212,6 +235,49 @@ class TestEventBus(unittest.TestCase):
 
         assert len(calls) == 1
 
+    def test_listener_removed_while_firing(self):
+        """Test all listeners of an event are called if one unsubscribes."""
+        calls = []
+
+        @ha.callback
+        def listener(event):
+            """Unsubscribe the other listener."""
+            calls.append(event)
+            unsub()
+
+        @ha.callback
+        def other_listener(event):
+            """Mock listener."""
+            calls.append(event)
+
+        self.bus.listen('test', listener)
+        unsub = self.bus.listen('test', other_listener)
+
+        self.bus.fire('test')
+        self.hass.block_till_done()
+        self.assertEqual(2, len(calls))
+
+        self.bus.fire('test')
+        self.hass.block_till_done()
+        self.assertEqual(3, len(calls))
+
+    @patch('homeassistant.core._LOGGER.info')
+    def test_event_not_logged_if_disabled(self, mock_info):
+        """Test events are only formatted if info logging is enabled."""
+        with patch('homeassistant.core._LOGGER.isEnabledFor',
+                   return_value=False):
+            self.bus.fire('test_event')
+            self.hass.block_till_done()
+
+        self.assertFalse(mock_info.called)
+
+        with patch('homeassistant.core._LOGGER.isEnabledFor',
+                   return_value=True):
+            self.bus.fire('test_event')
+            self.hass.block_till_done()
+
+        self.assertTrue(mock_info.called)
+
     def test_listen_once_event_with_callback(self):
         """Test listen_once_event method."""
         runs = []
@@ -337,6 +403,28 @@ class TestState(unittest.TestCase):
         state = ha.State('domain.hello', 'world', {'some': 'attr'})
         self.assertEqual(state, ha.State.from_dict(state.as_dict()))
 
+    def test_as_json(self):
+        """Test the cached JSON of a state."""
+        now = dt_util.utcnow()
+        state = ha.State('domain.hello', 'world',
+                         {'some': 'attr', 'when': now})
+
+        self.assertEqual({
+            'entity_id': 'domain.hello',
+            'state': 'world',
+            'attributes': {'some': 'attr', 'when': now.isoformat()},
+            'last_changed': now.isoformat(),
+            'last_updated': now.isoformat(),
+        }, json.loads(state.as_json()))
+        self.assertIs(state.as_json(), state.as_json())
+        self.assertEqual({'some': 'attr', 'when': now.isoformat()},
+                         json.loads(state.attributes_json()))
+
+        later = now + timedelta(seconds=5)
+        state.last_changed = later
+        self.assertEqual(later.isoformat(),
+                         json.loads(state.as_json())['last_changed'])
+
     def test_dict_conversion_with_wrong_data(self):
         """Test conversion with wrong data."""
         self.assertIsNone(ha.State.from_dict(None))
@@ -467,6 +555,63 @@ class TestStateMachine(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(1, len(events))
 
+    def test_attributes_shared_between_states(self):
+        """Test equal attributes are shared and changed ones are copied."""
+        attributes = {'brightness': 100}
+        self.states.set('light.Bowl', 'on', attributes)
+        state = self.states.get('light.bowl')
+
+        attributes['brightness'] = 50
+        self.assertEqual(100, state.attributes['brightness'])
+
+        self.states.set('light.Bowl', 'off', {'brightness': 100})
+        state2 = self.states.get('light.bowl')
+        self.assertEqual('off', state2.state)
+        self.assertIs(state.attributes, state2.attributes)
+        self.assertIs(state.entity_id, state2.entity_id)
+
+    def test_set_invalid_entity_id(self):
+        """Test setting the state of an invalid entity id raises."""
+        self.assertRaises(
+            InvalidEntityFormatError, self.states.set, 'invalid', 'on')
+
+    def test_set_many(self):
+        """Test setting multiple states at once."""
+        events = []
+        bulk_events = []
+
+        @ha.callback
+        def record(event):
+            """Record a state changed event."""
+            events.append(event)
+
+        @ha.callback
+        def record_bulk(event):
+            """Record a bulk state changed event."""
+            bulk_events.append(event)
+
+        self.hass.bus.listen(EVENT_STATE_CHANGED, record)
+        self.hass.bus.listen(ha.EVENT_STATE_CHANGED_BULK, record_bulk)
+
+        self.states.set_many([
+            ('light.Bowl', 'on', None),
+            ('light.kitchen', 'on', {'brightness': 100}),
+            ('switch.AC', 'on', None),
+        ])
+        self.hass.block_till_done()
+
+        self.assertEqual(['light.kitchen', 'switch.ac'],
+                         [event.data['entity_id'] for event in events])
+        self.assertEqual(1, len(bulk_events))
+        self.assertEqual([event.data for event in events],
+                         bulk_events[0].data['changes'])
+        self.assertEqual(
+            100, self.states.get('light.kitchen').attributes['brightness'])
+
+        self.states.set_many([('light.Bowl', 'on', None)])
+        self.hass.block_till_done()
+        self.assertEqual(1, len(bulk_events))
+
 
 class TestServiceCall(unittest.TestCase):
     """Test ServiceCall class."""
@@ -526,6 +671,62 @@ class TestServiceRegistry(unittest.TestCase):
             self.services.call('test_domain', 'REGISTER_CALLS', blocking=True))
         self.assertEqual(1, len(calls))
 
+    def test_call_with_blocking_raises_exception(self):
+        """Test blocking call raises the exception of the service."""
+        def service_handler(call):
+            """Service handler."""
+            raise ValueError('Not today')
+
+        self.services.register("test_domain", "raise_error",
+                               service_handler)
+
+        with self.assertRaises(ValueError):
+            self.services.call('test_domain', 'raise_error', blocking=True)
+
+    def test_call_with_blocking_invalid_data(self):
+        """Test blocking call with invalid service data."""
+        self.services.register("test_domain", "validated", lambda call: None,
+                               schema=vol.Schema({'value': int}))
+
+        self.assertFalse(self.services.call(
+            'test_domain', 'validated', {'value': 'abc'}, blocking=True))
+
+    def test_call_with_blocking_does_not_fire_executed_event(self):
+        """Test blocking call resolves without a service executed event."""
+        events = []
+        self.hass.bus.listen(EVENT_SERVICE_EXECUTED,
+                             lambda event: events.append(event))
+
+        self.assertTrue(self.services.call(
+            'test_domain', 'test_service', blocking=True))
+        self.hass.block_till_done()
+        self.assertEqual(0, len(events))
+
+    def test_call_non_blocking_does_not_fire_executed_event(self):
+        """Test non-blocking local call fires no service executed event."""
+        events = []
+        self.hass.bus.listen(EVENT_SERVICE_EXECUTED,
+                             lambda event: events.append(event))
+
+        self.services.call('test_domain', 'test_service')
+        self.hass.block_till_done()
+        self.assertEqual(0, len(events))
+
+    def test_call_remote_origin_fires_executed_event(self):
+        """Test service calls from a remote instance fire executed event."""
+        events = []
+        self.hass.bus.listen(EVENT_SERVICE_EXECUTED,
+                             lambda event: events.append(event))
+
+        self.hass.bus.fire(EVENT_CALL_SERVICE, {
+            'domain': 'test_domain',
+            'service': 'test_service',
+            'service_call_id': 'remote-1',
+        }, ha.EventOrigin.remote)
+        self.hass.block_till_done()
+        self.assertEqual(1, len(events))
+        self.assertEqual('remote-1', events[0].data['service_call_id'])
+
     def test_call_non_existing_with_blocking(self):
         """Test non-existing with blocking."""
         prior = ha.SERVICE_CALL_LIMIT
@@ -19,7 +19,8 @@ class AiohttpClientMocker:
                 status=200,
                 text=None,
                 content=None,
-                json=None):
+                json=None,
+                exc=None):
         """Mock a request."""
         if json:
             text = _json.dumps(json)
@@ -29,7 +30,7 @@ class AiohttpClientMocker:
             content = b''
 
         self._mocks.append(AiohttpClientMockResponse(
-            method, url, status, content))
+            method, url, status, content, exc))
 
     def get(self, *args, **kwargs):
         """Register a mock get request."""
@@ -57,11 +58,13 @@ class AiohttpClientMocker:
         return len(self.mock_calls)
 
     @asyncio.coroutine
-    def match_request(self, method, url, *, auth=None):
+    def match_request(self, method, url, *, auth=None, data=None, **kwargs):
         """Match a request against pre-registered requests."""
         for response in self._mocks:
             if response.match_request(method, url):
-                self.mock_calls.append((method, url))
+                self.mock_calls.append((method, url, data))
+                if response.exc:
+                    raise response.exc
                 return response
 
         assert False, "No mock registered for {} {}".format(method.upper(),
@@ -71,12 +74,13 @@ class AiohttpClientMocker:
 class AiohttpClientMockResponse:
     """Mock Aiohttp client response."""
 
-    def __init__(self, method, url, status, response):
+    def __init__(self, method, url, status, response, exc=None):
         """Initialize a fake response."""
         self.method = method
         self.url = url
         self.status = status
         self.response = response
+        self.exc = exc
 
     def match_request(self, method, url):
         """Test if response answers request."""
@@ -0,0 +1,103 @@
+"""Test Home Assistant JSON utility functions."""
+from datetime import datetime
+import json
+from types import MappingProxyType
+
+import pytest
+
+from homeassistant.core import State
+import homeassistant.util.json as json_util
+
+
+@pytest.fixture(params=list(json_util.BACKENDS))
+def backend(request):
+    """Encode native data with each available backend."""
+    original = json_util.get_backend()
+
+    try:
+        json_util.set_backend(request.param)
+    except ImportError:
+        pytest.skip('{} is not installed'.format(request.param))
+
+    yield request.param
+
+    json_util.set_backend(original)
+
+
+def test_dumps_native(backend):
+    """Test native data is encoded compactly with sorted keys."""
+    assert json_util.dumps({'b': [1, 2.5, None], 'a': True, 'c': 'd/e'}) == \
+        '{"a":true,"b":[1,2.5,null],"c":"d/e"}'
+
+
+def test_dumps_objects(backend):
+    """Test objects are converted or embedded as their JSON."""
+    now = datetime(2016, 11, 1, 12, 0, 0)
+    state = State('light.kitchen', 'on', {'brightness': 144}, now, now)
+
+    assert json.loads(json_util.dumps({
+        'when': now,
+        'states': [state],
+        'proxy': MappingProxyType({'some': 'attr'}),
+        'numbers': (num for num in range(2)),
+    })) == {
+        'when': now.isoformat(),
+        'states': [json.loads(state.as_json())],
+        'proxy': {'some': 'attr'},
+        'numbers': [0, 1],
+    }
+    assert json.loads(json_util.dumps(state)) == \
+        json.loads(json_util.dumps(state.as_dict()))
+
+
+def test_dumps_nan(backend):
+    """Test NaN, infinity and big integers are encoded like json does."""
+    assert json_util.dumps({
+        'nan': float('nan'), 'inf': float('inf'), 'big': 2 ** 70}) == \
+        '{"big":1180591620717411303424,"inf":Infinity,"nan":NaN}'
+
+
+def test_dumps_backend_overflow():
+    """Test data that the backend can not encode is encoded by json."""
+    original = json_util.get_backend()
+
+    def overflow():
+        """Return a dumps function that fails like ujson."""
+        def dumps(obj):
+            """Raise that a value can not be encoded."""
+            raise OverflowError('Invalid Nan value when encoding double')
+
+        return dumps
+
+    json_util.BACKENDS['overflow'] = overflow
+
+    try:
+        json_util.set_backend('overflow')
+        assert json_util.dumps({'nan': float('nan')}) == '{"nan":NaN}'
+    finally:
+        del json_util.BACKENDS['overflow']
+        json_util.set_backend(original)
+
+
+def test_dumps_not_serializable():
+    """Test TypeError is raised for objects that can not be converted."""
+    with pytest.raises(TypeError):
+        json_util.dumps({'object': object()})
+
+
+def test_set_backend_not_installed():
+    """Test ImportError is raised for a backend that is not installed."""
+    original = json_util.get_backend()
+
+    def missing():
+        """Raise that the library is missing."""
+        raise ImportError()
+
+    json_util.BACKENDS['missing'] = missing
+
+    try:
+        with pytest.raises(ImportError):
+            json_util.set_backend('missing')
+        assert json_util.get_backend() == original
+    finally:
+        del json_util.BACKENDS['missing']